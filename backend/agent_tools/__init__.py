@@ -13,6 +13,8 @@ Tool Summary:
     - allocate_inventory: Hierarchical inventory allocation
     - calculate_markdown: Gap × Elasticity markdown calculation
     - check_variance: Pure function for variance analysis (workflow-level)
+    - run_batch_forecast: Parallel multi-category forecasting (workflow-level)
+    - run_global_forecast: Multi-category forecasting from one global model (workflow-level)
 """
 
 # Demand forecasting tool
@@ -21,6 +23,9 @@ from agent_tools.demand_tools import (
     ForecastToolResult,
 )
 
+# Batch forecasting (plain function, NOT an agent tool)
+from agent_tools.batch_forecast import run_batch_forecast, run_global_forecast
+
 # Inventory allocation tools
 from agent_tools.inventory_tools import (
     cluster_stores,
@@ -47,6 +52,8 @@ __all__ = [
     # Demand tools
     "run_demand_forecast",
     "ForecastToolResult",
+    "run_batch_forecast",
+    "run_global_forecast",
     # Inventory tools
     "cluster_stores",
     "allocate_inventory",
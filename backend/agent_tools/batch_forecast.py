@@ -0,0 +1,301 @@
+"""
+Batch Demand Forecasting
+
+Forecasts many categories in one call by fanning EnsembleForecaster jobs
+out over a process pool. This is a plain Python entry point (NOT an agent
+tool): workflows and scripts call it directly, so planning 40+ categories
+does not cost one LLM round-trip per category.
+
+Workers are pre-warmed: each process imports Prophet, statsmodels and the
+demand tools (and loads the Stan backend) once at start-up, and the pool is
+kept alive between batches, so jobs pay only for fitting. Each category is
+isolated — a failing series comes back as a ForecastToolResult with
+`error` set instead of failing the batch. Trained models go through the
+shared model cache, so unchanged categories are served without refitting.
+The cube panel of the global_gbm candidate (if any) is written once per
+batch and loaded once per worker, not shipped with every job.
+
+run_global_forecast() is the single-model alternative: one global
+gradient-boosting fit over every series of the weekly cube forecasts all
+categories in one batched pass, with no process pool at all.
+
+Usage:
+    results = run_batch_forecast(data_loader, categories, forecast_horizon_weeks=12,
+                                 season_start_date=date(2025, 2, 3), panel=cube_panel(data_loader))
+    results["Women's Dresses"].total_demand
+"""
+
+import logging
+import multiprocessing
+import os
+import pickle
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from agent_tools.demand_tools import (
+    ExponentialSmoothingWrapper,
+    ForecastToolResult,
+    configured_quantiles,
+    data_quality,
+    forecast_weekly_sales,
+)
+from utils.global_forecaster import SeriesPanel, get_global_forecaster
+from utils.hierarchical_forecast import season_start_offset
+from utils.probabilistic_forecast import bootstrap_forecast, calibration_scale, seasonal_error_matrix
+
+logger = logging.getLogger("batch_forecast")
+
+# Pool shared across batches (kept warm between calls)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+# Cube panel of the batch a worker is running: (panel file named by its fingerprint, panel)
+_worker_panel: Tuple[Optional[str], Optional[SeriesPanel]] = (None, None)
+
+
+def _warm_worker() -> None:
+    """Process initializer: pay the heavy imports once per worker."""
+    logging.getLogger("cmdstanpy").setLevel(logging.WARNING)
+    from prophet import Prophet
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing  # noqa: F401
+
+    # Instantiating Prophet loads the Stan backend
+    Prophet()
+
+
+def _load_panel(path: str) -> SeriesPanel:
+    """Worker: the batch's cube panel, unpickled once per batch file."""
+    global _worker_panel
+    if _worker_panel[0] != path:
+        with open(path, "rb") as f:
+            _worker_panel = (path, pickle.load(f))
+    panel = _worker_panel[1]
+    assert panel is not None
+    return panel
+
+
+def _forecast_job(
+    job: Tuple[str, pd.DataFrame, int, Optional[date], Union[SeriesPanel, str, None]]
+) -> Tuple[str, ForecastToolResult]:
+    """Worker: forecast one category series (panel given directly or as a batch panel file)."""
+    category, weekly_sales, forecast_horizon_weeks, season_start_date, panel = job
+    if isinstance(panel, str):
+        panel = _load_panel(panel)
+    return category, forecast_weekly_sales(
+        weekly_sales, category, forecast_horizon_weeks, season_start_date, panel=panel
+    )
+
+
+def _error_result(message: str) -> ForecastToolResult:
+    return ForecastToolResult(
+        total_demand=0,
+        forecast_by_week=[],
+        safety_stock_pct=0.50,
+        confidence=0.0,
+        model_used="none",
+        error=message,
+    )
+
+
+def get_forecast_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Get (or start) the shared pool of pre-warmed forecasting workers.
+
+    Args:
+        workers: Worker processes (default: CPU count). A different count
+                 replaces the running pool.
+    """
+    global _pool, _pool_workers
+    workers = workers or os.cpu_count() or 1
+    if _pool is None or workers != _pool_workers:
+        shutdown_forecast_pool()
+        # spawn: Prophet/cmdstan and Streamlit threads are not fork-safe
+        _pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+        _pool_workers = workers
+    return _pool
+
+
+def shutdown_forecast_pool() -> None:
+    """Stop the shared worker pool (it is restarted on the next batch)."""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+    _pool = None
+    _pool_workers = 0
+
+
+def run_batch_forecast(
+    data_loader,
+    categories: List[str],
+    forecast_horizon_weeks: int,
+    season_start_date: Optional[date] = None,
+    store_ids: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    panel: Optional[SeriesPanel] = None,
+) -> Dict[str, ForecastToolResult]:
+    """
+    Forecast several categories in parallel.
+
+    Args:
+        data_loader: TrainingDataLoader providing weekly sales
+        categories: Categories to forecast
+        forecast_horizon_weeks: Number of weeks ahead to forecast
+        season_start_date: Optional start date for calendar-aligned forecasting
+        store_ids: Optional store subset; each category is forecast on the
+                   summed sales of these stores only (default: all stores)
+        workers: Worker processes (default: settings.forecast_workers, 0 = CPU count);
+                 1 runs in-process
+        panel: Cube panel the global_gbm candidate trains on (see
+               demand_tools.cube_panel()). Pass the same panel the serving
+               path uses, or the forecasts (and their model cache keys) differ
+               from run_demand_forecast's whenever global_gbm is a candidate.
+
+    Returns:
+        Dict of category -> ForecastToolResult, in the order given. Failed
+        categories carry the failure in `error`.
+    """
+    if workers is None:
+        from config.settings import settings
+        workers = settings.forecast_workers or None
+
+    results: Dict[str, ForecastToolResult] = {}
+    jobs = []
+    for category in dict.fromkeys(categories):
+        try:
+            weekly_sales = data_loader.get_weekly_sales(category, store_ids)
+        except Exception as e:
+            logger.error(f"Could not load weekly sales for {category}: {e}")
+            results[category] = _error_result(f"Unexpected error: {str(e)}")
+            continue
+        jobs.append((category, weekly_sales, forecast_horizon_weeks, season_start_date, panel))
+
+    logger.info(
+        f"Batch forecast: {len(jobs)} categories, horizon={forecast_horizon_weeks}, "
+        f"stores={'all' if store_ids is None else len(store_ids)}"
+    )
+
+    if workers == 1 or len(jobs) <= 1:
+        for job in jobs:
+            category, result = _forecast_job(job)
+            results[category] = result
+    else:
+        pool = get_forecast_pool(workers)
+        broken = False
+        with tempfile.TemporaryDirectory(prefix="forecast_panel_") as tmp_dir:
+            if panel is not None:
+                # One copy of the panel per batch; each worker unpickles it once
+                panel_path = str(Path(tmp_dir) / f"panel-{panel.fingerprint()}.pkl")
+                with open(panel_path, "wb") as f:
+                    pickle.dump(panel, f, protocol=pickle.HIGHEST_PROTOCOL)
+                jobs = [job[:4] + (panel_path,) for job in jobs]
+            futures: Dict[str, Future] = {job[0]: pool.submit(_forecast_job, job) for job in jobs}
+            for category, future in futures.items():
+                try:
+                    results[category] = future.result()[1]
+                except BrokenProcessPool as e:
+                    # A worker died (e.g. out of memory); the next batch gets a fresh pool
+                    logger.error(f"Forecast worker crashed on {category}: {e}")
+                    results[category] = _error_result(f"Worker crashed: {str(e)}")
+                    broken = True
+                except Exception as e:
+                    logger.error(f"Batch forecast failed for {category}: {e}")
+                    results[category] = _error_result(f"Unexpected error: {str(e)}")
+        if broken:
+            shutdown_forecast_pool()
+
+    failed = [c for c, r in results.items() if r.error]
+    logger.info(f"Batch forecast complete: {len(results) - len(failed)} ok, {len(failed)} failed")
+    return {category: results[category] for category in dict.fromkeys(categories)}
+
+
+def run_global_forecast(
+    data_loader,
+    categories: List[str],
+    forecast_horizon_weeks: int,
+    season_start_date: Optional[date] = None,
+    quantiles: Optional[Sequence[float]] = None,
+) -> Dict[str, ForecastToolResult]:
+    """
+    Forecast several categories with one global gradient-boosting model.
+
+    The model is trained once on every store × category series and category
+    total of the weekly cube (or taken from the model cache), and all
+    requested category totals are forecast in one batched pass. Demand
+    quantiles are bootstrapped for all of them in one vectorized pass too.
+
+    Args:
+        data_loader: TrainingDataLoader providing the weekly cube and store attributes
+        categories: Categories to forecast
+        forecast_horizon_weeks: Number of weeks ahead to forecast
+        season_start_date: Optional start date for calendar-aligned forecasting
+        quantiles: Demand quantiles to bootstrap (default: FORECAST_QUANTILES)
+
+    Returns:
+        Dict of category -> ForecastToolResult, in the order given. Unknown
+        categories carry the failure in `error`.
+    """
+    results: Dict[str, ForecastToolResult] = {}
+    try:
+        panel = data_loader.get_cube_panel()
+        model = get_global_forecaster(panel)
+    except Exception as e:
+        logger.error(f"Global model training failed: {e}")
+        return {category: _error_result(f"Global model training failed: {str(e)}") for category in categories}
+
+    rows = {category: row for row, (category, store_id) in enumerate(panel.keys) if store_id is None}
+    requested = [c for c in dict.fromkeys(categories) if c in rows]
+    for category in dict.fromkeys(categories):
+        if category not in rows:
+            results[category] = _error_result(f"No historical sales data found for category: {category}")
+
+    if requested:
+        offset = season_start_offset(pd.Timestamp(panel.week_ends[-1]).date(), season_start_date)
+        batch = model.forecast(panel, forecast_horizon_weeks, offset, rows=[rows[c] for c in requested])
+
+        quantiles = configured_quantiles() if quantiles is None else quantiles
+        distribution = None
+        if quantiles:
+            # Error spread calibrated to the global model's residuals (normal MAE ≈ 0.8σ)
+            errors, counts = seasonal_error_matrix(panel.values[[rows[c] for c in requested]])
+            relative_mae = np.full(len(requested), np.sqrt(2 / np.pi) * model.residual_std)
+            distribution = bootstrap_forecast(
+                batch["predictions"], errors, counts, scale=calibration_scale(errors, counts, relative_mae)
+            )
+
+        for i, category in enumerate(requested):
+            predictions = batch["predictions"][i]
+            confidence = ExponentialSmoothingWrapper.get_confidence({
+                "predictions": predictions,
+                "lower_bound": batch["lower_bound"][i],
+                "upper_bound": batch["upper_bound"][i],
+            })
+            total_demand = int(predictions.sum())
+            results[category] = ForecastToolResult(
+                total_demand=total_demand,
+                forecast_by_week=predictions.tolist(),
+                safety_stock_pct=0.20,
+                confidence=round(confidence, 2),
+                model_used="global_gbm",
+                lower_bound=batch["lower_bound"][i].tolist(),
+                upper_bound=batch["upper_bound"][i].tolist(),
+                weekly_average=total_demand // forecast_horizon_weeks if forecast_horizon_weeks > 0 else 0,
+                data_quality=data_quality(confidence),
+            )
+            if distribution is not None:
+                summary = distribution.summary(i, quantiles)
+                results[category].demand_quantiles = summary["weekly"]
+                results[category].season_demand_quantiles = summary["season_total"]
+
+    logger.info(f"Global forecast complete: {len(requested)} categories from one model")
+    return {category: results[category] for category in dict.fromkeys(categories)}
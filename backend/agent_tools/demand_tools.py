@@ -23,25 +23,119 @@ SDK Pattern:
 # ============================================================================
 
 from datetime import date
-from typing import Annotated, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Annotated, Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from statistics import NormalDist
+import asyncio
+import copy
 import logging
+import os
+import threading
+import time
 import warnings
-import sys
-import io
 
 import pandas as pd
 import numpy as np
-from prophet import Prophet
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tsa.stattools import adfuller
 from pydantic import BaseModel, Field, ConfigDict
 from agents import function_tool, RunContextWrapper
 
 # Import context type for type hints
+from config.settings import settings
 from utils.context import ForecastingContext
+from utils.backtest import BacktestConfig, BacktestResult, rolling_origins, run_backtest
+from utils.forecast_store import get_forecast_store
+from utils.global_forecaster import (
+    GlobalBoostingForecaster,
+    SeriesPanel,
+    get_global_forecaster,
+    series_panel,
+)
+from utils.hierarchical_forecast import (
+    SEASON_LENGTH,
+    season_start_offset,
+    seasonal_level_forecast,
+    seasonal_naive_variance,
+)
+from utils.holt_winters import (
+    DEFAULT_DRIFT_THRESHOLD,
+    DEFAULT_REFIT_EVERY,
+    HoltWintersFit,
+    fit_holt_winters,
+)
+from utils.model_cache import get_lineage_cache, get_model_cache, history_fingerprint, model_cache_key
+from utils.seasonality_profile import SeasonalityProfile, profile_from_prophet
+from utils.probabilistic_forecast import (
+    DEFAULT_SAMPLES,
+    DemandDistribution,
+    bootstrap_forecast,
+    calibration_scale,
+    quantile_label,
+    seasonal_error_matrix,
+)
+
+# Prophet and statsmodels take seconds to import; they are loaded on first
+# fit so importing the tools (and starting the app) stays fast
+if TYPE_CHECKING:
+    from prophet import Prophet
 
 logger = logging.getLogger("demand_tools")
 
+# Prophet and CmdStan report through these loggers (cmdstanpy keeps the Stan
+# process output itself in files). While a fit runs, their records go to that
+# fit's own log instead of the console. The target list lives in a context
+# variable, so concurrent fits in threads or asyncio tasks each capture only
+# their own records and no process-wide stream is ever swapped.
+_PROPHET_LOGGERS = ("prophet", "prophet.models", "cmdstanpy")
+_fit_log: ContextVar[Optional[List[str]]] = ContextVar("prophet_fit_log", default=None)
+
+
+class _FitLogCapture(logging.Filter):
+    """Divert Prophet/CmdStan records into the current fit's log."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        captured = _fit_log.get()
+        if captured is None:
+            return True
+        captured.append(f"{record.levelname} {record.name}: {record.getMessage()}")
+        return False
+
+
+_fit_log_capture = _FitLogCapture()
+for _logger_name in _PROPHET_LOGGERS:
+    logging.getLogger(_logger_name).addFilter(_fit_log_capture)
+
+
+@contextmanager
+def _capture_fit_logs():
+    captured: List[str] = []
+    token = _fit_log.set(captured)
+    try:
+        yield captured
+    finally:
+        _fit_log.reset(token)
+
+
+# Concurrent Prophet fits (each one a CmdStan process) are bounded process-wide
+_max_concurrent_fits = settings.prophet_max_concurrent_fits or os.cpu_count() or 1
+_fit_slots = threading.BoundedSemaphore(_max_concurrent_fits)
+_training_executor: Optional[ThreadPoolExecutor] = None
+_training_executor_lock = threading.Lock()
+
+
+def get_training_executor() -> ThreadPoolExecutor:
+    """Shared thread pool for asynchronous Prophet training (one thread per fit slot)."""
+    global _training_executor
+    with _training_executor_lock:
+        if _training_executor is None:
+            _training_executor = ThreadPoolExecutor(
+                max_workers=_max_concurrent_fits, thread_name_prefix="prophet-train"
+            )
+    return _training_executor
+
 
 # ============================================================================
 # SECTION 2: Tool Output Schema
@@ -81,6 +175,26 @@ class SeasonalityInsight(BaseModel):
     )
 
 
+class SeasonalitySummary(BaseModel):
+    """Compact seasonality of the forecast window, sliced from the cached profile."""
+    model_config = ConfigDict(extra='forbid')
+
+    months_covered: List[str] = Field(
+        default_factory=list,
+        description="Month names covered by forecast period (e.g., ['August', 'September'])",
+    )
+    peak_week: int = Field(default=0, description="Week number with highest seasonal demand (1-indexed)")
+    trough_week: int = Field(default=0, description="Week number with lowest seasonal demand (1-indexed)")
+    seasonal_range_pct: float = Field(
+        default=0.0,
+        description="Yearly seasonal swing over the window as a percentage of trend",
+    )
+    peak_effect_pct: float = Field(default=0.0, description="Seasonal effect at the peak week (% of trend)")
+    trough_effect_pct: float = Field(default=0.0, description="Seasonal effect at the trough week (% of trend)")
+    trend_pct_per_week: float = Field(default=0.0, description="Trend growth per week (% of trend level)")
+    description: str = Field(default="", description="One-line summary of the above")
+
+
 class ForecastToolResult(BaseModel):
     """
     Output from run_demand_forecast tool.
@@ -104,7 +218,11 @@ class ForecastToolResult(BaseModel):
         le=1.0,
     )
     model_used: str = Field(
-        description="Model(s) used: 'prophet_arima_ensemble', 'prophet', or 'arima'"
+        description=(
+            "Model(s) used, e.g. 'validation_ensemble(exp_smooth+prophet)'. Under a latency "
+            "budget, prefixed with the serving path: 'cache:', 'ensemble:' or 'fallback:'; "
+            "'precomputed:' when served from the offline forecast store"
+        )
     )
     lower_bound: List[int] = Field(
         default_factory=list,
@@ -124,7 +242,32 @@ class ForecastToolResult(BaseModel):
     )
     seasonality: Optional[SeasonalityInsight] = Field(
         default=None,
-        description="Seasonality components extracted from Prophet for explainability",
+        description=(
+            "Per-week seasonality components extracted from Prophet for explainability "
+            "(only when FORECAST_SEASONALITY_DETAIL=full)"
+        ),
+    )
+    seasonality_summary: Optional[SeasonalitySummary] = Field(
+        default=None,
+        description="Compact seasonality of the forecast window (peak/trough, swing, trend)",
+    )
+    training_seconds_saved: float = Field(
+        default=0.0,
+        description=(
+            "Estimated training time adaptive model selection skipped for this request "
+            "(seconds; 0 when the trained model was served from cache)"
+        ),
+    )
+    demand_quantiles: Dict[str, List[int]] = Field(
+        default_factory=dict,
+        description=(
+            "Bootstrapped weekly demand quantiles, e.g. {'p10': [...], 'p90': [...]} "
+            "(only when quantiles are requested)"
+        ),
+    )
+    season_demand_quantiles: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Quantiles of total demand over the forecast horizon, e.g. {'p95': 41200}",
     )
     error: Optional[str] = Field(
         default=None,
@@ -155,12 +298,34 @@ class ForecastingError(Exception):
 # SECTION 4: ProphetWrapper - Seasonality forecasting
 # ============================================================================
 
+# Predicted weeks kept per fitted Prophet model (a few seasons of calendar alignments)
+PROPHET_WEEK_ROW_CACHE_SIZE = 512
+
+
 class ProphetWrapper:
     """Wrapper for Facebook Prophet time series forecasting."""
 
-    def __init__(self, config: Optional[Dict] = None):
-        self.model: Optional[Prophet] = None
-        self.forecast_df: Optional[pd.DataFrame] = None
+    def __init__(self, config: Optional[Dict] = None, uncertainty_samples: Optional[int] = None):
+        """
+        Args:
+            config: Prophet hyperparameters (part of the model cache key)
+            uncertainty_samples: Posterior samples drawn for the prediction
+                                 intervals; 0 = analytic intervals, no sampling.
+                                 None = PROPHET_UNCERTAINTY_SAMPLES, read at
+                                 forecast time
+        """
+        self.model: Optional["Prophet"] = None
+        self.uncertainty_samples = uncertainty_samples
+        # Predicted rows per (week, uncertainty samples) for the current fit, LRU
+        # bounded; the wrapper may sit in a cached ensemble shared across threads
+        self._week_rows: "OrderedDict[Tuple[pd.Timestamp, int], Dict]" = OrderedDict()
+        self._week_rows_lock = threading.Lock()
+        self.fit_seconds: Optional[float] = None
+        self.wait_seconds = 0.0     # time queued for a fit slot
+        self.fit_log: List[str] = []  # Prophet/CmdStan log records of the last fit
+        self.warm_started = False
+        # Yearly/weekly effects and trend of the current fit (explainability)
+        self.seasonality_profile: Optional[SeasonalityProfile] = None
         self.config = config or {
             "seasonality_mode": "multiplicative",
             "yearly_seasonality": True,
@@ -170,8 +335,17 @@ class ProphetWrapper:
             "seasonality_prior_scale": 10.0,
         }
 
-    def train(self, historical_data: pd.DataFrame) -> None:
-        """Train Prophet model on historical sales data."""
+    def train(self, historical_data: pd.DataFrame, init_params: Optional[Dict] = None) -> None:
+        """
+        Train Prophet model on historical sales data.
+
+        Args:
+            historical_data: Weekly sales with 'date' and 'quantity_sold' columns
+            init_params: Optional warm start (k, m, delta, beta, sigma_obs from a
+                         previous fit, see warm_start_params()). Seeds the Stan
+                         optimizer so a refit on extended history converges in
+                         fewer iterations; the optimum itself is unchanged.
+        """
         required_columns = ["date", "quantity_sold"]
         if not all(col in historical_data.columns for col in required_columns):
             raise ValueError(f"Missing required columns: {required_columns}")
@@ -190,6 +364,8 @@ class ProphetWrapper:
         if not pd.api.types.is_datetime64_any_dtype(df_prophet["ds"]):
             df_prophet["ds"] = pd.to_datetime(df_prophet["ds"])
 
+        from prophet import Prophet
+
         try:
             self.model = Prophet(
                 seasonality_mode=self.config["seasonality_mode"],
@@ -200,16 +376,76 @@ class ProphetWrapper:
                 seasonality_prior_scale=self.config["seasonality_prior_scale"],
             )
 
-            # Suppress Prophet's output
-            old_stdout = sys.stdout
-            sys.stdout = io.StringIO()
-            self.model.fit(df_prophet)
-            sys.stdout = old_stdout
+            with self._week_rows_lock:
+                self._week_rows.clear()
+            fit_kwargs = {"init": init_params} if init_params else {}
+
+            # Wait for a fit slot, then fit with Prophet's logging captured per fit
+            queued = time.perf_counter()
+            with _fit_slots, _capture_fit_logs() as fit_log:
+                start = time.perf_counter()
+                self.wait_seconds = start - queued
+                try:
+                    self.model.fit(df_prophet, **fit_kwargs)
+                finally:
+                    self.fit_seconds = time.perf_counter() - start
+                    self.fit_log = fit_log
+            self.warm_started = bool(init_params)
+            try:
+                self.seasonality_profile = profile_from_prophet(self.model)
+            except Exception as e:
+                logger.warning(f"Seasonality profile failed: {e}")
+                self.seasonality_profile = None
 
-            logger.info(f"Prophet trained on {len(df_prophet)} data points")
+            logger.info(
+                f"Prophet trained on {len(df_prophet)} data points in {self.fit_seconds:.2f}s "
+                f"({'warm' if self.warm_started else 'cold'} start)"
+            )
         except Exception as e:
             raise ModelTrainingError(f"Prophet training failed: {str(e)}")
 
+    def __getstate__(self) -> Dict:
+        # Pickled into the model cache: the lock can't be, and cached rows are cheap to rebuild
+        state = self.__dict__.copy()
+        del state["_week_rows_lock"]
+        state["_week_rows"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._week_rows_lock = threading.Lock()
+
+    async def train_async(self, historical_data: pd.DataFrame, init_params: Optional[Dict] = None) -> None:
+        """
+        train() on the shared training executor, for use from asyncio code.
+
+        The event loop stays free while the fit runs; concurrent calls are
+        bounded by the same fit slots as threaded training.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            get_training_executor(), partial(self.train, historical_data, init_params)
+        )
+
+    def warm_start_params(self) -> Optional[Dict]:
+        """
+        Fitted Stan parameters in the form accepted by train(init_params=...).
+
+        Returns:
+            Dict with k, m, sigma_obs (floats) and delta, beta (arrays), or None
+            if the model is not trained
+        """
+        if self.model is None or not getattr(self.model, "params", None):
+            return None
+        params = self.model.params
+        return {
+            "k": float(params["k"][0][0]),
+            "m": float(params["m"][0][0]),
+            "sigma_obs": float(params["sigma_obs"][0][0]),
+            "delta": np.array(params["delta"][0]),
+            "beta": np.array(params["beta"][0]),
+        }
+
     def forecast(self, periods: int, start_date: Optional[date] = None) -> Dict:
         """
         Generate forecast for specified number of periods.
@@ -228,82 +464,126 @@ class ProphetWrapper:
             # Create future dataframe starting from the specified date
             # This aligns the forecast with calendar seasonality patterns
             future_dates = pd.date_range(start=start_date, periods=periods, freq="W")
-            future = pd.DataFrame({"ds": future_dates})
         else:
-            # Default: continue from last historical date
-            future = self.model.make_future_dataframe(periods=periods, freq="W")
-
-        forecast_df = self.model.predict(future)
-        forecast_future = forecast_df.tail(periods)
-        self.forecast_df = forecast_future
-
-        # Extract seasonality components for explainability
-        seasonality_data = self._extract_seasonality(forecast_future)
+            # Default: continue from last historical date (future weeks only)
+            future_dates = self.model.make_future_dataframe(
+                periods=periods, freq="W", include_history=False
+            )["ds"]
+
+        # Only weeks not predicted before under this fit go through Prophet
+        n_samples = self.uncertainty_samples
+        if n_samples is None:
+            n_samples = settings.prophet_uncertainty_samples
+        rows = self._cached_week_rows(future_dates, n_samples)
+        missing = [ds for ds in future_dates if ds not in rows]
+        if missing:
+            predicted = self._predict(pd.DataFrame({"ds": missing}), n_samples)
+            for row in predicted.to_dict("records"):
+                rows[row["ds"]] = row
+            self._cache_week_rows(rows, n_samples)
+
+        # Built per call: concurrent callers of a shared wrapper never see each other's weeks
+        forecast_future = pd.DataFrame([rows[ds] for ds in future_dates])
 
-        return {
+        result = {
             "predictions": [max(0, int(round(val))) for val in forecast_future["yhat"].tolist()],
             "lower_bound": [max(0, int(round(val))) for val in forecast_future["yhat_lower"].tolist()],
             "upper_bound": [max(0, int(round(val))) for val in forecast_future["yhat_upper"].tolist()],
             "dates": forecast_future["ds"].dt.strftime("%Y-%m-%d").tolist(),
-            "seasonality": seasonality_data,
+            "confidence": self.get_confidence(forecast_future),
         }
 
-    def _extract_seasonality(self, forecast_df: pd.DataFrame) -> Dict:
-        """
-        Extract seasonality components from Prophet forecast for explainability.
+        # Seasonality for explainability, sliced from the profile cached at training
+        if self.seasonality_profile is not None:
+            result["seasonality"] = self.seasonality_profile.window(future_dates)
+            result["seasonality_summary"] = self.seasonality_profile.summary(future_dates)
+        return result
 
-        Returns dict with:
-        - yearly_effect: List of yearly seasonality multipliers per week
-        - weekly_effect: List of weekly seasonality effects (if enabled)
-        - trend: Trend component values
-        - peak_week: Week index with highest seasonal effect
-        - trough_week: Week index with lowest seasonal effect
-        - seasonal_range_pct: Percentage range of seasonal variation
+    def _cached_week_rows(self, weeks, n_samples: int) -> Dict[pd.Timestamp, Dict]:
+        """Rows already predicted under this fit for the given weeks."""
+        with self._week_rows_lock:
+            rows = {}
+            for ds in weeks:
+                row = self._week_rows.get((ds, n_samples))
+                if row is not None:
+                    self._week_rows.move_to_end((ds, n_samples))
+                    rows[ds] = row
+            return rows
+
+    def _cache_week_rows(self, rows: Dict[pd.Timestamp, Dict], n_samples: int) -> None:
+        with self._week_rows_lock:
+            for ds, row in rows.items():
+                self._week_rows[(ds, n_samples)] = row
+                self._week_rows.move_to_end((ds, n_samples))
+            while len(self._week_rows) > PROPHET_WEEK_ROW_CACHE_SIZE:
+                self._week_rows.popitem(last=False)
+
+    def _predict(self, future: pd.DataFrame, n_samples: int) -> pd.DataFrame:
         """
-        result = {
-            "yearly_effect": [],
-            "weekly_effect": [],
-            "trend": [],
-            "peak_week": 0,
-            "trough_week": 0,
-            "seasonal_range_pct": 0.0,
-            "months_covered": [],
-        }
+        Prophet predictions for the given weeks.
 
-        try:
-            # Extract yearly seasonality if present
-            if "yearly" in forecast_df.columns:
-                yearly = forecast_df["yearly"].tolist()
-                result["yearly_effect"] = [round(v, 2) for v in yearly]
-
-                # Find peak and trough
-                if yearly:
-                    result["peak_week"] = int(np.argmax(yearly)) + 1
-                    result["trough_week"] = int(np.argmin(yearly)) + 1
-
-                    # Calculate seasonal range as percentage of mean prediction
-                    mean_pred = forecast_df["yhat"].mean()
-                    if mean_pred > 0:
-                        seasonal_range = max(yearly) - min(yearly)
-                        result["seasonal_range_pct"] = round((seasonal_range / mean_pred) * 100, 1)
-
-            # Extract weekly seasonality if present
-            if "weekly" in forecast_df.columns:
-                result["weekly_effect"] = [round(v, 2) for v in forecast_df["weekly"].tolist()]
-
-            # Extract trend
-            if "trend" in forecast_df.columns:
-                result["trend"] = [round(v, 2) for v in forecast_df["trend"].tolist()]
-
-            # Get months covered in the forecast period
-            if "ds" in forecast_df.columns:
-                months = forecast_df["ds"].dt.strftime("%B").unique().tolist()
-                result["months_covered"] = months
+        With n_samples > 0 the intervals are percentiles of that many posterior
+        predictive draws (Prophet's own method). With 0 nothing is sampled and
+        the intervals come from _analytic_intervals().
 
-        except Exception as e:
-            logger.warning(f"Error extracting seasonality: {e}")
+        The fitted model may be shared by concurrent callers (cached ensembles),
+        so a different sample count is set on a shallow copy rather than on
+        the shared model.
+        """
+        model = self.model
+        assert model is not None, "Model not trained. Call train() first."
+        if model.uncertainty_samples != n_samples:
+            model = copy.copy(model)
+            model.uncertainty_samples = n_samples
+        forecast_df = model.predict(future)
+        if not n_samples:
+            forecast_df = self._analytic_intervals(forecast_df)
+        return forecast_df
+
+    def _analytic_intervals(self, forecast_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normal approximation of Prophet's sampled prediction intervals.
+
+        Prophet's draws add two independent terms to yhat: observation noise
+        (sigma_obs) and future trend changes, where each future week changes
+        the slope with the history's changepoint rate by a Laplace amount
+        scaled to the mean fitted changepoint. Both variances are exact for
+        that process (same smoothing and double cumulation as Prophet's trend
+        sampler), so only the shape of the trend-change distribution is
+        approximated. Linear growth only.
+        """
+        model = self.model
+        assert model is not None and model.history is not None and model.changepoints_t is not None
+        z = NormalDist().inv_cdf((1 + model.interval_width) / 2)
+        t = ((forecast_df["ds"] - model.start) / model.t_scale).to_numpy()
+        trend_sd = np.zeros(len(forecast_df))
+
+        future = t > 1
+        n_future = int(future.sum())
+        if n_future:
+            single_diff = (
+                np.diff(t[future]).mean() if n_future > 1 else np.diff(model.history["t"]).mean()
+            )
+            change_likelihood = min(len(model.changepoints_t) * single_diff, 1.0)
+            mean_delta = np.mean(np.abs(model.params["delta"][0])) + 1e-8
+            shift_var = change_likelihood * 2 * mean_delta ** 2
+
+            # Trend offset per future week as a linear combination of the weekly shifts
+            smoothing = (np.eye(n_future) + np.eye(n_future, k=-1)) / 2
+            coefficients = smoothing.cumsum(axis=0).cumsum(axis=0)
+            trend_sd[future] = (
+                single_diff * np.sqrt(shift_var * (coefficients ** 2).sum(axis=1)) * model.y_scale
+            )
 
-        return result
+        noise_sd = model.params["sigma_obs"][0][0] * model.y_scale
+        yhat_sd = np.sqrt((trend_sd * (1 + forecast_df["multiplicative_terms"].to_numpy())) ** 2 + noise_sd ** 2)
+
+        forecast_df = forecast_df.copy()
+        forecast_df["yhat_lower"] = forecast_df["yhat"] - z * yhat_sd
+        forecast_df["yhat_upper"] = forecast_df["yhat"] + z * yhat_sd
+        forecast_df["trend_lower"] = forecast_df["trend"] - z * trend_sd
+        forecast_df["trend_upper"] = forecast_df["trend"] + z * trend_sd
+        return forecast_df
 
     def get_confidence(self, forecast_df: pd.DataFrame) -> float:
         """Calculate confidence from prediction intervals."""
@@ -339,6 +619,8 @@ class ARIMAWrapper:
 
     def _determine_d(self, y: np.ndarray) -> int:
         """Determine differencing order using ADF test."""
+        from statsmodels.tsa.stattools import adfuller
+
         try:
             result = adfuller(y, autolag="AIC")
             if result[1] < 0.05:
@@ -355,6 +637,8 @@ class ARIMAWrapper:
 
     def _select_parameters_stepwise(self, y: np.ndarray, d: int) -> Tuple[int, int, int]:
         """Select ARIMA parameters using stepwise search."""
+        from statsmodels.tsa.arima.model import ARIMA
+
         best_aic = np.inf
         best_order = (1, d, 1)
 
@@ -379,6 +663,8 @@ class ARIMAWrapper:
 
     def train(self, historical_data: pd.DataFrame) -> None:
         """Train ARIMA model using auto parameter selection."""
+        from statsmodels.tsa.arima.model import ARIMA
+
         required_columns = ["date", "quantity_sold"]
         if not all(col in historical_data.columns for col in required_columns):
             raise ValueError(f"Missing required columns: {required_columns}")
@@ -485,13 +771,13 @@ class ExponentialSmoothingWrapper:
     """
 
     def __init__(self):
-        from statsmodels.tsa.holtwinters import ExponentialSmoothing as HoltWinters
-        self.HoltWinters = HoltWinters
         self.model = None
         self.forecast_result: Optional[Dict] = None
 
     def train(self, historical_data: pd.DataFrame) -> None:
         """Train Holt-Winters model."""
+        from statsmodels.tsa.holtwinters import ExponentialSmoothing as HoltWinters
+
         required_columns = ["date", "quantity_sold"]
         if not all(col in historical_data.columns for col in required_columns):
             raise ValueError(f"Missing required columns: {required_columns}")
@@ -511,7 +797,7 @@ class ExponentialSmoothingWrapper:
 
             # Try multiplicative seasonality first (better for retail)
             try:
-                self.model = self.HoltWinters(
+                self.model = HoltWinters(
                     y,
                     seasonal='mul',
                     trend='add',
@@ -521,7 +807,7 @@ class ExponentialSmoothingWrapper:
                 logger.info(f"Exponential Smoothing trained (multiplicative) on {len(y)} weeks")
             except:
                 # Fallback to additive if multiplicative fails
-                self.model = self.HoltWinters(
+                self.model = HoltWinters(
                     y,
                     seasonal='add',
                     trend='add',
@@ -560,7 +846,8 @@ class ExponentialSmoothingWrapper:
         except Exception as e:
             raise RuntimeError(f"Forecast generation failed: {e}")
 
-    def get_confidence(self, forecast_result: Dict) -> float:
+    @staticmethod
+    def get_confidence(forecast_result: Dict) -> float:
         """Calculate confidence score."""
         predictions = np.array(forecast_result["predictions"])
         lower_bound = np.array(forecast_result["lower_bound"])
@@ -577,6 +864,324 @@ class ExponentialSmoothingWrapper:
         return max(0.0, min(1.0, confidence))
 
 
+# ============================================================================
+# SECTION 5.6: VectorizedHoltWintersWrapper - NumPy Holt-Winters forecasting
+# ============================================================================
+
+class VectorizedHoltWintersWrapper(ExponentialSmoothingWrapper):
+    """
+    Holt-Winters on the native vectorized engine (utils/holt_winters.py).
+
+    Drop-in replacement for ExponentialSmoothingWrapper (same train/forecast
+    interface and result dict). Parameters come from a batched grid search
+    instead of a statsmodels optimizer run, which is ~30x faster per series
+    and lets thousands of store series be fitted in one call.
+
+    New actuals can be added with update() instead of retraining: the states
+    run forward with the fitted parameters, and a full refit happens only
+    when one-step errors drift or a refit is due.
+    """
+
+    def __init__(
+        self,
+        seasonal: str = "mul",
+        drift_threshold: float = DEFAULT_DRIFT_THRESHOLD,
+        refit_every: Optional[int] = DEFAULT_REFIT_EVERY,
+    ):
+        self.seasonal = seasonal
+        self.drift_threshold = drift_threshold
+        self.refit_every = refit_every
+        self.model: Optional[HoltWintersFit] = None
+        self.history: Optional[pd.DataFrame] = None
+        self.forecast_result: Optional[Dict] = None
+
+    def train(self, historical_data: pd.DataFrame) -> None:
+        """Train Holt-Winters on the vectorized engine."""
+        required_columns = ["date", "quantity_sold"]
+        if not all(col in historical_data.columns for col in required_columns):
+            raise ValueError(f"Missing required columns: {required_columns}")
+
+        if len(historical_data) < 26:
+            raise ValueError(
+                f"Holt-Winters requires at least 26 weeks. Provided: {len(historical_data)}"
+            )
+
+        y = pd.Series(historical_data["quantity_sold"].values, dtype=float).ffill().values
+        seasonal_periods = min(52, len(y) // 2)
+
+        try:
+            self.model = fit_holt_winters(y, season_length=seasonal_periods, seasonal=self.seasonal)
+            self.history = historical_data[required_columns].reset_index(drop=True)
+            logger.info(
+                f"Vectorized Holt-Winters trained ({self.seasonal}) on {len(y)} weeks "
+                f"(alpha={self.model.alpha[0]}, beta={self.model.beta[0]}, gamma={self.model.gamma[0]})"
+            )
+        except Exception as e:
+            raise RuntimeError(f"Vectorized Holt-Winters training failed: {str(e)}")
+
+    def update(self, new_observations) -> bool:
+        """
+        Add new weeks of actuals without re-estimating parameters.
+
+        Level/trend/season states advance from the stored ones in O(new weeks).
+        The model is refit on the full history when the one-step errors since
+        the last fit drift above drift_threshold × the fit-time MSE, or after
+        refit_every updated weeks.
+
+        Args:
+            new_observations: DataFrame with 'date' and 'quantity_sold' columns,
+                              or a sequence of weekly quantities following the history
+
+        Returns:
+            True if the update triggered a full refit
+        """
+        if self.model is None or self.history is None:
+            raise RuntimeError("Model not trained. Call train() first.")
+
+        if isinstance(new_observations, pd.DataFrame):
+            new_rows = new_observations[["date", "quantity_sold"]]
+        else:
+            quantities = list(np.atleast_1d(new_observations))
+            last_date = pd.Timestamp(self.history["date"].iloc[-1])
+            new_rows = pd.DataFrame({
+                "date": [last_date + pd.Timedelta(weeks=i + 1) for i in range(len(quantities))],
+                "quantity_sold": quantities,
+            })
+        if new_rows.empty:
+            return False
+
+        self.history = pd.concat([self.history, new_rows], ignore_index=True)
+        y = self.history["quantity_sold"].astype(float).ffill().values[-len(new_rows):]
+        errors = self.model.update(y)
+
+        if self.model.needs_refit(self.drift_threshold, self.refit_every)[0]:
+            logger.info(
+                f"Holt-Winters refit after {self.model.n_updates[0]} updated weeks "
+                f"(drift ratio {self.model.drift_ratio[0]:.1f})"
+            )
+            self.train(self.history)
+            return True
+
+        logger.info(
+            f"Holt-Winters updated with {len(new_rows)} weeks "
+            f"(last one-step error {errors[0, -1]:+.0f})"
+        )
+        return False
+
+    def forecast(self, periods: int) -> Dict:
+        """Generate forecast."""
+        if self.model is None:
+            raise RuntimeError("Model not trained. Call train() first.")
+
+        batch = self.model.forecast(periods)
+        result = {key: values[0].tolist() for key, values in batch.items()}
+        self.forecast_result = result
+        return result
+
+
+# ============================================================================
+# SECTION 5.7: Fast fallback models - Seasonal naive and seasonal index
+# ============================================================================
+
+class SeasonalNaiveWrapper:
+    """
+    Seasonal naive: each forecast week repeats the same week of the last season.
+
+    Fits in microseconds; the floor model when a forecast must be served
+    within a latency budget.
+    """
+
+    def __init__(self, season_length: int = SEASON_LENGTH):
+        self.season_length = season_length
+        self.history: Optional[np.ndarray] = None
+        self.residual_std = 0.0
+        self.forecast_result: Optional[Dict] = None
+
+    def train(self, historical_data: pd.DataFrame) -> None:
+        """Store the history and the spread of seasonal-naive errors."""
+        required_columns = ["date", "quantity_sold"]
+        if not all(col in historical_data.columns for col in required_columns):
+            raise ValueError(f"Missing required columns: {required_columns}")
+        if len(historical_data) == 0:
+            raise InsufficientDataError("Seasonal naive requires at least 1 week of data")
+
+        self.history = pd.Series(historical_data["quantity_sold"].values, dtype=float).ffill().fillna(0).values
+        self.season_length = min(self.season_length, len(self.history))
+        self.residual_std = float(np.sqrt(seasonal_naive_variance(self.history[None, :], self.season_length)[0]))
+
+    def _point_forecast(self, periods: int) -> np.ndarray:
+        assert self.history is not None
+        last_season = self.history[-self.season_length:]
+        return last_season[np.arange(periods) % self.season_length]
+
+    def forecast(self, periods: int) -> Dict:
+        """Generate forecast with 95% intervals from the seasonal-naive error spread."""
+        if self.history is None:
+            raise RuntimeError("Model not trained. Call train() first.")
+
+        predictions = np.maximum(np.round(self._point_forecast(periods)), 0).astype(int)
+        margin = 1.96 * self.residual_std
+        result = {
+            "predictions": predictions.tolist(),
+            "lower_bound": np.maximum(predictions - margin, 0).astype(int).tolist(),
+            "upper_bound": (predictions + margin).astype(int).tolist(),
+        }
+        self.forecast_result = result
+        return result
+
+    def get_confidence(self, forecast_result: Dict) -> float:
+        """Calculate confidence score (same scale as Exponential Smoothing)."""
+        return ExponentialSmoothingWrapper.get_confidence(forecast_result)
+
+
+class SeasonalIndexWrapper(SeasonalNaiveWrapper):
+    """
+    Moving average × seasonal index: the recent deseasonalized level times
+    the averaged seasonal index, with damped year-over-year growth (the
+    store-level forecaster of utils/hierarchical_forecast.py on one series).
+    """
+
+    def _point_forecast(self, periods: int) -> np.ndarray:
+        assert self.history is not None
+        return seasonal_level_forecast(
+            self.history[None, :], periods, season_length=self.season_length
+        )[0]
+
+
+# ============================================================================
+# SECTION 5.8: GlobalBoostingWrapper - Cross-series gradient boosting
+# ============================================================================
+
+class GlobalBoostingWrapper:
+    """
+    Global gradient-boosting candidate (utils/global_forecaster.py).
+
+    Trained on every series of the cube panel it is given (the caller's
+    data loader's, see cube_panel()) up to the last week of the history it
+    is given, so each backtest origin is one shared fit across all
+    categories and stores. Without a panel (e.g. in a batch worker process)
+    it is fitted on the given series alone.
+    """
+
+    def __init__(self, cube_panel: Optional[SeriesPanel] = None):
+        """
+        Args:
+            cube_panel: Panel of every cube series (only needed to train)
+        """
+        self.cube_panel = cube_panel
+        self.model: Optional[GlobalBoostingForecaster] = None
+        self.panel: Optional[SeriesPanel] = None
+        self.row = 0
+        self.forecast_result: Optional[Dict] = None
+
+    def train(self, historical_data: pd.DataFrame) -> None:
+        """Fit (or fetch the cached) global model for this history's last week."""
+        required_columns = ["date", "quantity_sold"]
+        if not all(col in historical_data.columns for col in required_columns):
+            raise ValueError(f"Missing required columns: {required_columns}")
+
+        if len(historical_data) < 26:
+            raise ValueError(
+                f"Global model requires at least 26 weeks. Provided: {len(historical_data)}"
+            )
+
+        try:
+            panel, self.cube_panel = self.cube_panel, None
+            if panel is not None:
+                origin = panel.truncate(panel.weeks_through(historical_data["date"].iloc[-1]))
+                model = get_global_forecaster(origin)
+                row = origin.find_total(historical_data)
+                # Not a category total of the panel: forecast it as an unknown series
+                self.panel = origin if row is not None else series_panel(historical_data)
+            else:
+                row = None
+                self.panel = series_panel(historical_data)
+                model = GlobalBoostingForecaster().fit(self.panel)
+            self.model, self.row = model, row or 0
+            logger.info(
+                f"Global boosting model ready ({model.n_rows:,} training rows, "
+                f"{'panel' if row is not None else 'single'} series)"
+            )
+        except Exception as e:
+            raise RuntimeError(f"Global boosting training failed: {str(e)}")
+
+    def forecast(self, periods: int) -> Dict:
+        """Generate forecast."""
+        if self.model is None or self.panel is None:
+            raise RuntimeError("Model not trained. Call train() first.")
+
+        batch = self.model.forecast(self.panel, periods, rows=[self.row])
+        result = {key: values[0].tolist() for key, values in batch.items()}
+        self.forecast_result = result
+        return result
+
+    def get_confidence(self, forecast_result: Dict) -> float:
+        """Calculate confidence score (same scale as Exponential Smoothing)."""
+        return ExponentialSmoothingWrapper.get_confidence(forecast_result)
+
+
+def cube_panel(data_loader) -> Optional[SeriesPanel]:
+    """
+    The data loader's cube panel for the global candidate (None when it is disabled).
+
+    A panel that cannot be built only costs the candidate its cube panel
+    (global_gbm then forecasts the series on its own), never the forecast.
+    """
+    if "global_gbm" not in settings.ensemble_candidates:
+        return None
+    try:
+        return data_loader.get_cube_panel()
+    except Exception as e:
+        logger.warning(f"Global model panel unavailable, global_gbm falls back to single series: {e}")
+        return None
+
+
+# Last observed fit time per training week of each candidate in this process
+# (adaptive selection's estimate of skipped fit time without a previous fit)
+_fit_seconds_per_week: Dict[str, float] = {}
+
+
+def _record_fit_rate(name: str, seconds: float, weeks: int) -> None:
+    if weeks > 0:
+        _fit_seconds_per_week[name] = seconds / weeks
+
+
+def _trend_seasonality_proxy(train: pd.DataFrame, periods: int, multiplicative: bool = True) -> np.ndarray:
+    """
+    Least-squares linear trend + yearly Fourier terms, a cheap stand-in for a Prophet fit.
+
+    Prophet models weekly sales as a (piecewise) linear trend times or plus
+    yearly Fourier seasonality; this fits the same shape without changepoints
+    in one ridge solve, so its validation error estimates Prophet's without
+    running Stan.
+
+    Args:
+        train: Weekly sales with 'date' and 'quantity_sold' columns
+        periods: Weeks to forecast after the last training week
+        multiplicative: Fit on log1p(sales) (multiplicative seasonality)
+
+    Returns:
+        Non-negative predictions, shape (periods,)
+    """
+    dates = pd.to_datetime(train["date"]).to_numpy(dtype="datetime64[D]")
+    future = dates[-1] + np.arange(1, periods + 1) * np.timedelta64(7, "D")
+    days = np.concatenate([dates, future]).astype(np.int64).astype(float)
+    years = (days - days[0]) / 365.25
+    angles = 2 * np.pi * np.outer(days / 365.25, np.arange(1, 11))
+    features = np.column_stack([np.ones_like(years), years, np.sin(angles), np.cos(angles)])
+
+    y = train["quantity_sold"].to_numpy(dtype=float)
+    target = np.log1p(np.maximum(y, 0)) if multiplicative else y
+    fitted = features[:len(y)]
+    penalty = 1e-3 * len(y) * np.eye(features.shape[1])
+    penalty[0, 0] = 0.0     # intercept is not shrunk
+    coefficients = np.linalg.solve(fitted.T @ fitted + penalty, fitted.T @ target)
+    predictions = features[len(y):] @ coefficients
+    if multiplicative:
+        predictions = np.expm1(predictions)
+    return np.maximum(predictions, 0.0)
+
+
 # ============================================================================
 # SECTION 6: EnsembleForecaster - Validation-Based Dynamic Ensemble
 # ============================================================================
@@ -591,8 +1196,8 @@ class EnsembleForecaster:
 
     HOW IT WORKS:
     1. Splits historical data into train (80%) and validation (20%)
-    2. Trains both Prophet and Exponential Smoothing on training set
-    3. Tests both on validation set to measure accuracy
+    2. Trains each candidate (default: Prophet and Exponential Smoothing) on training set
+    3. Tests each on validation set to measure accuracy
     4. Calculates weights inversely proportional to validation errors
     5. Retrains on full data and uses weighted predictions
 
@@ -603,62 +1208,154 @@ class EnsembleForecaster:
     - Falls back gracefully if one model fails
     """
 
+    # Candidate models the ensemble can validate (name -> wrapper class)
+    CANDIDATE_MODELS = {
+        'prophet': ProphetWrapper,
+        'exp_smooth': ExponentialSmoothingWrapper,
+        'holt_winters_np': VectorizedHoltWintersWrapper,
+        'seasonal_naive': SeasonalNaiveWrapper,
+        'seasonal_index': SeasonalIndexWrapper,
+        'global_gbm': GlobalBoostingWrapper,
+    }
+    DEFAULT_CANDIDATES = ('prophet', 'exp_smooth')
+    VALIDATION_MODES = ('holdout', 'backtest')
+    SELECTION_MODES = ('full', 'adaptive')
+    # Slow to fit: adaptive selection races these after the cheap candidates
+    EXPENSIVE_CANDIDATES = ('prophet',)
+    # Adaptive selection skips an expensive candidate's validation only if it would
+    # stay under min_weight even with this fraction of its estimated error
+    ADAPTIVE_OPTIMISM = 0.5
+
     def __init__(
         self,
         prophet_wrapper: Optional[ProphetWrapper] = None,
         exp_smooth_wrapper: Optional[ExponentialSmoothingWrapper] = None,
+        candidates: Optional[List[str]] = None,
+        validation: str = "holdout",
+        backtest_config: Optional[BacktestConfig] = None,
+        selection: str = "full",
+        min_weight: float = 0.05,
+        panel: Optional[SeriesPanel] = None,
     ):
+        """
+        Args:
+            prophet_wrapper: Prophet instance to train on the full data
+            exp_smooth_wrapper: Exponential Smoothing instance to train on the full data
+            candidates: Names from CANDIDATE_MODELS to validate (default: DEFAULT_CANDIDATES)
+            validation: "holdout" (single 80/20 split) or "backtest" (parallel
+                        rolling-origin folds, cached per fold)
+            backtest_config: Rolling-origin layout for validation="backtest"
+            selection: "full" (validate and retrain every candidate) or "adaptive"
+                       (validate cheap candidates first; skip the fits of an
+                       expensive candidate that cannot earn min_weight)
+            min_weight: Smallest weight worth an expensive full-data fit (adaptive only)
+            panel: Cube panel the global_gbm candidate trains on (see cube_panel();
+                   part of the cache key, released after training)
+        """
+        if validation not in self.VALIDATION_MODES:
+            raise ValueError(f"validation must be one of {self.VALIDATION_MODES}, got '{validation}'")
+        if selection not in self.SELECTION_MODES:
+            raise ValueError(f"selection must be one of {self.SELECTION_MODES}, got '{selection}'")
+        self.validation = validation
+        self.selection = selection
+        self.min_weight = min_weight
+        self.panel = panel
+        self.panel_fingerprint = panel.fingerprint() if panel is not None else None
+        self.backtest_config = backtest_config or BacktestConfig()
+        self.backtest: Optional[BacktestResult] = None
         self.prophet = prophet_wrapper or ProphetWrapper()
         self.exp_smooth = exp_smooth_wrapper or ExponentialSmoothingWrapper()
+        self.candidates = list(candidates or self.DEFAULT_CANDIDATES)
+        unknown = [name for name in self.candidates if name not in self.CANDIDATE_MODELS]
+        if unknown:
+            raise ValueError(f"Unknown ensemble candidates: {unknown}")
         self.weights: Dict[str, float] = {}
-        self.models: Dict[str, any] = {}
+        self.validation_errors: Dict[str, float] = {}
+        self.models: Dict[str, Any] = {}
         self.model_used = "validation_ensemble"
-
-    def train(self, historical_data: pd.DataFrame) -> None:
+        # Prophet parameters of the validation and full fits (warm start for the next refit)
+        self.prophet_params: Dict[str, Optional[Dict]] = {}
+        self.prophet_fit_seconds: Dict[str, float] = {}
+        # Fit time per candidate (validation + full data), and what adaptive selection skipped
+        self.fit_seconds: Dict[str, float] = {}
+        self.skipped: Dict[str, str] = {}
+        self.training_seconds_saved = 0.0
+        self.history_sales: Optional[np.ndarray] = None  # training series (bootstrap errors)
+        self._validation_fits: Dict[str, Tuple[float, float]] = {}  # name -> (seconds, weeks) per fit
+
+    def cache_config(self) -> Dict:
+        """Configuration that determines the trained result (part of the model cache key)."""
+        config: Dict[str, Any] = {
+            "candidates": self.candidates,
+            "prophet": self.prophet.config,
+            "validation": (
+                {"mode": "backtest", **vars(self.backtest_config)}
+                if self.validation == "backtest"
+                else {"mode": "holdout", "metric": "mae", "min_weeks": 8, "fraction": 0.2}
+            ),
+        }
+        if "global_gbm" in self.candidates and self.panel_fingerprint is not None:
+            config["global_gbm_panel"] = self.panel_fingerprint
+        if self.selection == "adaptive":
+            config["selection"] = {
+                "mode": "adaptive", "min_weight": self.min_weight, "optimism": self.ADAPTIVE_OPTIMISM,
+            }
+        return config
+
+    def _factory(self, name: str) -> Callable:
+        """Zero-argument constructor of a candidate (global_gbm gets the cube panel)."""
+        if name == 'global_gbm':
+            return partial(GlobalBoostingWrapper, self.panel)
+        return self.CANDIDATE_MODELS[name]
+
+    def _model_configs(self) -> Dict[str, Dict]:
+        """Per-candidate configuration in the backtest fold cache keys."""
+        configs = {"prophet": self.prophet.config}
+        if self.panel_fingerprint is not None:
+            configs["global_gbm"] = {"panel": self.panel_fingerprint}
+        return configs
+
+    def train(
+        self,
+        historical_data: pd.DataFrame,
+        warm_start: Optional[Dict[str, Optional[Dict]]] = None,
+        prior: Optional[Dict] = None,
+    ) -> None:
         """
         Train models with validation-based weight calculation.
 
         Steps:
-        1. Split data (80% train, 20% validation)
-        2. Train candidates on train set
-        3. Evaluate on validation set
+        1. Split data (80% train, 20% validation), or backtest over rolling origins
+        2. Train candidates on train set(s)
+        3. Evaluate on validation set(s)
         4. Calculate optimal weights
         5. Retrain on full dataset
-        """
-        # Split for validation (minimum 8 weeks, max 20% of data)
-        val_size = max(8, len(historical_data) // 5)
-        train_data = historical_data.iloc[:-val_size]
-        val_data = historical_data.iloc[-val_size:]
 
-        logger.info(f"Validation split: {len(train_data)} train, {len(val_data)} validation")
-
-        # Candidate models
-        candidates = {
-            'prophet': ProphetWrapper(),
-            'exp_smooth': ExponentialSmoothingWrapper(),
-        }
+        With selection="adaptive", cheap candidates are validated first. An
+        expensive candidate is not validated when its estimated error (from the
+        previous fit, or from a cheap proxy on the first fit) cannot earn
+        min_weight, and is not retrained on the full data when its validation
+        weight stays under min_weight (its weight is then given to the other
+        candidates). The skipped fit time is reported in training_seconds_saved.
 
-        # Evaluate each model on validation set
-        errors = {}
-        for name, model in candidates.items():
-            try:
-                # Train on training set
-                temp_model = model.__class__()
-                temp_model.train(train_data)
-
-                # Forecast validation period
-                forecast = temp_model.forecast(len(val_data))
-                predictions = np.array(forecast['predictions'])
-                actual = val_data['quantity_sold'].values[:len(predictions)]
+        Args:
+            historical_data: Weekly sales with 'date' and 'quantity_sold' columns
+            warm_start: Optional prophet_params of a previous ensemble trained on a
+                        prefix of this history ({"validation": ..., "full": ...});
+                        seeds both Prophet fits
+            prior: Optional validation_errors and fit_seconds of that previous
+                   ensemble (adaptive selection estimates from them)
+        """
+        warm_start = warm_start or {}
+        self.history_sales = historical_data["quantity_sold"].to_numpy(dtype=float)
+        self.fit_seconds, self.skipped, self.training_seconds_saved = {}, {}, 0.0
+        self._validation_fits = {}
+        if self.validation == "backtest":
+            errors = self._backtest_errors(historical_data, warm_start, prior)
+        else:
+            errors = self._holdout_errors(historical_data, warm_start, prior)
 
-                # Calculate MAE
-                error = np.mean(np.abs(actual - predictions))
-                errors[name] = error
-                logger.info(f"  {name} validation MAE: {error:.1f}")
-
-            except Exception as e:
-                logger.warning(f"  {name} validation failed: {e}")
-                errors[name] = np.inf
+        self.validation_errors = {k: float(v) for k, v in errors.items()}
 
         # Calculate weights (inverse of errors)
         valid_errors = {k: v for k, v in errors.items() if v < np.inf}
@@ -673,16 +1370,36 @@ class EnsembleForecaster:
 
         logger.info(f"Calculated weights: {self.weights}")
 
+        # Expensive candidates that cannot earn meaningful weight are not retrained
+        if self.selection == "adaptive" and len(self.weights) > 1:
+            for name in self.EXPENSIVE_CANDIDATES:
+                if 0 < self.weights.get(name, 0) < self.min_weight:
+                    seconds, weeks = self._validation_fits.get(name, (0.0, 1.0))
+                    self._skip(name, "full fit", seconds * len(historical_data) / weeks)
+                    self.weights[name] = 0.0
+
         # Retrain on full dataset
         for name in self.weights.keys():
             if self.weights[name] > 0.01:  # Only train if weight > 1%
                 try:
+                    model: Any
                     if name == 'prophet':
-                        self.prophet.train(historical_data)
-                        self.models[name] = self.prophet
+                        model = self.prophet
                     elif name == 'exp_smooth':
-                        self.exp_smooth.train(historical_data)
-                        self.models[name] = self.exp_smooth
+                        model = self.exp_smooth
+                    else:
+                        model = self._factory(name)()
+                    start = time.perf_counter()
+                    if name == 'prophet':
+                        model.train(historical_data, init_params=warm_start.get("full"))
+                        self.prophet_params["full"] = model.warm_start_params()
+                        self.prophet_fit_seconds["full"] = model.fit_seconds
+                    else:
+                        model.train(historical_data)
+                    seconds = time.perf_counter() - start
+                    _record_fit_rate(name, seconds, len(historical_data))
+                    self.fit_seconds[name] = self.fit_seconds.get(name, 0.0) + seconds
+                    self.models[name] = model
 
                     logger.info(f"  {name} trained on full dataset (weight: {self.weights[name]:.2f})")
                 except Exception as e:
@@ -699,20 +1416,258 @@ class EnsembleForecaster:
         # Set model_used description
         active_models = [k for k, v in self.weights.items() if v > 0.01]
         self.model_used = f"validation_ensemble({'+'.join(active_models)})"
+        self.panel = None   # fitted models keep what they need; not pickled with the cache entry
 
-    def forecast(self, periods: int, start_date: Optional[date] = None) -> Dict:
+        if self.prophet_fit_seconds:
+            logger.info(
+                f"Prophet fit time: {sum(self.prophet_fit_seconds.values()):.2f}s "
+                f"({'warm' if warm_start else 'cold'} start)"
+            )
+        if self.skipped:
+            logger.info(
+                f"Adaptive selection skipped {self.skipped}, "
+                f"saving ~{self.training_seconds_saved:.2f}s"
+            )
+
+    def _race_order(self) -> Tuple[List[str], List[str]]:
+        """(cheap, expensive) candidates; expensive is empty unless selection is adaptive."""
+        expensive = [name for name in self.candidates if name in self.EXPENSIVE_CANDIDATES]
+        cheap = [name for name in self.candidates if name not in expensive]
+        if self.selection != "adaptive" or not cheap:
+            return list(self.candidates), []
+        return cheap, expensive
+
+    def _validation_windows(self, n_weeks: int) -> List[Tuple[int, int]]:
+        """(train weeks, validation weeks) of each validation fit on a history of n_weeks."""
+        if self.validation == "backtest":
+            origins = rolling_origins(n_weeks, self.backtest_config)
+            if origins:
+                return [(origin, self.backtest_config.horizon) for origin in origins]
+        val_size = max(8, n_weeks // 5)
+        return [(n_weeks - val_size, val_size)]
+
+    def _proxy_error(self, name: str, historical_data: pd.DataFrame) -> Optional[float]:
+        """
+        Validation MAE of a cheap stand-in for an expensive candidate, or None if it has none.
+
+        Prophet's stand-in is _trend_seasonality_proxy(), scored on the same
+        validation windows as the cheap candidates.
+        """
+        if name != 'prophet':
+            return None
+        multiplicative = self.prophet.config.get("seasonality_mode") == "multiplicative"
+        maes = []
+        try:
+            for train_weeks, horizon in self._validation_windows(len(historical_data)):
+                actual = historical_data["quantity_sold"].to_numpy(dtype=float)[train_weeks:train_weeks + horizon]
+                predictions = _trend_seasonality_proxy(
+                    historical_data.iloc[:train_weeks], len(actual), multiplicative
+                )
+                maes.append(float(np.mean(np.abs(actual - predictions))))
+        except Exception as e:
+            logger.warning(f"  {name} proxy failed: {e}")
+            return None
+        return float(np.mean(maes)) if maes else None
+
+    def _cannot_earn_weight(
+        self,
+        name: str,
+        errors: Dict[str, float],
+        prior: Optional[Dict],
+        historical_data: pd.DataFrame,
+    ) -> bool:
+        """
+        True if an expensive candidate would stay under min_weight on this history.
+
+        Its error is estimated from the previous fit of this series, scaled by
+        how the cheap candidates' best error has moved since; without a usable
+        previous fit, from its cheap proxy on the same validation windows
+        (_proxy_error()). The estimate is then given ADAPTIVE_OPTIMISM
+        headroom. Without either estimate it is raced.
+        """
+        estimate = self._prior_error_estimate(name, errors, prior)
+        source = "previous fit"
+        if estimate is None:
+            estimate, source = self._proxy_error(name, historical_data), "proxy"
+        if estimate is None or not np.isfinite(estimate):
+            return False
+        estimate *= self.ADAPTIVE_OPTIMISM
+
+        inv_estimate = 1.0 / (estimate + 1e-6)
+        inv_others = sum(1.0 / (v + 1e-6) for v in errors.values() if v < np.inf)
+        potential = inv_estimate / (inv_estimate + inv_others)
+        logger.info(
+            f"  {name} estimated validation MAE {estimate:.1f} from {source} "
+            f"(weight at most {potential:.2f})"
+        )
+        return potential < self.min_weight
+
+    @staticmethod
+    def _prior_error_estimate(name: str, errors: Dict[str, float], prior: Optional[Dict]) -> Optional[float]:
+        """Previous validation error of a candidate, rescaled to this history (None without one)."""
+        prior_errors = (prior or {}).get("validation_errors") or {}
+        if not prior_errors.get(name, np.inf) < np.inf:
+            return None
+        common = [k for k, v in errors.items() if v < np.inf and prior_errors.get(k, np.inf) < np.inf]
+        if not common:
+            return None
+        best_before = min(prior_errors[k] for k in common)
+        if best_before <= 0:
+            return None
+        return prior_errors[name] * min(errors[k] for k in common) / best_before
+
+    def _skipped_fit_seconds(self, name: str, n_weeks: int, prior: Optional[Dict]) -> float:
+        """
+        Estimated time of the validation and full fits skipped for a candidate.
+
+        The previous fit's time when there is one, else the last fit rate seen in this process.
+        """
+        prior_seconds = ((prior or {}).get("fit_seconds") or {}).get(name)
+        if prior_seconds:
+            return float(prior_seconds)
+        weeks = sum(train_weeks for train_weeks, _ in self._validation_windows(n_weeks)) + n_weeks
+        return _fit_seconds_per_week.get(name, 0.0) * weeks
+
+    def _skip(self, name: str, what: str, seconds: float) -> None:
+        self.skipped[name] = what
+        self.training_seconds_saved += seconds
+        logger.info(f"  {name} {what} skipped: cannot earn {self.min_weight:.0%} weight (~{seconds:.2f}s saved)")
+
+    def _holdout_errors(
+        self,
+        historical_data: pd.DataFrame,
+        warm_start: Dict,
+        prior: Optional[Dict] = None,
+    ) -> Dict[str, float]:
+        """Validation MAE of each candidate on a single 80/20 holdout."""
+        # Split for validation (minimum 8 weeks, max 20% of data)
+        val_size = max(8, len(historical_data) // 5)
+        train_data = historical_data.iloc[:-val_size]
+        val_data = historical_data.iloc[-val_size:]
+
+        logger.info(f"Validation split: {len(train_data)} train, {len(val_data)} validation")
+
+        # Evaluate each candidate model on validation set (cheap candidates first when racing)
+        cheap, expensive = self._race_order()
+        errors: Dict[str, float] = {}
+        for name in cheap + expensive:
+            if name in expensive and self._cannot_earn_weight(name, errors, prior, historical_data):
+                self._skip(name, "validation and full fit", self._skipped_fit_seconds(name, len(historical_data), prior))
+                errors[name] = np.inf
+                continue
+            try:
+                # Train on training set
+                temp_model = self._factory(name)()
+                start = time.perf_counter()
+                if name == 'prophet':
+                    temp_model.train(train_data, init_params=warm_start.get("validation"))
+                    self.prophet_params["validation"] = temp_model.warm_start_params()
+                    self.prophet_fit_seconds["validation"] = temp_model.fit_seconds
+                else:
+                    temp_model.train(train_data)
+                seconds = time.perf_counter() - start
+                _record_fit_rate(name, seconds, len(train_data))
+                self.fit_seconds[name] = seconds
+                self._validation_fits[name] = (seconds, len(train_data))
+
+                # Forecast validation period
+                forecast = temp_model.forecast(len(val_data))
+                predictions = np.array(forecast['predictions'])
+                actual = val_data['quantity_sold'].values[:len(predictions)]
+
+                # Calculate MAE
+                error = np.mean(np.abs(actual - predictions))
+                errors[name] = error
+                logger.info(f"  {name} validation MAE: {error:.1f}")
+
+            except Exception as e:
+                logger.warning(f"  {name} validation failed: {e}")
+                errors[name] = np.inf
+
+        return {name: errors[name] for name in self.candidates}
+
+    def _backtest_errors(
+        self,
+        historical_data: pd.DataFrame,
+        warm_start: Dict,
+        prior: Optional[Dict] = None,
+    ) -> Dict[str, float]:
+        """
+        Mean MAE of each candidate over parallel rolling-origin folds (cheap candidates first when racing).
+
+        Prophet's fold fits are seeded from the previous full-data fit when warm-starting.
+        """
+        cheap, expensive = self._race_order()
+        prophet_init = warm_start.get("full") or warm_start.get("validation")
+        init_params = {"prophet": prophet_init} if prophet_init else None
+        self.backtest = run_backtest(
+            historical_data,
+            {name: self._factory(name) for name in cheap},
+            self.backtest_config,
+            model_configs=self._model_configs(),
+            init_params=init_params,
+        )
+        if not self.backtest.folds:
+            logger.info("History too short for backtesting, using holdout validation")
+            return self._holdout_errors(historical_data, warm_start, prior)
+
+        errors = self.backtest.mae
+        for name in expensive:
+            if self._cannot_earn_weight(name, errors, prior, historical_data):
+                self._skip(name, "validation and full fit", self._skipped_fit_seconds(name, len(historical_data), prior))
+                errors[name] = np.inf
+                continue
+            raced = run_backtest(
+                historical_data,
+                {name: self._factory(name)},
+                self.backtest_config,
+                model_configs=self._model_configs(),
+                init_params=init_params,
+            )
+            self.backtest.folds.extend(raced.folds)
+            self.backtest.cached_folds += raced.cached_folds
+            errors[name] = raced.mae.get(name, np.inf)
+
+        mape = self.backtest.mape
+        for name, error in errors.items():
+            if name in mape:
+                logger.info(f"  {name} backtest MAE: {error:.1f}, MAPE: {mape[name]:.1%}")
+        for name in self.candidates:
+            folds = [f for f in self.backtest.folds if f.model == name]
+            if folds:
+                self.fit_seconds[name] = sum(f.fit_seconds for f in folds)
+                _record_fit_rate(name, self.fit_seconds[name], sum(f.train_weeks for f in folds))
+                self._validation_fits[name] = (
+                    float(np.mean([f.fit_seconds for f in folds])),
+                    float(np.mean([f.train_weeks for f in folds])),
+                )
+        return {name: errors[name] for name in self.candidates}
+
+    def forecast(
+        self,
+        periods: int,
+        start_date: Optional[date] = None,
+        quantiles: Optional[Sequence[float]] = None,
+    ) -> Dict:
         """
         Generate weighted ensemble forecast.
 
         Args:
             periods: Number of weeks to forecast
             start_date: Optional start date for calendar-aligned forecasting (passed to Prophet)
+            quantiles: Optional probabilistic mode (e.g. [0.1, 0.5, 0.9]): adds
+                       bootstrapped weekly and season-total demand quantiles
+                       (forecast_distribution()) and takes lower/upper bounds
+                       from its 5th/95th percentiles instead of the weighted
+                       blend of component bounds, when that band contains the
+                       point forecast in every week
         """
         predictions = np.zeros(periods)
         lower_bounds = np.zeros(periods)
         upper_bounds = np.zeros(periods)
         confidences = []
         seasonality_data = None  # Capture from Prophet for explainability
+        seasonality_summary = None
 
         for name, model in self.models.items():
             weight = self.weights.get(name, 0)
@@ -732,14 +1687,16 @@ class EnsembleForecaster:
                     # Capture seasonality data from Prophet for explainability
                     if name == 'prophet' and 'seasonality' in forecast:
                         seasonality_data = forecast['seasonality']
+                        seasonality_summary = forecast['seasonality_summary']
 
-                    # Get confidence if available
-                    if name == 'prophet' and model.forecast_df is not None:
-                        conf = model.get_confidence(model.forecast_df)
-                        confidences.append(weight * conf)
-                    elif name == 'exp_smooth' and model.forecast_result is not None:
-                        conf = model.get_confidence(model.forecast_result)
-                        confidences.append(weight * conf)
+                    # Confidence from this call's own result: cached ensembles are
+                    # shared across threads, so the wrapper's last forecast_result
+                    # may already belong to another caller
+                    if name == 'prophet':
+                        conf = forecast['confidence']
+                    else:
+                        conf = model.get_confidence(forecast)
+                    confidences.append(weight * conf)
 
                 except Exception as e:
                     logger.warning(f"{name} forecast failed: {e}")
@@ -766,9 +1723,62 @@ class EnsembleForecaster:
         # Include seasonality data if available (for agent explanation)
         if seasonality_data:
             result["seasonality"] = seasonality_data
+            result["seasonality_summary"] = seasonality_summary
+
+        if quantiles:
+            distribution = self.forecast_distribution(periods, point=predictions)
+            bounds = np.round(distribution.quantiles((0.05, 0.95))[:, 0, :]).astype(int)
+            # Only a band that contains the point forecast replaces the blended bounds
+            if np.all((bounds[0] <= predictions) & (predictions <= bounds[1])):
+                result["lower_bound"], result["upper_bound"] = bounds[0].tolist(), bounds[1].tolist()
+            else:
+                logger.warning("Bootstrapped p5-p95 band misses the point forecast; keeping blended bounds")
+            result["quantiles"] = distribution.summary(0, quantiles)
 
         return result
 
+    def forecast_distribution(
+        self,
+        periods: int,
+        start_date: Optional[date] = None,
+        n_samples: int = DEFAULT_SAMPLES,
+        point: Optional[Union[Sequence[float], np.ndarray]] = None,
+    ) -> DemandDistribution:
+        """
+        Bootstrapped demand distribution around the ensemble forecast.
+
+        Seasonal-naive error paths of the training history are resampled in
+        blocks (utils/probabilistic_forecast.py) and scaled to the ensemble's
+        expected error: the weight-averaged validation MAE of its models,
+        relative to the last year's mean weekly sales.
+
+        Args:
+            periods: Number of weeks to forecast
+            start_date: Optional start date for calendar-aligned forecasting
+            n_samples: Bootstrapped paths
+            point: Point forecast to perturb (default: forecast(periods, start_date))
+
+        Returns:
+            DemandDistribution of one series
+        """
+        if self.history_sales is None:
+            raise RuntimeError("Ensemble not trained. Call train() first.")
+        if point is None:
+            point = self.forecast(periods, start_date)["predictions"]
+
+        errors, counts = seasonal_error_matrix(self.history_sales[None, :])
+        expected_mae = sum(
+            weight * self.validation_errors[name]
+            for name, weight in self.weights.items()
+            if weight > 0 and np.isfinite(self.validation_errors.get(name, np.inf))
+        )
+        level = float(np.mean(self.history_sales[-SEASON_LENGTH:]))
+        scale = (
+            calibration_scale(errors, counts, np.array([expected_mae / level]))
+            if expected_mae > 0 and level > 0 else 1.0
+        )
+        return bootstrap_forecast(np.asarray(point, dtype=float), errors, counts, n_samples=n_samples, scale=scale)
+
 
 # ============================================================================
 # SECTION 7: Data validation helpers
@@ -834,58 +1844,357 @@ def aggregate_to_weekly(data: pd.DataFrame) -> pd.DataFrame:
     return weekly
 
 
-# ============================================================================
-# SECTION 8: AGENT TOOL - run_demand_forecast
-# ============================================================================
-
-@function_tool
-def run_demand_forecast(
-    ctx: RunContextWrapper[ForecastingContext],
-    category: Annotated[str, "Product category name (e.g., 'Women's Dresses')"],
-    forecast_horizon_weeks: Annotated[int, "Number of weeks to forecast (1-52, recommended 12)"],
-) -> ForecastToolResult:
+def get_trained_ensemble(
+    historical_data: pd.DataFrame,
+    category: str,
+    season_start_date: Optional[date] = None,
+    panel: Optional[SeriesPanel] = None,
+) -> EnsembleForecaster:
     """
-    Generate demand forecasts using validation-based ensemble model.
-
-    Automatically fetches historical sales data from the context and generates
-    weekly demand predictions with confidence scores and safety stock recommendations.
+    Return a trained ensemble, reusing the model cache when possible.
 
-    The tool uses an enhanced validation-based ensemble that:
-    - Tests Prophet (seasonality) and Exponential Smoothing (trend) on validation data
-    - Automatically calculates optimal weights based on which performs better
-    - Adapts to each category's unique characteristics
-    - Achieves 19% better MAPE vs fixed-weight approaches
+    The fitted models, validation weights and validation errors are cached
+    under (category, history fingerprint, model config, horizon alignment),
+    so repeated forecasts on unchanged history skip training entirely. When
+    the history has only been extended since the last fit, Prophet is
+    warm-started from that fit's parameters.
 
     Args:
-        ctx: Run context with data_loader for fetching historical data
-        category: Product category to forecast
-        forecast_horizon_weeks: Number of weeks ahead to forecast
+        historical_data: Weekly sales with 'date' and 'quantity_sold' columns
+        category: Product category (part of the cache key)
+        season_start_date: Calendar alignment of the forecast (part of the cache key)
+        panel: Cube panel for the global_gbm candidate (see cube_panel(); its
+               fingerprint is part of the cache key)
 
     Returns:
-        ForecastToolResult with predictions, confidence, and safety stock recommendation
+        Trained EnsembleForecaster
     """
-    logger.info(
-        f"run_demand_forecast called: category={category}, horizon={forecast_horizon_weeks}"
+    return _trained_ensemble(historical_data, category, season_start_date, panel)[0]
+
+
+def _trained_ensemble(
+    historical_data: pd.DataFrame,
+    category: str,
+    season_start_date: Optional[date] = None,
+    panel: Optional[SeriesPanel] = None,
+) -> Tuple[EnsembleForecaster, bool]:
+    """get_trained_ensemble(), plus whether this call trained it (False = model cache hit)."""
+    ensemble, key = _configured_ensemble(historical_data, category, season_start_date, panel)
+    cache = get_model_cache()
+
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info(f"Reusing cached ensemble for {category} (weights: {cached.weights})")
+        return cached, False
+
+    # Warm-start Prophet from the last fit of this category when the history has
+    # only been extended (e.g. a new week of in-season actuals)
+    lineage_cache = get_lineage_cache()
+    lineage_key = model_cache_key(category, "lineage", ensemble.cache_config(), season_start_date)
+    lineage = lineage_cache.get(lineage_key)
+    warm_start = prior = None
+    if lineage is not None and _extends_history(historical_data, lineage):
+        warm_start = lineage["prophet_params"]
+        prior = lineage
+        logger.info(
+            f"Warm-starting {category} from a fit on {lineage['n_weeks']} weeks "
+            f"(now {len(historical_data)})"
+        )
+
+    ensemble.train(historical_data, warm_start=warm_start, prior=prior)
+    cache.put(key, ensemble)
+    lineage_cache.put(lineage_key, {
+        "n_weeks": len(historical_data),
+        "prefix_fingerprint": history_fingerprint(historical_data.iloc[:-1]),
+        "prophet_params": ensemble.prophet_params,
+        "validation_errors": ensemble.validation_errors,
+        "fit_seconds": ensemble.fit_seconds,
+    })
+    return ensemble, True
+
+
+def _seconds_saved(ensemble: EnsembleForecaster, trained: bool) -> float:
+    """Training time adaptive selection saved this call (none on a cache hit: nothing was trained)."""
+    return ensemble.training_seconds_saved if trained else 0.0
+
+
+def _configured_ensemble(
+    historical_data: pd.DataFrame,
+    category: str,
+    season_start_date: Optional[date] = None,
+    panel: Optional[SeriesPanel] = None,
+) -> Tuple[EnsembleForecaster, str]:
+    """Untrained ensemble configured from settings, and its model cache key."""
+    ensemble = EnsembleForecaster(
+        candidates=[name.strip() for name in settings.ensemble_candidates.split(",") if name.strip()],
+        validation=settings.ensemble_validation,
+        backtest_config=BacktestConfig(
+            n_folds=settings.backtest_folds, horizon=settings.backtest_horizon
+        ),
+        selection=settings.ensemble_selection,
+        min_weight=settings.ensemble_min_weight,
+        panel=panel,
+    )
+    key = model_cache_key(
+        category,
+        history_fingerprint(historical_data),
+        ensemble.cache_config(),
+        season_start_date,
     )
+    return ensemble, key
 
-    try:
-        # Access data_loader from context
-        data_loader = ctx.context.data_loader
 
-        if data_loader is None:
-            return ForecastToolResult(
-                total_demand=0,
-                forecast_by_week=[],
-                safety_stock_pct=0.50,
-                confidence=0.0,
-                model_used="none",
-                error="No data_loader in context",
-            )
+def forecast_model_key(
+    historical_data: pd.DataFrame,
+    category: str,
+    season_start_date: Optional[date] = None,
+    panel: Optional[SeriesPanel] = None,
+) -> str:
+    """Model cache key of a forecast (fingerprints history, ensemble config and alignment)."""
+    return _configured_ensemble(historical_data, category, season_start_date, panel)[1]
+
+
+def configured_quantiles() -> Tuple[float, ...]:
+    """Demand quantiles from FORECAST_QUANTILES (empty = none)."""
+    return tuple(float(q) for q in settings.forecast_quantiles.split(",") if q.strip())
+
+
+def data_quality(confidence: float) -> str:
+    """ForecastToolResult.data_quality for a confidence score ('excellent', 'good' or 'poor')."""
+    return "excellent" if confidence >= 0.7 else "good" if confidence >= 0.5 else "poor"
+
+
+def _extends_history(historical_data: pd.DataFrame, lineage: Dict) -> bool:
+    """
+    True if historical_data extends the history of a previous fit.
+
+    The previous history's last week is excluded from the comparison: it may
+    have been a partial week that new actuals have since completed.
+    """
+    n_prefix = lineage["n_weeks"] - 1
+    if n_prefix < 1 or len(historical_data) < lineage["n_weeks"]:
+        return False
+    return history_fingerprint(historical_data.iloc[:n_prefix]) == lineage["prefix_fingerprint"]
+
+
+# Fast models raced against the ensemble under a latency budget (cheapest first)
+FAST_MODELS = {
+    'seasonal_naive': SeasonalNaiveWrapper,
+    'seasonal_index': SeasonalIndexWrapper,
+    'holt_winters_np': VectorizedHoltWintersWrapper,
+}
+
+# Ensembles still training after their request was served (cache key -> future)
+_background_pool: Optional[ThreadPoolExecutor] = None
+_background_jobs: Dict[str, Future] = {}
+_background_lock = threading.Lock()
+
+
+def _train_in_background(
+    key: str,
+    historical_data: pd.DataFrame,
+    category: str,
+    season_start_date: Optional[date],
+    panel: Optional[SeriesPanel] = None,
+) -> Future:
+    """
+    Train (and cache) the full ensemble on a background thread, once per cache key.
+
+    The future resolves to _trained_ensemble()'s (ensemble, trained) pair.
+    """
+    global _background_pool
+    with _background_lock:
+        if key in _background_jobs:
+            return _background_jobs[key]
+        if _background_pool is None:
+            _background_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ensemble-refresh")
+        future = _background_pool.submit(_trained_ensemble, historical_data, category, season_start_date, panel)
+        _background_jobs[key] = future
+
+    def _done(f: Future) -> None:
+        with _background_lock:
+            _background_jobs.pop(key, None)
+        if f.exception() is not None:
+            logger.warning(f"Background ensemble training failed for {category}: {f.exception()}")
+
+    future.add_done_callback(_done)
+    return future
+
+
+def _fit_fast_model(
+    name: str,
+    df: pd.DataFrame,
+    forecast_horizon_weeks: int,
+    offset: int,
+) -> Tuple[float, Dict]:
+    """
+    Holdout MAE of one fast model, and its forecast after refitting on the full history.
+
+    Returns:
+        (holdout MAE, forecast dict with confidence and model_used "fallback:<name>")
+    """
+    factory = FAST_MODELS[name]
+    val_size = max(8, len(df) // 5)
+    train_data, actual = df.iloc[:-val_size], df["quantity_sold"].values[-val_size:]
+
+    model = factory()
+    model.train(train_data)
+    error = float(np.mean(np.abs(actual - np.array(model.forecast(val_size)["predictions"]))))
+
+    model = factory()
+    model.train(df)
+    forecast = model.forecast(offset + forecast_horizon_weeks)
+    forecast = {k: v[offset:] for k, v in forecast.items()}
+    return error, {
+        **forecast,
+        "confidence": model.get_confidence(forecast),
+        "model_used": f"fallback:{name}",
+    }
+
+
+_fast_pool: Optional[ThreadPoolExecutor] = None
+
+
+def _start_fast_models(
+    df: pd.DataFrame,
+    forecast_horizon_weeks: int,
+    offset: int,
+) -> Dict[str, Future]:
+    """Fit every fast model concurrently (name -> future of _fit_fast_model())."""
+    global _fast_pool
+    with _background_lock:
+        if _fast_pool is None:
+            _fast_pool = ThreadPoolExecutor(max_workers=len(FAST_MODELS), thread_name_prefix="fast-forecast")
+    return {
+        name: _fast_pool.submit(_fit_fast_model, name, df, forecast_horizon_weeks, offset)
+        for name in FAST_MODELS
+    }
+
+
+def _best_fast_forecast(fast: Dict[str, Future]) -> Optional[Dict]:
+    """Lowest-holdout-MAE forecast among the fast models that have finished (None if none has)."""
+    best_error, best = np.inf, None
+    for name, future in fast.items():
+        if not future.done():
+            continue
+        if future.exception() is not None:
+            logger.warning(f"  fast model {name} failed: {future.exception()}")
+            continue
+        error, forecast = future.result()
+        if best is None or error < best_error:
+            best_error, best = error, forecast
+    if best is not None:
+        logger.info(f"  fast model {best['model_used']} (holdout MAE {best_error:.1f})")
+    return best
+
+
+def _budgeted_forecast(
+    df: pd.DataFrame,
+    category: str,
+    forecast_horizon_weeks: int,
+    season_start_date: Optional[date],
+    latency_budget_ms: int,
+    quantiles: Optional[Sequence[float]] = None,
+    panel: Optional[SeriesPanel] = None,
+) -> Dict:
+    """
+    Forecast within a latency budget by racing fast models against the ensemble.
 
-        # Fetch historical sales data
-        historical_data = data_loader.get_historical_sales(category)
+    A cached ensemble is served at once ("cache:"). Otherwise the ensemble
+    (on a background thread) and every fast model start together. The
+    ensemble is served as soon as it finishes within the budget
+    ("ensemble:"); when the budget runs out first, the finished fast model
+    with the lowest holdout MAE is served ("fallback:") and the ensemble
+    keeps training to refresh the cache for the next request. If no fast
+    model has finished by then, the first one to finish is served.
 
-        if not historical_data or len(historical_data.get("date", [])) == 0:
+    Returns:
+        Forecast dict as returned by EnsembleForecaster.forecast, with the
+        serving path prefixed to model_used (no quantiles on the fallback path)
+    """
+    deadline = time.perf_counter() + latency_budget_ms / 1000
+    _, key = _configured_ensemble(df, category, season_start_date, panel)
+
+    cached = get_model_cache().get(key)
+    if cached is not None:
+        result = cached.forecast(forecast_horizon_weeks, start_date=season_start_date, quantiles=quantiles)
+        return {**result, "model_used": f"cache:{result['model_used']}"}
+
+    training = _train_in_background(key, df, category, season_start_date, panel)
+    offset = season_start_offset(pd.Timestamp(df["date"].iloc[-1]).date(), season_start_date)
+    fast = _start_fast_models(df, forecast_horizon_weeks, offset)
+
+    # Wake on every completion until the ensemble is done or the budget runs out
+    pending = {training, *fast.values()}
+    while training in pending:
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+
+    if training.done():
+        try:
+            ensemble, trained = training.result()
+            result = ensemble.forecast(forecast_horizon_weeks, start_date=season_start_date, quantiles=quantiles)
+            return {
+                **result,
+                "model_used": f"ensemble:{result['model_used']}",
+                "training_seconds_saved": _seconds_saved(ensemble, trained),
+            }
+        except Exception as e:
+            logger.warning(f"Ensemble failed for {category}, serving a fast model: {e}")
+    else:
+        logger.info(
+            f"Ensemble for {category} missed the {latency_budget_ms}ms budget, "
+            f"serving a fast model (ensemble still training in background)"
+        )
+
+    fallback = _best_fast_forecast(fast)
+    while fallback is None and any(not f.done() for f in fast.values()):
+        wait([f for f in fast.values() if not f.done()], return_when=FIRST_COMPLETED)
+        fallback = _best_fast_forecast(fast)
+    if fallback is None:
+        raise ForecastingError("All fast models failed")
+    return fallback
+
+
+def forecast_weekly_sales(
+    df: pd.DataFrame,
+    category: str,
+    forecast_horizon_weeks: int,
+    season_start_date: Optional[date] = None,
+    latency_budget_ms: Optional[int] = None,
+    use_precomputed: bool = True,
+    quantiles: Optional[Sequence[float]] = None,
+    panel: Optional[SeriesPanel] = None,
+) -> ForecastToolResult:
+    """
+    Forecast one weekly sales series with the validation-based ensemble.
+
+    Shared by run_demand_forecast and the batch forecaster. Never raises:
+    failures are reported in ForecastToolResult.error.
+
+    Args:
+        df: Weekly sales with 'date' and 'quantity_sold' columns
+        category: Product category (for logging and the model cache key)
+        forecast_horizon_weeks: Number of weeks ahead to forecast
+        season_start_date: Optional start date for calendar-aligned forecasting
+        latency_budget_ms: Optional time budget. When set, fast models run alongside
+                           the ensemble and model_used is prefixed with
+                           the path that served the request ("cache:",
+                           "ensemble:" or "fallback:")
+        use_precomputed: Serve a fresh entry of the precomputed forecast store
+                         when one exists (model_used prefixed "precomputed:")
+        quantiles: Demand quantiles to bootstrap (default: FORECAST_QUANTILES;
+                   empty = point forecast and bounds only)
+        panel: Cube panel the global_gbm candidate trains on (see cube_panel();
+               without it global_gbm fits the series alone)
+
+    Returns:
+        ForecastToolResult with predictions, confidence, and safety stock recommendation
+    """
+    try:
+        if len(df) == 0:
             return ForecastToolResult(
                 total_demand=0,
                 forecast_by_week=[],
@@ -895,28 +2204,35 @@ def run_demand_forecast(
                 error=f"No historical sales data found for category: {category}",
             )
 
-        # Convert to DataFrame
-        df = pd.DataFrame(historical_data)
-
-        # Clean daily data first
-        df = clean_historical_sales(df)
-
-        # Aggregate daily data to weekly for proper forecasting
-        # This ensures forecast values match actual weekly sales totals
-        df = aggregate_to_weekly(df)
-
         # Validate (now checking for 26 weeks minimum)
         validate_historical_data(df, min_weeks=26)
 
-        # Train ensemble
-        ensemble = EnsembleForecaster()
-        ensemble.train(df)
-
-        # Get season_start_date from context for calendar-aligned forecasting
-        season_start_date = ctx.context.season_start_date
+        if quantiles is None:
+            quantiles = configured_quantiles()
+
+        # Serve the offline precomputed forecast while it matches this history and config
+        store = get_forecast_store() if use_precomputed else None
+        if store is not None:
+            model_key = forecast_model_key(df, category, season_start_date, panel)
+            payload = store.get(category, season_start_date, forecast_horizon_weeks, model_key)
+            labels = {quantile_label(q) for q in quantiles}
+            if payload is not None and labels <= set(payload.get("demand_quantiles") or {}):
+                logger.info(f"Serving precomputed forecast for {category}")
+                return ForecastToolResult(**{**payload, "model_used": f"precomputed:{payload['model_used']}"})
+
+        if latency_budget_ms:
+            forecast_result = _budgeted_forecast(
+                df, category, forecast_horizon_weeks, season_start_date, latency_budget_ms, quantiles, panel
+            )
+        else:
+            # Train ensemble (or reuse the cached one for unchanged history)
+            ensemble, trained = _trained_ensemble(df, category, season_start_date, panel)
 
-        # Generate forecast (with calendar-aligned seasonality if start_date provided)
-        forecast_result = ensemble.forecast(forecast_horizon_weeks, start_date=season_start_date)
+            # Generate forecast (with calendar-aligned seasonality if start_date provided)
+            forecast_result = ensemble.forecast(
+                forecast_horizon_weeks, start_date=season_start_date, quantiles=quantiles
+            )
+            forecast_result["training_seconds_saved"] = _seconds_saved(ensemble, trained)
 
         # Calculate totals
         total_demand = sum(forecast_result["predictions"])
@@ -929,12 +2245,13 @@ def run_demand_forecast(
         # We keep a default value here for schema compatibility
         safety_stock_pct = 0.20  # Default, actual value comes from user params
 
-        # Assess data quality
-        data_quality = "excellent" if confidence >= 0.7 else "good" if confidence >= 0.5 else "poor"
 
-        # Extract seasonality insight if available
+        # Extract seasonality insight if available (per-week detail only when configured)
         seasonality_insight = None
-        if "seasonality" in forecast_result:
+        seasonality_summary = None
+        if "seasonality_summary" in forecast_result:
+            seasonality_summary = SeasonalitySummary(**forecast_result["seasonality_summary"])
+        if "seasonality" in forecast_result and settings.forecast_seasonality_detail == "full":
             raw_seasonality = forecast_result["seasonality"]
             seasonality_insight = SeasonalityInsight(
                 yearly_effect=raw_seasonality.get("yearly_effect", []),
@@ -955,19 +2272,19 @@ def run_demand_forecast(
             lower_bound=forecast_result.get("lower_bound", []),
             upper_bound=forecast_result.get("upper_bound", []),
             weekly_average=weekly_average,
-            data_quality=data_quality,
+            data_quality=data_quality(confidence),
             seasonality=seasonality_insight,
+            seasonality_summary=seasonality_summary,
+            training_seconds_saved=round(forecast_result.get("training_seconds_saved", 0.0), 2),
+            demand_quantiles=forecast_result.get("quantiles", {}).get("weekly", {}),
+            season_demand_quantiles=forecast_result.get("quantiles", {}).get("season_total", {}),
         )
 
         logger.info(
             f"Forecast complete: total={total_demand}, confidence={confidence:.2f}"
         )
-        if seasonality_insight:
-            logger.info(
-                f"Seasonality: months={seasonality_insight.months_covered}, "
-                f"range={seasonality_insight.seasonal_range_pct}%, "
-                f"peak=week {seasonality_insight.peak_week}"
-            )
+        if seasonality_summary:
+            logger.info(f"Seasonality: {seasonality_summary.description}")
 
         return result
 
@@ -991,6 +2308,79 @@ def run_demand_forecast(
             error=f"Forecasting failed: {str(e)}",
         )
 
+    except Exception as e:
+        logger.error(f"Unexpected error forecasting {category}: {e}")
+        return ForecastToolResult(
+            total_demand=0,
+            forecast_by_week=[],
+            safety_stock_pct=0.50,
+            confidence=0.0,
+            model_used="none",
+            error=f"Unexpected error: {str(e)}",
+        )
+
+
+# ============================================================================
+# SECTION 8: AGENT TOOL - run_demand_forecast
+# ============================================================================
+
+@function_tool
+def run_demand_forecast(
+    ctx: RunContextWrapper[ForecastingContext],
+    category: Annotated[str, "Product category name (e.g., 'Women's Dresses')"],
+    forecast_horizon_weeks: Annotated[int, "Number of weeks to forecast (1-52, recommended 12)"],
+    latency_budget_ms: Annotated[
+        Optional[int],
+        "Optional time budget in ms; over budget the best fast model is returned (0 = no budget)",
+    ] = None,
+) -> ForecastToolResult:
+    """
+    Generate demand forecasts using validation-based ensemble model.
+
+    Automatically fetches historical sales data from the context and generates
+    weekly demand predictions with confidence scores and safety stock recommendations.
+
+    The tool uses an enhanced validation-based ensemble that:
+    - Tests Prophet (seasonality) and Exponential Smoothing (trend) on validation data
+    - Automatically calculates optimal weights based on which performs better
+    - Adapts to each category's unique characteristics
+    - Achieves 19% better MAPE vs fixed-weight approaches
+
+    Args:
+        ctx: Run context with data_loader for fetching historical data
+        category: Product category to forecast
+        forecast_horizon_weeks: Number of weeks ahead to forecast
+        latency_budget_ms: Time budget for this call (default: FORECAST_LATENCY_BUDGET_MS;
+                           0 = no budget). model_used records the path that served it.
+
+    Returns:
+        ForecastToolResult with predictions, confidence, and safety stock recommendation
+    """
+    logger.info(
+        f"run_demand_forecast called: category={category}, horizon={forecast_horizon_weeks}"
+    )
+    if latency_budget_ms is None:
+        latency_budget_ms = settings.forecast_latency_budget_ms
+
+    try:
+        # Access data_loader from context
+        data_loader = ctx.context.data_loader
+
+        if data_loader is None:
+            return ForecastToolResult(
+                total_demand=0,
+                forecast_by_week=[],
+                safety_stock_pct=0.50,
+                confidence=0.0,
+                model_used="none",
+                error="No data_loader in context",
+            )
+
+        # Fetch weekly sales straight from the pre-aggregated weekly cube
+        # (same totals as clean_historical_sales + aggregate_to_weekly on daily rows)
+        df = data_loader.get_weekly_sales(category)
+        panel = cube_panel(data_loader)
+
     except Exception as e:
         logger.error(f"Unexpected error in run_demand_forecast: {e}")
         return ForecastToolResult(
@@ -1001,3 +2391,13 @@ def run_demand_forecast(
             model_used="none",
             error=f"Unexpected error: {str(e)}",
         )
+
+    # Get season_start_date from context for calendar-aligned forecasting
+    return forecast_weekly_sales(
+        df,
+        category,
+        forecast_horizon_weeks,
+        ctx.context.season_start_date,
+        latency_budget_ms=latency_budget_ms or None,
+        panel=panel,
+    )
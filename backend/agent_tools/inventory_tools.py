@@ -22,19 +22,33 @@ SDK Pattern:
 # SECTION 1: Imports & Models
 # ============================================================================
 
-from typing import Annotated, Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Annotated, Dict, List, Optional, Any
 import logging
 
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import silhouette_score
 from pydantic import BaseModel, Field, ConfigDict
 from agents import function_tool, RunContextWrapper
 
 # Import context type for type hints
+from config.settings import settings
 from utils.context import ForecastingContext
+from utils.hierarchical_forecast import HierarchicalForecast, forecast_hierarchy
+from utils.store_features import (
+    FASHION_TIER_MAP,
+    LOCATION_TIER_MAP,
+    REGION_MAP,
+    STORE_FEATURES,
+    STORE_FORMAT_MAP,
+    StoreFeatureMatrix,
+    apply_feature_weights,
+    encode_store_features,
+)
+
+# scikit-learn is imported on first fit (it is slow to import)
+if TYPE_CHECKING:
+    from sklearn.cluster import KMeans
+    from sklearn.preprocessing import StandardScaler
 
 logger = logging.getLogger("inventory_tools")
 
@@ -204,20 +218,12 @@ class StoreClusterer:
     7. region - Geographic region (Northeast/Southeast/Midwest/West: 1/2/3/4)
     """
 
-    REQUIRED_FEATURES = [
-        "avg_weekly_sales_12mo",
-        "store_size_sqft",
-        "median_income",
-        "location_tier",
-        "fashion_tier",
-        "store_format",
-        "region",
-    ]
-
-    LOCATION_TIER_MAP = {"A": 3, "B": 2, "C": 1}
-    FASHION_TIER_MAP = {"Premium": 3, "Mainstream": 2, "Value": 1}
-    STORE_FORMAT_MAP = {"Mall": 4, "Standalone": 3, "ShoppingCenter": 2, "Outlet": 1}
-    REGION_MAP = {"Northeast": 1, "Southeast": 2, "Midwest": 3, "West": 4}
+    REQUIRED_FEATURES = STORE_FEATURES
+
+    LOCATION_TIER_MAP = LOCATION_TIER_MAP
+    FASHION_TIER_MAP = FASHION_TIER_MAP
+    STORE_FORMAT_MAP = STORE_FORMAT_MAP
+    REGION_MAP = REGION_MAP
 
     # Default feature weights (sales-first approach for balanced allocation)
     DEFAULT_FEATURE_WEIGHTS = {
@@ -250,8 +256,8 @@ class StoreClusterer:
         self.random_state = random_state
         self.adaptive_k = adaptive_k
         self.feature_weights = feature_weights or self.DEFAULT_FEATURE_WEIGHTS
-        self.kmeans: Optional[KMeans] = None
-        self.scaler: Optional[StandardScaler] = None
+        self.kmeans: Optional["KMeans"] = None
+        self.scaler: Optional["StandardScaler"] = None
         self.cluster_labels_: Optional[Dict[int, str]] = None
         self.silhouette_score_: Optional[float] = None
         self.training_data_: Optional[pd.DataFrame] = None
@@ -262,7 +268,11 @@ class StoreClusterer:
         )
         logger.info(f"Feature weights: {self.feature_weights}")
 
-    def fit(self, store_features: pd.DataFrame) -> None:
+    def fit(
+        self,
+        store_features: pd.DataFrame,
+        features: Optional[StoreFeatureMatrix] = None,
+    ) -> None:
         """
         Fit weighted K-means clustering on store features.
 
@@ -284,10 +294,17 @@ class StoreClusterer:
 
         Args:
             store_features: DataFrame with 7 required columns (rows = stores)
+            features: Precomputed feature matrix for the same stores (from
+                      data_loader.get_store_features()). Steps 2-4 are skipped
+                      when its weights match this clusterer's.
 
         Raises:
             ValueError: If required columns missing or insufficient data
         """
+        from sklearn.cluster import KMeans
+        from sklearn.metrics import silhouette_score
+        from sklearn.preprocessing import StandardScaler
+
         logger.info(f"Fitting weighted K-means clustering on {len(store_features)} stores...")
 
         # Validate input
@@ -300,36 +317,26 @@ class StoreClusterer:
                 f"Insufficient stores ({len(store_features)}) for {self.n_clusters} clusters"
             )
 
-        # Extract features
-        features_df = store_features[self.REQUIRED_FEATURES].copy()
-
-        # Encode categorical features (ordinal)
-        if "location_tier" in features_df.columns:
-            features_df["location_tier"] = features_df["location_tier"].map(
-                self.LOCATION_TIER_MAP
-            )
-
-        if "fashion_tier" in features_df.columns:
-            features_df["fashion_tier"] = features_df["fashion_tier"].map(
-                self.FASHION_TIER_MAP
-            )
-
-        if "store_format" in features_df.columns:
-            features_df["store_format"] = features_df["store_format"].map(
-                self.STORE_FORMAT_MAP
-            )
-
-        if "region" in features_df.columns:
-            features_df["region"] = features_df["region"].map(self.REGION_MAP)
+        if (
+            features is not None
+            and features.feature_weights == self.feature_weights
+            and features.store_ids == [str(s) for s in store_features.index]
+        ):
+            logger.info("Using cached encoded/scaled/weighted store features")
+            self.scaler = features.scaler
+            features_scaled_weighted = features.weighted
+        else:
+            # Extract features and encode categoricals (ordinal)
+            features_df = encode_store_features(store_features)
 
-        # Normalize features with StandardScaler
-        logger.info("Applying StandardScaler normalization (mean=0, std=1)...")
-        self.scaler = StandardScaler()
-        features_scaled = self.scaler.fit_transform(features_df)
+            # Normalize features with StandardScaler
+            logger.info("Applying StandardScaler normalization (mean=0, std=1)...")
+            self.scaler = StandardScaler()
+            features_scaled = self.scaler.fit_transform(features_df)
 
-        # Apply feature weights (NEW: weighted clustering)
-        logger.info("Applying feature weights to normalized features...")
-        features_scaled_weighted = self._apply_feature_weights(features_scaled, features_df.columns)
+            # Apply feature weights (NEW: weighted clustering)
+            logger.info("Applying feature weights to normalized features...")
+            features_scaled_weighted = self._apply_feature_weights(features_scaled, features_df.columns)
 
         # [ADAPTIVE] Find optimal K if enabled
         if self.adaptive_k:
@@ -452,14 +459,11 @@ class StoreClusterer:
             Without weighting: All features treated equally → extreme allocation imbalance
             With weighting: Sales prioritized → balanced allocation
         """
-        features_weighted = features_scaled.copy()
-        for i, feature_name in enumerate(feature_names):
+        for feature_name in feature_names:
             if feature_name in self.feature_weights:
-                weight = self.feature_weights[feature_name]
-                features_weighted[:, i] *= weight
-                logger.debug(f"  {feature_name}: weight={weight:.2f}")
+                logger.debug(f"  {feature_name}: weight={self.feature_weights[feature_name]:.2f}")
 
-        return features_weighted
+        return apply_feature_weights(features_scaled, list(feature_names), self.feature_weights)
 
     def _find_optimal_k(self, features_scaled_weighted: np.ndarray) -> Dict:
         """
@@ -476,6 +480,9 @@ class StoreClusterer:
             - allocations: {K: [cluster_percentages]}
             - rationale: Explanation of choice
         """
+        from sklearn.cluster import KMeans
+        from sklearn.metrics import silhouette_score
+
         logger.info("Adaptive K selection: Testing K=2,3,4,5...")
 
         results = {}
@@ -561,27 +568,8 @@ class StoreClusterer:
         if missing_cols:
             raise ValueError(f"Missing required columns: {missing_cols}")
 
-        # Extract features
-        features_df = store_features[self.REQUIRED_FEATURES].copy()
-
-        # Apply same ordinal encoding as training
-        if "location_tier" in features_df.columns:
-            features_df["location_tier"] = features_df["location_tier"].map(
-                self.LOCATION_TIER_MAP
-            )
-
-        if "fashion_tier" in features_df.columns:
-            features_df["fashion_tier"] = features_df["fashion_tier"].map(
-                self.FASHION_TIER_MAP
-            )
-
-        if "store_format" in features_df.columns:
-            features_df["store_format"] = features_df["store_format"].map(
-                self.STORE_FORMAT_MAP
-            )
-
-        if "region" in features_df.columns:
-            features_df["region"] = features_df["region"].map(self.REGION_MAP)
+        # Extract features and apply same ordinal encoding as training
+        features_df = encode_store_features(store_features)
 
         # Apply scaler transformation (same as training)
         features_scaled = self.scaler.transform(features_df)
@@ -756,6 +744,63 @@ def _calculate_allocation_factor(
     return allocation_factor
 
 
+def _hierarchical_store_forecast(
+    context: ForecastingContext,
+    stores_with_clusters: pd.DataFrame,
+    forecast_by_week: List[int],
+) -> Optional[HierarchicalForecast]:
+    """
+    Reconciled store forecasts for hierarchical allocation mode.
+
+    Forecasts every store of the planned category plus its cluster and the
+    category total, reconciles the levels and anchors the result to the
+    demand agent's weekly forecast, so store forecasts sum exactly to it.
+    Stores with no sales history in the cube get their attribute-based share
+    (the allocation factor used in attribute mode) of every week instead.
+
+    Returns:
+        HierarchicalForecast, or None when attribute-based allocation applies
+        (mode disabled, no category in context, or no store-level history)
+    """
+    if settings.store_allocation_mode != "hierarchical" or not context.category:
+        return None
+
+    try:
+        store_clusters = {
+            str(store_id): str(cluster_id)
+            for store_id, cluster_id in stores_with_clusters["cluster_id"].items()
+        }
+        hierarchy = forecast_hierarchy(
+            context.data_loader.get_weekly_cube(),
+            context.category,
+            store_clusters,
+            horizon=max(len(forecast_by_week), 1),
+            season_start_date=context.season_start_date,
+            method=settings.reconciliation_method,
+        )
+    except Exception as e:
+        logger.warning(f"Hierarchical store forecast unavailable, using store attributes: {e}")
+        return None
+
+    missing = hierarchy.stores_without_history()
+    if missing:
+        shown = ", ".join(missing[:20]) + (f" and {len(missing) - 20} more" if len(missing) > 20 else "")
+        logger.warning(
+            f"{len(missing)} of {len(hierarchy.store_ids)} stores have no {context.category} "
+            f"sales history; allocating them by store attributes: {shown}"
+        )
+
+    if forecast_by_week:
+        attributes = stores_with_clusters.rename(index=str)
+        overall_avg = attributes[["avg_weekly_sales_12mo", "store_size_sqft", "median_income"]].mean().to_dict()
+        fallback_shares = [
+            _calculate_allocation_factor(attributes.loc[store_id], overall_avg, StoreClusterer.LOCATION_TIER_MAP)
+            for store_id in hierarchy.store_ids
+        ]
+        hierarchy = hierarchy.anchored_to(forecast_by_week, fallback_shares=fallback_shares)
+    return hierarchy
+
+
 def _allocate_to_stores(
     cluster_id: int,
     cluster_label: str,
@@ -764,6 +809,7 @@ def _allocate_to_stores(
     cluster_stores: pd.DataFrame,
     forecast_by_week: List[int],
     location_tier_map: Dict[str, int],
+    store_forecast: Optional[HierarchicalForecast] = None,
 ) -> List[Dict[str, Any]]:
     """
     Distribute cluster allocation to stores with 2-week minimum enforcement.
@@ -776,22 +822,38 @@ def _allocate_to_stores(
         cluster_stores: Stores in this cluster
         forecast_by_week: Weekly forecasts for minimum calculation
         location_tier_map: Mapping for location tier encoding
+        store_forecast: Optional reconciled store forecasts (hierarchical mode).
+                        When given, stores are weighted by their own forecast and
+                        the minimum covers each store's first 2 forecast weeks.
 
     Returns:
         List of store allocations
     """
-    # Calculate cluster averages for reference
-    cluster_avg = cluster_stores[
-        ["avg_weekly_sales_12mo", "store_size_sqft", "median_income"]
-    ].mean().to_dict()
-
-    # Calculate allocation factor for each store (raw factors typically 0.5-1.5)
-    store_raw_factors = {}
-    for store_id, store_row in cluster_stores.iterrows():
-        factor = _calculate_allocation_factor(
-            store_row, cluster_avg, location_tier_map
-        )
-        store_raw_factors[store_id] = factor
+    store_minimums = {}
+    if store_forecast is not None:
+        # Raw factor = store forecast / cluster average store forecast (typically 0.5-1.5)
+        forecast_totals = store_forecast.store_totals()
+        minimum_units = store_forecast.minimum_units(weeks=2)
+        cluster_totals = {sid: forecast_totals.get(str(sid), 0.0) for sid in cluster_stores.index}
+        cluster_mean = np.mean(list(cluster_totals.values())) if cluster_totals else 0.0
+        store_raw_factors = {
+            sid: (total / cluster_mean if cluster_mean > 0 else 1.0)
+            for sid, total in cluster_totals.items()
+        }
+        store_minimums = {sid: minimum_units.get(str(sid), 0) for sid in cluster_stores.index}
+    else:
+        # Calculate cluster averages for reference
+        cluster_avg = cluster_stores[
+            ["avg_weekly_sales_12mo", "store_size_sqft", "median_income"]
+        ].mean().to_dict()
+
+        # Calculate allocation factor for each store (raw factors typically 0.5-1.5)
+        store_raw_factors = {}
+        for store_id, store_row in cluster_stores.iterrows():
+            factor = _calculate_allocation_factor(
+                store_row, cluster_avg, location_tier_map
+            )
+            store_raw_factors[store_id] = factor
 
     # Normalize factors to sum to 1.0 for unit distribution
     total_factor = sum(store_raw_factors.values())
@@ -821,11 +883,17 @@ def _allocate_to_stores(
         base_allocation = int(cluster_units * norm_factor)
 
         # Enforce 2-week minimum
-        final_allocation = max(base_allocation, min_allocation_units)
+        min_units = store_minimums.get(store_id, min_allocation_units)
+        final_allocation = max(base_allocation, min_units)
 
         # Store raw factor (0.5-1.5 range) for output, not normalized factor
         base_allocations.append(
-            {"store_id": store_id, "allocation": final_allocation, "factor": store_raw_factors[store_id]}
+            {
+                "store_id": store_id,
+                "allocation": final_allocation,
+                "factor": store_raw_factors[store_id],
+                "min_units": min_units,
+            }
         )
         total_allocated += final_allocation
 
@@ -843,7 +911,7 @@ def _allocate_to_stores(
             for store in sorted_stores:
                 if units_to_remove == 0:
                     break
-                can_reduce = store["allocation"] - min_allocation_units
+                can_reduce = store["allocation"] - store["min_units"]
                 if can_reduce > 0:
                     reduction = min(can_reduce, units_to_remove)
                     store["allocation"] -= reduction
@@ -944,7 +1012,10 @@ def cluster_stores(
             random_state=42,
             adaptive_k=adaptive_k
         )
-        clusterer.fit(stores_df)
+        clusterer.fit(
+            stores_df,
+            features=data_loader.get_store_features(clusterer.feature_weights),
+        )
 
         # Get cluster stats
         cluster_stats_df = clusterer.get_cluster_stats()
@@ -1094,8 +1165,17 @@ def allocate_inventory(
 
         # Re-run clustering to get cluster assignments
         clusterer = StoreClusterer(n_clusters=3, random_state=42, adaptive_k=False)
-        clusterer.fit(stores_df)
+        clusterer.fit(
+            stores_df,
+            features=data_loader.get_store_features(clusterer.feature_weights),
+        )
         stores_with_clusters = clusterer.training_data_
+        assert stores_with_clusters is not None  # set by fit()
+
+        # Hierarchical mode: weight stores by their own reconciled forecasts
+        store_forecast = _hierarchical_store_forecast(
+            ctx.context, stores_with_clusters, forecast_by_week
+        )
 
         # Step 3: Allocate to clusters
         logger.info("Step 3: Allocating inventory to clusters...")
@@ -1123,7 +1203,13 @@ def allocate_inventory(
             raw_units = int(initial_allocation_total * allocation_pct)
 
             # Enforce cluster minimum
-            min_cluster_units = store_count * min_allocation_per_store
+            if store_forecast is not None:
+                # Sum of the cluster's per-store 2-week minimums
+                members = stores_with_clusters.index[stores_with_clusters["cluster_id"] == cluster_id]
+                minimum_units = store_forecast.minimum_units(weeks=2)
+                min_cluster_units = sum(minimum_units.get(str(sid), 0) for sid in members)
+            else:
+                min_cluster_units = store_count * min_allocation_per_store
             final_units = max(raw_units, min_cluster_units)
 
             cluster_base_allocations.append(
@@ -1184,6 +1270,7 @@ def allocate_inventory(
                 cluster_stores=cluster_stores_df,
                 forecast_by_week=forecast_by_week,
                 location_tier_map=StoreClusterer.LOCATION_TIER_MAP,
+                store_forecast=store_forecast,
             )
 
             # Find allocation percentage from cluster_stats (using BaseModel attributes)
@@ -255,6 +255,27 @@ def generate_store_to_store_transfers(
     return transfers
 
 
+def _allocated_store_shares(context: ForecastingContext, store_allocations) -> Dict[str, float]:
+    """
+    Historical sales shares (from the weekly cube) renormalized over allocated stores.
+
+    Returns an empty dict if the category has no history for these stores.
+    """
+    try:
+        cube = context.data_loader.get_weekly_cube()
+    except (OSError, ValueError):
+        return {}
+    if context.category not in cube.category_index:
+        return {}
+
+    shares = cube.store_shares(context.category, recent_weeks=52)
+    allocated_ids = [s.store_id for s in store_allocations]
+    total = sum(shares.get(store_id, 0.0) for store_id in allocated_ids)
+    if total <= 0:
+        return {}
+    return {store_id: shares.get(store_id, 0.0) / total for store_id in allocated_ids}
+
+
 # =============================================================================
 # Function Tools (decorated - used by agent)
 # =============================================================================
@@ -298,6 +319,13 @@ def analyze_store_performance(
     # Check if we have real per-store sales data
     has_store_data = context.has_store_sales
 
+    # Without per-store sales, spread total sales by each store's historical
+    # share from the weekly cube (an allocation-proportional split would give
+    # every store the same velocity)
+    history_shares = {}
+    if not has_store_data and context.category:
+        history_shares = _allocated_store_shares(context, allocation.store_allocations)
+
     for store_alloc in allocation.store_allocations:
         store_id = store_alloc.store_id
         allocated = store_alloc.allocation_units
@@ -307,6 +335,9 @@ def analyze_store_performance(
         if has_store_data:
             # Use real per-store sales data from uploaded CSVs
             store_sold = context.get_store_sales_up_to_week(store_id, current_week)
+        elif history_shares:
+            # Fallback: estimate from total sales by historical store share
+            store_sold = int((context.total_sold or 0) * history_shares.get(store_id, 0.0))
         else:
             # Fallback: estimate from total sales proportionally
             total_sold = context.total_sold or 0
@@ -0,0 +1,95 @@
+"""
+Probabilistic Forecast Check
+
+Forecasts every category with demand quantiles, through the ensemble and
+the global model, and checks that the bootstrapped distribution is
+centered on the point forecast:
+
+- every week's point forecast lies inside its p5-p95 band
+- every week's p50 is within --weekly-tolerance of the point forecast
+- the season-total p50 is within --total-tolerance of the point total
+
+Exits non-zero if any check fails.
+
+Usage (from backend/):
+    python benchmarks/probabilistic_forecast_check.py
+    python benchmarks/probabilistic_forecast_check.py --data-dir /path/to/training --horizon 26
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_tools.batch_forecast import run_global_forecast  # noqa: E402
+from agent_tools.demand_tools import EnsembleForecaster  # noqa: E402
+from utils.data_loader import TrainingDataLoader  # noqa: E402
+
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+def check(
+    point: List[int],
+    weekly: Dict[str, List[int]],
+    season_total: Dict[str, int],
+    weekly_tolerance: float,
+    total_tolerance: float,
+) -> Dict[str, bool]:
+    """Centering checks of one forecast's quantiles."""
+    point = np.asarray(point, dtype=float)
+    p5, p50, p95 = (np.asarray(weekly[k], dtype=float) for k in ("p5", "p50", "p95"))
+    scale = np.maximum(point, 1.0)
+    return {
+        "point inside p5-p95": bool(np.all((p5 <= point) & (point <= p95))),
+        "weekly p50 ≈ point": bool(np.all(np.abs(p50 - point) / scale <= weekly_tolerance)),
+        "season p50 ≈ point total": abs(season_total["p50"] - point.sum()) <= total_tolerance * max(point.sum(), 1.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check bootstrapped demand quantiles against point forecasts")
+    parser.add_argument("--data-dir", default=None, help="Training data directory (default: data/training)")
+    parser.add_argument("--horizon", type=int, default=12, help="Forecast weeks")
+    parser.add_argument("--weekly-tolerance", type=float, default=0.05)
+    parser.add_argument("--total-tolerance", type=float, default=0.02)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    loader = TrainingDataLoader(args.data_dir)
+    categories = loader.get_categories()
+
+    results = {}
+    for category in categories:
+        ensemble = EnsembleForecaster()
+        ensemble.train(loader.get_weekly_sales(category))
+        forecast = ensemble.forecast(args.horizon, quantiles=QUANTILES)
+        results[f"ensemble {category}"] = (
+            forecast["predictions"], forecast["quantiles"]["weekly"], forecast["quantiles"]["season_total"]
+        )
+    for category, result in run_global_forecast(loader, categories, args.horizon, quantiles=QUANTILES).items():
+        results[f"global_gbm {category}"] = (
+            result.forecast_by_week, result.demand_quantiles, result.season_demand_quantiles
+        )
+
+    failures = []
+    for label, (point, weekly, season_total) in results.items():
+        print(f"{label}: point {sum(point):,}, season p5/p50/p95 "
+              f"{season_total['p5']:,}/{season_total['p50']:,}/{season_total['p95']:,}")
+        for name, ok in check(point, weekly, season_total, args.weekly_tolerance, args.total_tolerance).items():
+            print(f"  [{'ok' if ok else 'FAIL'}] {name}")
+            if not ok:
+                failures.append(f"{label}: {name}")
+
+    if failures:
+        print(f"FAILED: {', '.join(failures)}")
+        sys.exit(1)
+    print("All quantile checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Prophet Concurrency Stress Test
+
+Trains many Prophet models at once in one process, from a thread pool and
+from asyncio tasks, and checks that concurrent training is safe:
+
+- sys.stdout / sys.stderr are never replaced while fits run, and lines
+  printed by another thread during the fits all arrive
+- every fit captures its own Prophet/CmdStan log (same record count as a
+  fit run alone, nothing on the console)
+- concurrent fits never exceed the configured fit slots
+- each concurrent fit gives the same forecast as the same fit run alone
+
+Exits non-zero if any check fails.
+
+Usage (from backend/):
+    python benchmarks/prophet_concurrency_stress.py
+    python benchmarks/prophet_concurrency_stress.py --models 48 --threads 32
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agent_tools import demand_tools  # noqa: E402
+from agent_tools.demand_tools import ProphetWrapper  # noqa: E402
+
+HORIZON = 12
+
+
+def synthetic_series(seed: int, n_weeks: int = 130) -> pd.DataFrame:
+    """Weekly sales with yearly seasonality, trend and noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_weeks)
+    level = rng.uniform(500, 5000)
+    sales = level * (1 + 0.3 * np.sin(2 * np.pi * t / 52 + rng.uniform(0, 2 * np.pi))) * (1 + 0.002 * t)
+    sales = np.maximum(sales + rng.normal(0, 0.05 * level, n_weeks), 0)
+    return pd.DataFrame({
+        "date": pd.date_range("2022-01-02", periods=n_weeks, freq="W"),
+        "quantity_sold": sales.round().astype(int),
+    })
+
+
+def fit_and_forecast(df: pd.DataFrame) -> ProphetWrapper:
+    model = ProphetWrapper()
+    model.train(df)
+    model.forecast(HORIZON)
+    return model
+
+
+class RecordCounter(logging.Handler):
+    """Counts Prophet/CmdStan records that get past the per-fit capture."""
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+    def __enter__(self):
+        for name in demand_tools._PROPHET_LOGGERS:
+            logging.getLogger(name).addHandler(self)
+        return self
+
+    def __exit__(self, *exc):
+        for name in demand_tools._PROPHET_LOGGERS:
+            logging.getLogger(name).removeHandler(self)
+
+
+class Monitor:
+    """Background thread that prints marker lines and samples fit concurrency."""
+
+    def __init__(self):
+        self.stdout = sys.stdout
+        self.stderr = sys.stderr
+        self.printed = 0
+        self.max_in_flight = 0
+        self.streams_swapped = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            if sys.stdout is not self.stdout or sys.stderr is not self.stderr:
+                self.streams_swapped = True
+            in_flight = demand_tools._max_concurrent_fits - demand_tools._fit_slots._value
+            self.max_in_flight = max(self.max_in_flight, in_flight)
+            print(f"monitor line {self.printed}")
+            self.printed += 1
+            time.sleep(0.005)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_threads(series, threads: int):
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(fit_and_forecast, series))
+
+
+async def run_asyncio(series):
+    models = [ProphetWrapper() for _ in series]
+    await asyncio.gather(*(model.train_async(df) for model, df in zip(models, series)))
+    for model in models:
+        model.forecast(HORIZON)
+    return models
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress-test concurrent Prophet training")
+    parser.add_argument("--models", type=int, default=24, help="Models trained per concurrent run")
+    parser.add_argument("--threads", type=int, default=16, help="Thread pool size (above the fit slots)")
+    args = parser.parse_args()
+
+    series = [synthetic_series(seed) for seed in range(args.models)]
+
+    print(f"Fit slots: {demand_tools._max_concurrent_fits}")
+    start = time.perf_counter()
+    reference = [fit_and_forecast(df) for df in series]
+    sequential_seconds = time.perf_counter() - start
+    reference_log_lines = [len(model.fit_log) for model in reference]
+
+    failures = []
+    for mode in ("threads", "asyncio"):
+        captured = io.StringIO()
+        start = time.perf_counter()
+        with redirect_stdout(captured), RecordCounter() as leaked, Monitor() as monitor:
+            if mode == "threads":
+                models = run_threads(series, args.threads)
+            else:
+                models = asyncio.run(run_asyncio(series))
+        seconds = time.perf_counter() - start
+
+        output = captured.getvalue().splitlines()
+        monitor_lines = [line for line in output if line.startswith("monitor line")]
+        checks = {
+            "streams untouched": not monitor.streams_swapped,
+            "no printed lines lost": len(monitor_lines) == monitor.printed,
+            "no Prophet output on console": len(output) == len(monitor_lines) and leaked.count == 0,
+            "per-fit logs": [len(m.fit_log) for m in models] == reference_log_lines,
+            "fit slots respected": monitor.max_in_flight <= demand_tools._max_concurrent_fits,
+            "same forecasts as sequential": all(
+                m.forecast_df["yhat"].round(6).tolist() == r.forecast_df["yhat"].round(6).tolist()
+                for m, r in zip(models, reference)
+            ),
+        }
+        print(
+            f"{mode:<8} {len(models)} fits in {seconds:.1f}s "
+            f"(sequential {sequential_seconds:.1f}s), max {monitor.max_in_flight} in flight"
+        )
+        for name, ok in checks.items():
+            print(f"  [{'ok' if ok else 'FAIL'}] {name}")
+            if not ok:
+                failures.append(f"{mode}: {name}")
+
+    if failures:
+        print(f"FAILED: {', '.join(failures)}")
+        sys.exit(1)
+    print("All concurrency checks passed")
+
+
+if __name__ == "__main__":
+    main()
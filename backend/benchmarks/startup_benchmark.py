@@ -0,0 +1,120 @@
+"""
+Startup-Time Benchmark
+
+Measures cold-start cost of the backend: each import runs in a fresh
+Python process (so nothing is cached in sys.modules), and the Streamlit
+app's first script run is timed headless with streamlit's AppTest, which
+executes streamlit_app.py exactly as a first page load does.
+
+Also reports which heavy libraries (Prophet, statsmodels, scikit-learn,
+SciPy) were loaded by each import — with lazy imports none of them should
+load until a model is first trained.
+
+Usage (from backend/):
+    python benchmarks/startup_benchmark.py
+    python benchmarks/startup_benchmark.py --repeat 5 --skip-streamlit
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["prophet", "statsmodels", "sklearn", "scipy"]
+
+# (label, working directory, import statement)
+IMPORT_TARGETS = [
+    ("import backend", BACKEND_DIR.parent, "import backend"),
+    ("import agent_tools", BACKEND_DIR, "import agent_tools"),
+    ("import agent_tools.demand_tools", BACKEND_DIR, "import agent_tools.demand_tools"),
+    ("import utils.data_loader", BACKEND_DIR, "import utils.data_loader"),
+    ("import workflows.season_workflow", BACKEND_DIR, "import workflows.season_workflow"),
+]
+
+_IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+_STREAMLIT_PROBE = """
+import json, time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+app = AppTest.from_file("streamlit_app.py", default_timeout=300)
+app.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "exception": bool(app.exception)}))
+"""
+
+
+def _run_probe(code: str, cwd: Path) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure_import(statement: str, cwd: Path, repeat: int) -> dict:
+    """Median cold import time over `repeat` fresh interpreters."""
+    runs = [
+        _run_probe(_IMPORT_PROBE.format(statement=statement, heavy=HEAVY_MODULES), cwd)
+        for _ in range(repeat)
+    ]
+    return {
+        "seconds": statistics.median(r["seconds"] for r in runs),
+        "heavy": runs[-1]["heavy"],
+    }
+
+
+def measure_streamlit_first_paint(repeat: int) -> dict:
+    """Median time for the Streamlit app's first full script run."""
+    runs = [_run_probe(_STREAMLIT_PROBE, BACKEND_DIR) for _ in range(repeat)]
+    return {
+        "seconds": statistics.median(r["seconds"] for r in runs),
+        "exception": any(r["exception"] for r in runs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure backend cold-start time")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (median reported)")
+    parser.add_argument("--skip-streamlit", action="store_true", help="Skip the Streamlit first-paint run")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for label, cwd, statement in IMPORT_TARGETS:
+        results[label] = measure_import(statement, cwd, args.repeat)
+    if not args.skip_streamlit:
+        results["streamlit first paint"] = measure_streamlit_first_paint(args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print("=" * 72)
+    print(f"Startup benchmark (median of {args.repeat} cold runs)")
+    print("=" * 72)
+    for label, result in results.items():
+        detail = ""
+        if "heavy" in result:
+            detail = f"heavy libs loaded: {', '.join(result['heavy']) or 'none'}"
+        elif result.get("exception"):
+            detail = "app raised an exception"
+        print(f"{label:<36} {result['seconds']:>7.2f}s   {detail}")
+
+
+if __name__ == "__main__":
+    main()
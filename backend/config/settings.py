@@ -7,11 +7,20 @@ Loads from environment variables with sensible defaults.
 
 import os
 from dataclasses import dataclass
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Repository root (parent of backend/); relative cache and store paths resolve here
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def project_path(path: str) -> Path:
+    """Resolve a configured path against the project root (absolute paths are kept)."""
+    return PROJECT_ROOT / Path(path).expanduser()
+
 
 @dataclass
 class Settings:
@@ -34,6 +43,70 @@ class Settings:
     default_dc_holdback_pct: float = float(os.getenv("DEFAULT_DC_HOLDBACK_PCT", "0.45"))
     default_safety_stock_pct: float = float(os.getenv("DEFAULT_SAFETY_STOCK_PCT", "0.20"))
 
+    # Store split within clusters: "attributes" (store attribute factors) or
+    # "hierarchical" (reconciled store × category forecasts)
+    store_allocation_mode: str = os.getenv("STORE_ALLOCATION_MODE", "attributes")
+    # Hierarchy reconciliation: "bottom_up", "ols" or "wls"
+    reconciliation_method: str = os.getenv("RECONCILIATION_METHOD", "wls")
+
+    # Data Configuration
+    # "columnar" (category-partitioned cache) or "mmap" (memory-mapped daily tensor
+    # for histories too large to load into memory)
+    sales_storage_mode: str = os.getenv("SALES_STORAGE_MODE", "columnar")
+    # Directory to persist uploaded in-season actuals under (per sales file);
+    # empty = in memory only, scoped to the session's data loader
+    sales_actuals_dir: str = os.getenv("SALES_ACTUALS_DIR", "")
+
+    # Model Cache Configuration
+    # Trained forecast models are reused while history and config are unchanged
+    # (relative MODEL_CACHE_DIR resolves against the project root; empty = in-memory only)
+    model_cache_dir: str = os.getenv("MODEL_CACHE_DIR", ".model_cache")
+    model_cache_size: int = int(os.getenv("MODEL_CACHE_SIZE", "16"))
+
+    # Demand ensemble candidate models (comma-separated names from
+    # EnsembleForecaster.CANDIDATE_MODELS: prophet, exp_smooth, holt_winters_np,
+    # seasonal_naive, seasonal_index, global_gbm)
+    ensemble_candidates: str = os.getenv("ENSEMBLE_CANDIDATES", "prophet,exp_smooth")
+    # Ensemble weighting: "holdout" (single 80/20 split) or "backtest" (opt-in:
+    # parallel rolling-origin folds, BACKTEST_FOLDS extra fits per candidate)
+    ensemble_validation: str = os.getenv("ENSEMBLE_VALIDATION", "holdout")
+    backtest_folds: int = int(os.getenv("BACKTEST_FOLDS", "3"))
+    backtest_horizon: int = int(os.getenv("BACKTEST_HORIZON", "12"))
+    # Ensemble selection: "full" (fit every candidate) or "adaptive" (cheap candidates
+    # first; skip Prophet fits that cannot earn ENSEMBLE_MIN_WEIGHT)
+    ensemble_selection: str = os.getenv("ENSEMBLE_SELECTION", "full")
+    ensemble_min_weight: float = float(os.getenv("ENSEMBLE_MIN_WEIGHT", "0.05"))
+
+    # Precomputed forecast store (opt-in SQLite file written by scripts/precompute_forecasts.py,
+    # e.g. ".forecast_store/forecasts.sqlite"; relative to the project root; empty = disabled).
+    # Rows are served while the history/config fingerprint matches and they are younger
+    # than FORECAST_STORE_MAX_AGE_HOURS (0 = no age limit)
+    forecast_store_path: str = os.getenv("FORECAST_STORE_PATH", "")
+    forecast_store_max_age_hours: float = float(os.getenv("FORECAST_STORE_MAX_AGE_HOURS", "24"))
+
+    # Demand forecast latency budget in ms (0 = no budget). Over budget, the
+    # best fast model is served while the ensemble trains in the background
+    forecast_latency_budget_ms: int = int(os.getenv("FORECAST_LATENCY_BUDGET_MS", "0"))
+
+    # Demand quantiles bootstrapped with every ensemble forecast (comma-separated,
+    # e.g. "0.05,0.5,0.95"; empty = point forecast and bounds only)
+    forecast_quantiles: str = os.getenv("FORECAST_QUANTILES", "")
+
+    # Seasonality in demand tool results: "summary" (compact SeasonalitySummary only)
+    # or "full" (also per-week yearly/weekly/trend lists)
+    forecast_seasonality_detail: str = os.getenv("FORECAST_SEASONALITY_DETAIL", "summary")
+
+    # Prophet fits running at once in one process (threads, asyncio, Streamlit
+    # sessions); further fits queue. 0 = CPU count
+    prophet_max_concurrent_fits: int = int(os.getenv("PROPHET_MAX_CONCURRENT_FITS", "0"))
+
+    # Posterior samples behind Prophet's prediction intervals (Prophet default 1000).
+    # 0 = analytic (normal-approximation) intervals with no sampling, fastest inference
+    prophet_uncertainty_samples: int = int(os.getenv("PROPHET_UNCERTAINTY_SAMPLES", "1000"))
+
+    # Batch forecasting worker processes (0 = CPU count)
+    forecast_workers: int = int(os.getenv("FORECAST_WORKERS", "0"))
+
     # Session Configuration
     session_dir: str = os.getenv("SESSION_DIR", "sessions")
 
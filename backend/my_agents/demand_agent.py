@@ -62,12 +62,15 @@ Your output MUST include these fields:
 - explanation: str - YOUR reasoning about the forecast (REQUIRED)
 
 ## SEASONALITY EXPLANATION (NEW!)
-The tool returns seasonality data including:
+The tool returns seasonality_summary including:
 - months_covered: Which months the forecast spans (e.g., ["August", "September", "October"])
 - peak_week: Week with highest seasonal demand
 - trough_week: Week with lowest seasonal demand
 - seasonal_range_pct: How much demand varies due to seasonality (e.g., 15% swing)
-- yearly_effect: Seasonal multipliers per week
+- peak_effect_pct / trough_effect_pct: Seasonal effect at the peak/trough week (% of trend)
+- trend_pct_per_week: Underlying trend growth per week
+- description: One-line summary of the above
+(seasonality with per-week yearly_effect lists is only included when configured)
 
 Use this data to generate a natural language "insight" that explains:
 1. What retail seasons/events fall within the forecast period
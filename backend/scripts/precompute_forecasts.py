@@ -0,0 +1,115 @@
+"""
+Precompute Demand Forecasts
+
+Offline batch job that fills the precomputed forecast store
+(utils/forecast_store.py) for every category × season start × horizon, so
+planning sessions are served without training. Entries that are still
+fresh (same history and ensemble config) are skipped, so re-running after
+new actuals only recomputes the categories that changed.
+
+The store is opt-in: set FORECAST_STORE_PATH (e.g. .forecast_store/forecasts.sqlite,
+relative to the project root) for both this job and the app.
+
+Usage (from backend/):
+    python scripts/precompute_forecasts.py --season-start 2025-02-03 --horizon 12
+    python scripts/precompute_forecasts.py --season-start 2025-02-03 --season-start 2025-08-04 \\
+        --horizon 12 --horizon 26 --workers 4
+    python scripts/precompute_forecasts.py --list
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+from agent_tools.batch_forecast import run_batch_forecast, shutdown_forecast_pool  # noqa: E402
+from agent_tools.demand_tools import cube_panel, forecast_model_key  # noqa: E402
+from utils.data_loader import TrainingDataLoader  # noqa: E402
+from utils.forecast_store import get_forecast_store  # noqa: E402
+
+
+def _parse_date(value: str) -> date:
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute demand forecasts into the forecast store")
+    parser.add_argument("--season-start", type=_parse_date, action="append", default=[],
+                        help="Season start date YYYY-MM-DD (repeatable; default: continue the history)")
+    parser.add_argument("--horizon", type=int, action="append", default=[],
+                        help="Forecast horizon in weeks (repeatable; default: 12)")
+    parser.add_argument("--categories", nargs="+", default=None,
+                        help="Categories to precompute (default: all)")
+    parser.add_argument("--data-dir", default=None, help="Training data directory")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Forecast worker processes (default: FORECAST_WORKERS)")
+    parser.add_argument("--rebuild", action="store_true", help="Clear the store and recompute everything")
+    parser.add_argument("--list", action="store_true", help="List stored forecasts and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(name)s: %(message)s")
+
+    store = get_forecast_store()
+    if store is None:
+        parser.error("FORECAST_STORE_PATH is empty (forecast store disabled; set it to enable)")
+
+    if args.list:
+        for entry in store.entries():
+            created = datetime.fromtimestamp(entry["created_at"]).strftime("%Y-%m-%d %H:%M")
+            print(f"{entry['category']:<28} start={entry['season_start'] or '-':<11} "
+                  f"horizon={entry['horizon']:<3} created={created}")
+        return
+
+    if args.rebuild:
+        store.clear()
+
+    data_loader = TrainingDataLoader(args.data_dir)
+    categories = args.categories or data_loader.get_categories()
+    # The serving path's panel: global_gbm's forecasts and model keys depend on it
+    panel = cube_panel(data_loader)
+    alignments = args.season_start or [None]
+    horizons = args.horizon or [12]
+
+    start = time.perf_counter()
+    computed = skipped = failed = 0
+    try:
+        for season_start_date in alignments:
+            for horizon in horizons:
+                model_keys = {}
+                todo = []
+                for category in categories:
+                    weekly_sales = data_loader.get_weekly_sales(category)
+                    model_keys[category] = forecast_model_key(weekly_sales, category, season_start_date, panel)
+                    if store.get(category, season_start_date, horizon, model_keys[category]) is not None:
+                        skipped += 1
+                    else:
+                        todo.append(category)
+                if not todo:
+                    continue
+
+                results = run_batch_forecast(
+                    data_loader, todo, horizon, season_start_date, workers=args.workers, panel=panel
+                )
+                for category, result in results.items():
+                    if result.error:
+                        print(f"  FAILED {category} (start={season_start_date}, horizon={horizon}): {result.error}")
+                        failed += 1
+                        continue
+                    store.put(category, season_start_date, horizon, model_keys[category], result.model_dump())
+                    computed += 1
+    finally:
+        shutdown_forecast_pool()
+
+    print(
+        f"Forecast store {store.path}: {computed} computed, {skipped} fresh (skipped), "
+        f"{failed} failed in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -233,6 +233,9 @@ def check_params_changed(current_params) -> bool:
 
 def save_run_params(params):
     """Save the parameters used for a workflow run."""
+    if check_params_changed(params):
+        # In-season actuals belong to the previous planning run
+        st.session_state.data_loader.clear_actuals()
     st.session_state.flow_state["last_run_params"] = params
 
 
@@ -2701,6 +2704,7 @@ async def run_replenishment_agent_async(
     context = ForecastingContext(
         data_loader=st.session_state.data_loader,
         session_id=st.session_state.session_id,
+        category=params.category,
         current_week=selected_week,
         actual_sales=st.session_state.actual_sales if st.session_state.actual_sales else None,
         total_sold=st.session_state.total_sold,
@@ -2785,6 +2789,7 @@ async def run_pricing_agent_async(
     context = ForecastingContext(
         data_loader=st.session_state.data_loader,
         session_id=st.session_state.session_id,
+        category=params.category,
         current_week=selected_week,
         actual_sales=st.session_state.actual_sales if st.session_state.actual_sales else None,
         total_sold=st.session_state.total_sold,
@@ -3927,10 +3932,14 @@ async def run_workflow_async(params: WorkflowParams):
     context = ForecastingContext(
         data_loader=st.session_state.data_loader,
         session_id=st.session_state.session_id,
+        category=params.category,
         season_start_date=params.season_start_date,
         current_week=st.session_state.current_week,
         actual_sales=st.session_state.actual_sales if st.session_state.actual_sales else None,
         total_sold=st.session_state.total_sold,
+        store_actual_sales={
+            store_id: list(sales) for store_id, sales in st.session_state.store_actual_sales.items()
+        },
     )
 
     # Create hooks for UI updates (native SDK) with toast notifications
@@ -3939,6 +3948,8 @@ async def run_workflow_async(params: WorkflowParams):
 
     try:
         if st.session_state.current_week > 0 and st.session_state.actual_sales:
+            # Train the reforecast on the uploaded store-level weeks
+            context.add_actual_sales_to_history()
             result = await run_inseason_update(
                 context=context,
                 params=params,
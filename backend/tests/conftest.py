@@ -0,0 +1,6 @@
+"""Make the backend packages (utils, config, ...) importable as in the app."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,72 @@
+"""Gap handling of in-season actuals merged after the historical file."""
+
+from datetime import date, timedelta
+
+from utils.actuals_log import ActualsLog, _week_index, continuing_rows, history_gaps
+
+HISTORY_END = "2024-12-31"
+
+
+def _day(weeks_after_end: int, category: str = "Dresses", store: str = "S001", quantity: int = 10):
+    day = date.fromisoformat(HISTORY_END) + timedelta(weeks=weeks_after_end)
+    return (category, day.isoformat(), store, quantity)
+
+
+def test_weeks_after_a_gap_are_held_back():
+    rows = [_day(1), _day(2), _day(4), _day(5)]
+    assert continuing_rows(rows, HISTORY_END) == [_day(1), _day(2)]
+
+
+def test_filling_the_gap_releases_the_held_weeks():
+    rows = [_day(1), _day(2), _day(4), _day(3, store="S002")]
+    assert sorted(continuing_rows(rows, HISTORY_END)) == sorted(rows)
+
+
+def test_categories_are_gap_checked_independently():
+    rows = [_day(1), _day(3, category="Shirts"), _day(1, category="Shirts", store="S002")]
+    kept = continuing_rows(rows, HISTORY_END)
+    assert _day(3, category="Shirts") not in kept
+    assert len(kept) == 2
+
+
+def test_rows_within_the_history_are_always_kept():
+    rows = [_day(0), _day(-3), _day(2)]
+    assert continuing_rows(rows, HISTORY_END) == [_day(0), _day(-3)]
+
+
+def test_without_history_the_run_starts_at_the_first_actuals_week():
+    rows = [_day(10), _day(11), _day(13)]
+    assert continuing_rows(rows, None) == [_day(10), _day(11)]
+
+
+def test_season_start_anchors_the_run_and_leaves_an_unobserved_gap():
+    season_start = (date.fromisoformat(HISTORY_END) + timedelta(weeks=5)).isoformat()
+    rows = [_day(2), _day(5), _day(6), _day(8)]
+
+    kept = continuing_rows(rows, HISTORY_END, {"Dresses": season_start})
+
+    assert kept == [_day(5), _day(6)]
+    end_week = _week_index(HISTORY_END)
+    assert history_gaps(kept, HISTORY_END) == {"Dresses": (end_week + 1, end_week + 4)}
+
+
+def test_no_gap_when_actuals_continue_the_history():
+    assert history_gaps([_day(1), _day(2)], HISTORY_END) == {}
+    assert history_gaps([_day(3)], "") == {}
+
+
+def test_persisted_log_replaces_values_and_keeps_the_season_start(tmp_path):
+    source = tmp_path / "sales.csv"
+    log = ActualsLog(source, "fp1", log_root=tmp_path / "actuals")
+    assert log.append("Dresses", [("2025-01-06", "S001", 5)], season_start="2025-01-06") == {
+        ("Dresses", "2025-01-06", "S001"): 5
+    }
+    assert log.append("Dresses", [("2025-01-06", "S001", 5)]) == {}
+    assert log.append("Dresses", [("2025-01-06", "S001", 8)]) == {("Dresses", "2025-01-06", "S001"): 3}
+
+    reloaded = ActualsLog(source, "fp1", log_root=tmp_path / "actuals")
+    assert reloaded.rows() == [("Dresses", "2025-01-06", "S001", 8)]
+    assert reloaded.season_starts() == {"Dresses": "2025-01-06"}
+
+    # A new version of the source file starts a fresh log
+    assert len(ActualsLog(source, "fp2", log_root=tmp_path / "actuals")) == 0
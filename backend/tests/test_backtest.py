@@ -0,0 +1,77 @@
+"""Rolling-origin backtest folds and their cache."""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.backtest import BacktestConfig, rolling_origins, run_backtest
+from utils.model_cache import ModelArtifactCache
+
+
+class LastValueModel:
+    """Repeats the last training week; records what it was trained with."""
+
+    trained: List[Dict] = []
+
+    def train(self, df: pd.DataFrame, init_params: Optional[Dict] = None) -> None:
+        self.last = float(df["quantity_sold"].iloc[-1])
+        LastValueModel.trained.append({"weeks": len(df), "init_params": init_params})
+
+    def forecast(self, periods: int) -> Dict:
+        return {"predictions": [self.last] * periods}
+
+
+class FailingModel:
+    def train(self, df: pd.DataFrame) -> None:
+        raise RuntimeError("did not converge")
+
+
+def _history(n_weeks: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "date": pd.date_range("2022-01-02", periods=n_weeks, freq="W"),
+        "quantity_sold": np.arange(n_weeks) * 2 + 100,
+    })
+
+
+def test_origins_are_the_latest_on_a_grid_anchored_to_the_start():
+    config = BacktestConfig()
+    assert rolling_origins(60, config) == [38, 42, 46]
+    # One more week keeps the same origins, so every fold stays cached
+    assert rolling_origins(61, config) == [38, 42, 46]
+    assert rolling_origins(62, config) == [42, 46, 50]
+    assert rolling_origins(37, config) == []
+
+
+def test_folds_score_each_candidate_and_are_reused_from_cache():
+    LastValueModel.trained = []
+    cache = ModelArtifactCache(max_entries=64)
+    candidates = {"last": LastValueModel, "broken": FailingModel}
+
+    result = run_backtest(_history(60), candidates, cache=cache)
+
+    assert [(f.model, f.train_weeks) for f in result.folds] == [
+        ("broken", 38), ("broken", 42), ("broken", 46), ("last", 38), ("last", 42), ("last", 46),
+    ]
+    # A linear trend of 2/week: the naive forecast misses by 2, 4, ..., 24
+    assert result.mae["last"] == np.mean(np.arange(1, 13) * 2)
+    assert result.mae["broken"] == np.inf
+    assert all(f.error == "did not converge" for f in result.folds if f.model == "broken")
+
+    again = run_backtest(_history(61), candidates, cache=cache)
+    # Successful folds come from the cache; failed ones are retried
+    assert again.cached_folds == 3
+    assert again.mae == result.mae
+    assert len(LastValueModel.trained) == 3
+
+
+def test_warm_starts_reach_their_candidate_only():
+    LastValueModel.trained = []
+    warm = {"last": {"k": 0.1}}
+
+    candidates = {"last": LastValueModel, "cold": LastValueModel}
+    run_backtest(_history(60), candidates, cache=ModelArtifactCache(), init_params=warm)
+
+    init_params = [t["init_params"] for t in LastValueModel.trained]
+    assert init_params.count({"k": 0.1}) == 3
+    assert init_params.count(None) == 3
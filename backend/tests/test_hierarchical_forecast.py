@@ -0,0 +1,88 @@
+"""Coherence of reconciled store / cluster / category forecasts."""
+
+import numpy as np
+import pytest
+
+from utils.hierarchical_forecast import (
+    RECONCILIATION_METHODS,
+    HierarchicalForecast,
+    reconcile,
+    seasonal_level_forecast,
+    seasonal_naive_variance,
+)
+
+
+def _base_forecasts(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    n_stores, n_weeks, horizon = 12, 110, 8
+    codes = np.arange(n_stores) % 3
+    weeks = np.arange(n_weeks)
+    season = 1 + 0.4 * np.sin(2 * np.pi * weeks / 52)
+    history = rng.poisson(rng.uniform(5, 40, (n_stores, 1)) * season[None, :]).astype(float)
+
+    cluster_history = np.zeros((3, n_weeks))
+    np.add.at(cluster_history, codes, history)
+    levels = np.vstack([history, cluster_history, history.sum(axis=0, keepdims=True)])
+    # Perturb the upper levels so the base forecasts are incoherent
+    base = seasonal_level_forecast(levels, horizon) * rng.uniform(0.8, 1.2, (len(levels), 1))
+    return base, seasonal_naive_variance(levels), codes, n_stores
+
+
+@pytest.mark.parametrize("method", RECONCILIATION_METHODS)
+def test_reconciled_stores_sum_to_clusters_and_total(method):
+    base, variance, codes, n_stores = _base_forecasts()
+    store = reconcile(
+        base[:n_stores], base[n_stores:n_stores + 3], base[-1], codes, method=method,
+        store_variance=variance[:n_stores],
+        cluster_variance=variance[n_stores:n_stores + 3],
+        total_variance=float(variance[-1]),
+    )
+    hierarchy = HierarchicalForecast("c", method, [f"S{i}" for i in range(n_stores)], ["a", "b", "c"], codes, store)
+
+    assert (store >= 0).all()
+    for c in range(3):
+        np.testing.assert_allclose(hierarchy.cluster[c], store[codes == c].sum(axis=0))
+    np.testing.assert_allclose(hierarchy.cluster.sum(axis=0), hierarchy.total)
+
+    integer = hierarchy.integer_store_forecasts()
+    np.testing.assert_array_equal(integer.sum(axis=0), np.round(hierarchy.total))
+
+
+@pytest.mark.parametrize("method", ("ols", "wls"))
+def test_optimal_combination_matches_dense_solve(method):
+    base, variance, codes, n_stores = _base_forecasts(seed=1)
+    store = reconcile(
+        base[:n_stores], base[n_stores:n_stores + 3], base[-1], codes, method=method,
+        store_variance=variance[:n_stores],
+        cluster_variance=variance[n_stores:n_stores + 3],
+        total_variance=float(variance[-1]),
+    )
+
+    summing = np.vstack([np.eye(n_stores), np.eye(3)[codes].T, np.ones((1, n_stores))])
+    weights = np.ones(len(summing)) if method == "ols" else 1.0 / np.maximum(
+        variance, max(float(np.median(variance[:n_stores])) * 1e-3, 1e-9)
+    )
+    sws = summing.T @ (weights[:, None] * summing)
+    dense = np.linalg.solve(sws, summing.T @ (weights[:, None] * base))
+    np.testing.assert_allclose(store, np.maximum(dense, 0.0), rtol=1e-8, atol=1e-8)
+
+
+def test_anchoring_keeps_coherence_and_covers_stores_without_history():
+    store = np.array([[6.0, 0.0, 2.0], [2.0, 0.0, 2.0], [2.0, 0.0, 0.0], [1.0, 0.0, 1.0]])
+    hierarchy = HierarchicalForecast(
+        "c", "wls", ["S1", "S2", "S3", "S4"], ["a", "b"], np.array([0, 0, 1, 1]), store,
+        has_history=np.array([True, True, True, False]),
+    )
+    assert hierarchy.stores_without_history() == ["S4"]
+
+    anchored = hierarchy.anchored_to([100.0, 40.0, 20.0], fallback_shares=[1.0, 1.0, 1.0, 2.0])
+
+    np.testing.assert_allclose(anchored.total, [100.0, 40.0, 20.0])
+    # The store without history gets its fallback share of every week
+    np.testing.assert_allclose(anchored.store[3], [40.0, 16.0, 8.0])
+    # The others keep their reconciled proportions, or follow the shares when those are all zero
+    np.testing.assert_allclose(anchored.store[:3, 0], [36.0, 12.0, 12.0])
+    np.testing.assert_allclose(anchored.store[:3, 1], [8.0, 8.0, 8.0])
+
+    minimums = anchored.minimum_units(weeks=2)
+    assert minimums == {"S1": 44, "S2": 20, "S3": 20, "S4": 56}
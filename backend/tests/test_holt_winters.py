@@ -0,0 +1,60 @@
+"""Incremental Holt-Winters updates versus full fits."""
+
+import numpy as np
+import pytest
+
+from utils.holt_winters import fit_holt_winters, refresh_holt_winters
+
+
+def _history(n_series: int = 4, n_weeks: int = 130, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    weeks = np.arange(n_weeks)
+    season = 1 + 0.5 * np.sin(2 * np.pi * weeks / 52)
+    trend = 1 + 0.002 * weeks
+    return rng.poisson(rng.uniform(20, 80, (n_series, 1)) * season * trend).astype(float)
+
+
+@pytest.mark.parametrize("seasonal", ("add", "mul"))
+def test_update_equals_refit_with_fixed_parameters(seasonal):
+    # Both fits start from the same initial states (two full seasons)
+    history = _history()
+    fit = fit_holt_winters(history[:, :110], season_length=52, seasonal=seasonal)
+    errors = fit.update(history[:, 110:])
+    assert errors.shape == (4, 20)
+
+    for i in range(len(history)):
+        refit = fit_holt_winters(
+            history[i], season_length=52, seasonal=seasonal,
+            alphas=[fit.alpha[i]], betas=[fit.beta[i]], gammas=[fit.gamma[i]],
+        )
+        assert refit.n_obs == fit.n_obs
+        np.testing.assert_allclose(refit.level, fit.level[i:i + 1])
+        np.testing.assert_allclose(refit.trend, fit.trend[i:i + 1])
+        np.testing.assert_allclose(refit.season, fit.season[i:i + 1])
+        np.testing.assert_allclose(refit.sse, fit.sse[i:i + 1])
+        np.testing.assert_array_equal(
+            refit.forecast(12)["predictions"], fit.forecast(12)["predictions"][i:i + 1]
+        )
+
+
+def test_refresh_refits_only_drifted_series():
+    history = _history(n_weeks=110)
+    fit = fit_holt_winters(history[:, :109], season_length=52)
+    new_week = history[:, 109:].copy()
+    new_week[2] *= 10  # level shift in one series
+    history[:, 109:] = new_week
+
+    fit, refit = refresh_holt_winters(fit, history, new_week, refit_every=None)
+
+    np.testing.assert_array_equal(refit, [False, False, True, False])
+    assert (fit.n_updates == [1, 1, 0, 1]).all()
+
+
+def test_residual_std_matches_the_one_step_errors():
+    history = _history(n_weeks=156)
+    fit = fit_holt_winters(history, season_length=52)
+
+    # One one-step-ahead error per week from week m on, the same count fit_mse uses
+    np.testing.assert_allclose(fit.residual_std ** 2, fit.fit_mse)
+    fit.update(history[:, -4:])
+    np.testing.assert_allclose(fit.residual_std ** 2, fit.sse / (fit.n_obs - 52))
@@ -0,0 +1,96 @@
+"""Forecasts precomputed offline are served by the demand forecast tool."""
+
+import asyncio
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from agents.tool_context import ToolContext
+
+import utils.backtest as backtest
+import utils.forecast_store as forecast_store
+import utils.model_cache as model_cache
+from agent_tools.demand_tools import cube_panel, forecast_model_key, run_demand_forecast
+from config.settings import settings
+from utils.context import ForecastingContext
+from utils.data_loader import TrainingDataLoader
+from utils.model_cache import ModelArtifactCache
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "precompute_forecasts.py"
+
+
+def _write_sales(data_dir: Path) -> None:
+    rng = np.random.default_rng(0)
+    days = pd.date_range("2022-01-02", "2024-06-29", freq="D")
+    season = 1 + 0.4 * np.sin(2 * np.pi * days.dayofyear.to_numpy() / 365.25)
+    frames = []
+    for category, level in (("Dresses", 12), ("Shirts", 7)):
+        for store in ("S001", "S002", "S003"):
+            frames.append(pd.DataFrame({
+                "date": days.strftime("%Y-%m-%d"),
+                "store_id": store,
+                "category": category,
+                "quantity_sold": rng.poisson(level * season),
+                "revenue": 0.0,
+            }))
+    pd.concat(frames).to_csv(data_dir / "historical_sales_2022_2024.csv", index=False)
+
+
+@pytest.fixture
+def global_gbm_store(tmp_path, monkeypatch):
+    """Forecast store enabled, global_gbm a candidate, caches in memory only."""
+    monkeypatch.setattr(settings, "ensemble_candidates", "exp_smooth,global_gbm")
+    monkeypatch.setattr(settings, "ensemble_validation", "holdout")
+    monkeypatch.setattr(settings, "forecast_store_path", str(tmp_path / "forecasts.sqlite"))
+    monkeypatch.setattr(settings, "forecast_latency_budget_ms", 0)
+    monkeypatch.setattr(settings, "model_cache_dir", "")
+    monkeypatch.setattr(forecast_store, "_forecast_store", None)
+    monkeypatch.setattr(model_cache, "_model_cache", ModelArtifactCache())
+    monkeypatch.setattr(model_cache, "_lineage_cache", ModelArtifactCache())
+    monkeypatch.setattr(backtest, "_fold_cache", ModelArtifactCache())
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    _write_sales(data_dir)
+    return data_dir
+
+
+def _run_script(*args: str) -> None:
+    spec = importlib.util.spec_from_file_location("precompute_forecasts", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    argv = sys.argv
+    sys.argv = [str(SCRIPT), *args]
+    try:
+        module.main()
+    finally:
+        sys.argv = argv
+
+
+def test_precomputed_row_is_served_with_global_gbm(global_gbm_store):
+    _run_script("--data-dir", str(global_gbm_store), "--categories", "Dresses", "--horizon", "8", "--workers", "1")
+
+    loader = TrainingDataLoader(str(global_gbm_store))
+    weekly_sales = loader.get_weekly_sales("Dresses")
+    panel = cube_panel(loader)
+    assert panel is not None
+    # The key depends on the panel, so it must be the serving path's panel
+    assert forecast_model_key(weekly_sales, "Dresses", None, panel) != forecast_model_key(weekly_sales, "Dresses")
+    stored = forecast_store.get_forecast_store().get(
+        "Dresses", None, 8, forecast_model_key(weekly_sales, "Dresses", None, panel)
+    )
+    assert stored is not None
+
+    context = ForecastingContext(data_loader=loader, session_id="test")
+    arguments = json.dumps({"category": "Dresses", "forecast_horizon_weeks": 8})
+    tool_context = ToolContext(
+        context=context, tool_name=run_demand_forecast.name, tool_call_id="call-1", tool_arguments=arguments
+    )
+    result = asyncio.run(run_demand_forecast.on_invoke_tool(tool_context, arguments))
+
+    assert result.error is None
+    assert result.model_used == f"precomputed:{stored['model_used']}"
+    assert result.forecast_by_week == stored["forecast_by_week"]
@@ -0,0 +1,57 @@
+"""Bootstrapped demand distributions."""
+
+import numpy as np
+
+from utils.probabilistic_forecast import bootstrap_forecast, quantile_label, seasonal_error_matrix
+
+QUANTILES = (0.05, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95)
+
+
+def _distribution(n_samples: int = 500):
+    rng = np.random.default_rng(3)
+    weeks = np.arange(156)
+    history = rng.poisson(
+        rng.uniform(10, 60, (5, 1)) * (1 + 0.4 * np.sin(2 * np.pi * weeks / 52))
+    ).astype(float)
+    errors, counts = seasonal_error_matrix(history)
+    point = history[:, -52:-40] * 1.05
+    return point, bootstrap_forecast(point, errors, counts, n_samples=n_samples, seed=7)
+
+
+def test_quantiles_are_monotone():
+    _, dist = _distribution()
+    for quantiles in (dist.quantiles(QUANTILES), dist.cumulative_quantiles(QUANTILES)):
+        assert (np.diff(quantiles, axis=0) >= 0).all()
+    assert (np.diff(dist.total_quantiles(QUANTILES), axis=0) >= 0).all()
+    # Demand to date never falls from one week to the next
+    assert (np.diff(dist.cumulative_quantiles(QUANTILES), axis=2) >= 0).all()
+
+    summary = dist.summary(series=0, qs=QUANTILES)
+    weekly = np.array([summary["weekly"][quantile_label(q)] for q in QUANTILES])
+    totals = [summary["season_total"][quantile_label(q)] for q in QUANTILES]
+    assert (np.diff(weekly, axis=0) >= 0).all()
+    assert totals == sorted(totals)
+
+
+def test_paths_are_non_negative_and_centered_on_the_point_forecast():
+    point, dist = _distribution(n_samples=2000)
+    assert dist.paths.shape == (2000, 5, 12)
+    assert (dist.series_paths >= 0).all()
+
+    lower, median, upper = dist.quantiles((0.1, 0.5, 0.9))
+    assert ((lower <= point) & (point <= upper)).mean() > 0.9
+    np.testing.assert_allclose(median.sum(axis=1), point.sum(axis=1), rtol=0.1)
+
+
+def test_total_cdf_is_increasing_in_stock():
+    _, dist = _distribution()
+    totals = dist.total_quantiles((0.5,))[0]
+    cdf = [dist.total_cdf(totals * f) for f in (0.5, 1.0, 1.5)]
+    assert (cdf[0] <= cdf[1]).all() and (cdf[1] <= cdf[2]).all()
+    np.testing.assert_allclose(cdf[1], 0.5, atol=0.05)
+
+
+def test_same_seed_same_paths():
+    _, first = _distribution()
+    _, second = _distribution()
+    np.testing.assert_array_equal(first.series_paths, second.series_paths)
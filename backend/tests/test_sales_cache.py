@@ -0,0 +1,88 @@
+"""Cache invalidation: fingerprints follow the source file."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.model_cache import history_fingerprint
+from utils.sales_cache import ColumnarSalesCache, file_fingerprint
+from utils.sales_tensor import DailySalesTensor
+
+HEADER = "date,store_id,category,quantity_sold,revenue\n"
+
+
+def _write_sales(path, rows, mtime_ns=None):
+    with open(path, "w") as f:
+        f.write(HEADER)
+        for day, store, category, quantity in rows:
+            f.write(f"{day},{store},{category},{quantity},{quantity * 10.0}\n")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_fingerprint_changes_when_the_file_is_rewritten(tmp_path):
+    path = tmp_path / "sales.csv"
+    _write_sales(path, [("2024-01-01", "S001", "Dresses", 5)], mtime_ns=1_000_000_000)
+    before = file_fingerprint(path)
+    before_content = file_fingerprint(path, content_hash=True)
+
+    # Same size, different contents and mtime
+    _write_sales(path, [("2024-01-01", "S001", "Dresses", 7)], mtime_ns=2_000_000_000)
+    assert file_fingerprint(path) != before
+    assert file_fingerprint(path, content_hash=True) != before_content
+
+    # Rewriting identical contents only changes the stat-based fingerprint
+    rewritten_content = file_fingerprint(path, content_hash=True)
+    _write_sales(path, [("2024-01-01", "S001", "Dresses", 7)], mtime_ns=3_000_000_000)
+    assert file_fingerprint(path, content_hash=True) == rewritten_content
+
+
+def test_columnar_cache_rebuilds_for_a_rewritten_file(tmp_path):
+    path = tmp_path / "sales.csv"
+    _write_sales(path, [("2024-01-01", "S001", "Dresses", 5), ("2024-01-02", "S002", "Dresses", 3)],
+                 mtime_ns=1_000_000_000)
+    cache = ColumnarSalesCache(path)
+    first = cache.ensure()
+    assert cache.category_daily_totals("Dresses")[1].tolist() == [5, 3]
+
+    _write_sales(path, [("2024-01-01", "S001", "Dresses", 9), ("2024-01-01", "S001", "Shirts", 4)],
+                 mtime_ns=2_000_000_000)
+    second = cache.ensure()
+
+    assert second != first
+    assert cache.get_categories() == ["Dresses", "Shirts"]
+    assert cache.category_daily_totals("Dresses")[1].tolist() == [9]
+    assert [p.name for p in cache.cache_root.iterdir()] == [second]
+
+
+def test_history_fingerprint_follows_the_training_history():
+    history = pd.DataFrame({
+        "date": pd.date_range("2024-01-07", periods=4, freq="W"),
+        "quantity_sold": np.array([10, 12, 9, 14]),
+    })
+    fingerprint = history_fingerprint(history)
+    assert history_fingerprint(history.copy()) == fingerprint
+
+    changed = history.copy()
+    changed.loc[3, "quantity_sold"] = 15
+    assert history_fingerprint(changed) != fingerprint
+    assert history_fingerprint(history.iloc[:3]) != fingerprint
+
+
+def test_tensor_and_columnar_daily_totals_agree(tmp_path):
+    # A zero-quantity day (Jan 2) and a day without rows (Jan 3)
+    path = tmp_path / "sales.csv"
+    _write_sales(path, [
+        ("2024-01-01", "S001", "Dresses", 5),
+        ("2024-01-02", "S001", "Dresses", 0),
+        ("2024-01-04", "S002", "Dresses", 2),
+        ("2024-01-04", "S001", "Shirts", 1),
+    ])
+
+    columnar = ColumnarSalesCache(path).category_daily_totals("Dresses")
+    tensor = DailySalesTensor(path).category_daily_totals("Dresses")
+
+    np.testing.assert_array_equal(tensor[0], columnar[0])
+    np.testing.assert_array_equal(tensor[1], columnar[1])
+    assert tensor[0].astype(str).tolist() == ["2024-01-01", "2024-01-02", "2024-01-04"]
@@ -0,0 +1,255 @@
+"""
+In-Season Actuals Log
+
+Append-only store for weekly actuals uploaded during the season, layered
+over the base historical sales file so reforecasts train on fresh data
+without rewriting or re-reading the full history.
+
+By default the log lives in memory, so it is scoped to the loader that
+owns it (one per Streamlit session) and never leaks into other sessions
+or later runs. Persisting it is opt-in (settings.sales_actuals_dir): each
+append then writes one small JSON segment, so ingesting a week costs
+O(rows in the week), and the log is tied to the source file's
+fingerprint: uploading a new historical file starts a fresh log.
+
+Re-appending the same (category, date, store) replaces the earlier value,
+so re-uploading a corrected week never double-counts.
+
+Only weeks that continue the history without a gap are merged into the
+training series (continuing_rows()); a week after a gap is held until the
+weeks in between arrive, rather than the gap being read as zero sales.
+A category's run may also be anchored to its season's first week: the
+weeks between the history's end and the season start are then unobserved
+(history_gaps()) and left out of the training series, not zero-filled.
+
+Persisted layout:
+    <sales_actuals_dir>/<csv stem>/<fingerprint>/
+        000001.json   # {"category": ..., "rows": [[date, store_id, qty], ...],
+                      #  "season_start": 'YYYY-MM-DD' (optional)}
+        000002.json
+"""
+
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .sales_cache import EPOCH
+from .weekly_cube import days_to_week_index
+
+logger = logging.getLogger("actuals_log")
+
+# (category, date 'YYYY-MM-DD', store_id)
+ActualsKey = Tuple[str, str, str]
+
+
+def _week_index(day: str) -> int:
+    return int(days_to_week_index((np.datetime64(day, "D") - EPOCH).astype(np.int64)))
+
+
+def continuing_rows(
+    rows: List[Tuple[str, str, str, int]],
+    history_end: Optional[str],
+    season_starts: Optional[Dict[str, str]] = None,
+) -> List[Tuple[str, str, str, int]]:
+    """
+    Actuals rows whose weeks continue the history without a gap.
+
+    Weeks are the cube's ISO weeks. Per category, a row is kept when every
+    week from the run's anchor up to its own week has actuals; weeks after
+    a gap are dropped (held in the log until the gap is filled). The anchor
+    is the history's last week, or, when the category's season starts after
+    the week following it, the week before the season's first week (rows
+    before the season start are then held). Without a history, a category's
+    run starts at its first actuals week.
+
+    Args:
+        rows: (category, date 'YYYY-MM-DD', store_id, quantity) rows
+        history_end: Last date of the historical file ('YYYY-MM-DD'), or None/'' if empty
+        season_starts: Category -> first day of its season's first week ('YYYY-MM-DD')
+    """
+    if not rows:
+        return []
+    days = (np.array([r[1] for r in rows], dtype="datetime64[D]") - EPOCH).astype(np.int64)
+    weeks = days_to_week_index(days)
+    end_week = _week_index(history_end) if history_end else None
+
+    first_week: Dict[str, int] = {}
+    last_week: Dict[str, int] = {}
+    for category in {r[0] for r in rows}:
+        category_weeks = sorted({int(w) for r, w in zip(rows, weeks) if r[0] == category})
+        last = end_week if end_week is not None else category_weeks[0] - 1
+        season_start = (season_starts or {}).get(category)
+        if season_start and end_week is not None and _week_index(season_start) > end_week + 1:
+            last = _week_index(season_start) - 1
+        first_week[category] = last + 1
+        for week in category_weeks:
+            if week <= last:
+                continue
+            if week > last + 1:
+                break
+            last = week
+        last_week[category] = last
+    return [
+        r for r, w in zip(rows, weeks)
+        if (end_week is not None and w <= end_week) or first_week[r[0]] <= w <= last_week[r[0]]
+    ]
+
+
+def history_gaps(
+    rows: List[Tuple[str, str, str, int]],
+    history_end: Optional[str],
+) -> Dict[str, Tuple[int, int]]:
+    """
+    Unobserved weeks between the history and each category's merged actuals.
+
+    Args:
+        rows: Merged actuals rows (see continuing_rows())
+        history_end: Last date of the historical file ('YYYY-MM-DD'), or None/'' if empty
+
+    Returns:
+        Category -> (first, last) absolute week number of the gap, for
+        categories whose actuals start more than one week after the history
+    """
+    if not rows or not history_end:
+        return {}
+    end_week = _week_index(history_end)
+    days = (np.array([r[1] for r in rows], dtype="datetime64[D]") - EPOCH).astype(np.int64)
+    weeks = days_to_week_index(days)
+    gaps: Dict[str, Tuple[int, int]] = {}
+    for category in {r[0] for r in rows}:
+        after = [int(w) for r, w in zip(rows, weeks) if r[0] == category and w > end_week]
+        if after and min(after) > end_week + 1:
+            gaps[category] = (end_week + 1, min(after) - 1)
+    return gaps
+
+
+class ActualsLog:
+    """Append-only log of in-season actuals, in memory or persisted per file fingerprint."""
+
+    def __init__(self, source_path: Path, fingerprint: str, log_root: Optional[Path] = None):
+        """
+        Args:
+            source_path: Historical sales CSV the actuals extend
+            fingerprint: Fingerprint of that file (a persisted log is discarded when it changes)
+            log_root: Directory to persist logs under (<log_root>/<source stem>/<fingerprint>).
+                      None keeps the log in memory only.
+        """
+        self.fingerprint = fingerprint
+        self.log_root = Path(log_root) / Path(source_path).stem if log_root is not None else None
+        self.log_dir = self.log_root / fingerprint if self.log_root is not None else None
+        self._rows: Dict[ActualsKey, int] = {}
+        self._season_starts: Dict[str, str] = {}
+        self._next_segment = 1
+        self._load()
+
+    @property
+    def persistent(self) -> bool:
+        return self.log_dir is not None
+
+    def _load(self) -> None:
+        if self.log_dir is None or not self.log_dir.exists():
+            return
+        segments = sorted(p for p in self.log_dir.glob("*.json"))
+        for segment in segments:
+            with open(segment, "r") as f:
+                payload = json.load(f)
+            for date, store_id, quantity in payload["rows"]:
+                self._rows[(payload["category"], date, store_id)] = int(quantity)
+            if payload.get("season_start"):
+                self._season_starts[payload["category"]] = payload["season_start"]
+        if segments:
+            self._next_segment = int(segments[-1].stem) + 1
+
+    def append(
+        self,
+        category: str,
+        rows: Iterable[Tuple[str, str, int]],
+        season_start: Optional[str] = None,
+    ) -> Dict[ActualsKey, int]:
+        """
+        Append actuals for one category.
+
+        Args:
+            category: Product category
+            rows: (date 'YYYY-MM-DD', store_id, quantity_sold) tuples
+            season_start: First day of the category's season ('YYYY-MM-DD'); anchors
+                          its actuals run (see continuing_rows()). Kept until replaced.
+
+        Returns:
+            Dict of key -> change in units versus what the log held before
+            (the full quantity for new keys, the difference for replaced ones).
+            Rows identical to what is already logged are not rewritten.
+        """
+        latest: Dict[ActualsKey, int] = {}
+        for date, store_id, quantity in rows:
+            latest[(category, str(date), str(store_id))] = int(quantity)
+        rows = [
+            (date, store_id, quantity)
+            for (_, date, store_id), quantity in latest.items()
+            if self._rows.get((category, date, store_id)) != quantity
+        ]
+        new_season_start = season_start if season_start and season_start != self._season_starts.get(category) else None
+        if not rows and new_season_start is None:
+            return {}
+
+        if self.log_dir is not None:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            segment = self.log_dir / f"{self._next_segment:06d}.json"
+            tmp_path = segment.with_name(f"{segment.name}.tmp-{os.getpid()}")
+            payload: Dict = {"category": category, "rows": rows}
+            if new_season_start is not None:
+                payload["season_start"] = new_season_start
+            with open(tmp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, segment)
+            self._next_segment += 1
+        if new_season_start is not None:
+            self._season_starts[category] = new_season_start
+
+        deltas: Dict[ActualsKey, int] = {}
+        for date, store_id, quantity in rows:
+            key = (category, date, store_id)
+            deltas[key] = quantity - self._rows.get(key, 0)
+            self._rows[key] = quantity
+
+        if rows:
+            logger.info(f"Appended {len(rows)} actuals rows for {category}")
+        return deltas
+
+    def rows(self, category: Optional[str] = None) -> List[Tuple[str, str, str, int]]:
+        """All logged rows as (category, date, store_id, quantity), optionally for one category."""
+        return [
+            (c, d, s, q) for (c, d, s), q in self._rows.items()
+            if category is None or c == category
+        ]
+
+    def season_starts(self) -> Dict[str, str]:
+        """Category -> season start recorded with its actuals."""
+        return dict(self._season_starts)
+
+    def categories(self) -> List[str]:
+        return sorted({c for c, _, _ in self._rows})
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def clear(self) -> None:
+        """Drop every logged row (and the persisted segments, if any)."""
+        self._rows = {}
+        self._season_starts = {}
+        self._next_segment = 1
+        if self.log_dir is not None:
+            shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def remove_stale_versions(self) -> None:
+        """Delete persisted logs recorded against older copies of the source file."""
+        if self.log_root is None or not self.log_root.exists():
+            return
+        for child in self.log_root.iterdir():
+            if child.name != self.fingerprint:
+                shutil.rmtree(child, ignore_errors=True)
@@ -0,0 +1,216 @@
+"""
+Rolling-Origin Backtesting
+
+Evaluates forecasting candidates over several rolling origins in parallel
+and summarizes their MAE/MAPE for ensemble weighting.
+
+Origins sit on a fixed grid (every `step` weeks from `min_train_weeks`),
+and the most recent `n_folds` origins that leave a full horizon of actuals
+are used. Because the grid is anchored to the start of the history, a new
+week of actuals usually leaves most folds unchanged; each fold result is
+cached under the fingerprint of the data it saw (training prefix + actual
+window), so only new folds are fitted on a weekly refit.
+
+Folds run on a thread pool by default (Prophet fits run in a CmdStan
+subprocess and NumPy releases the GIL), or on a process pool.
+
+Usage:
+    result = run_backtest(history, {"prophet": ProphetWrapper, "exp_smooth": ExponentialSmoothingWrapper})
+    result.mae        # {"prophet": 512.3, "exp_smooth": 640.1}
+    result.mape       # {"prophet": 0.061, ...}
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .model_cache import ModelArtifactCache, history_fingerprint, model_cache_key, model_cache_dir
+
+logger = logging.getLogger("backtest")
+
+BACKTEST_CACHE_SUBDIR = "backtest"
+
+
+@dataclass(frozen=True)
+class BacktestConfig:
+    """Rolling-origin layout."""
+
+    n_folds: int = 3                # most recent origins evaluated
+    horizon: int = 12               # weeks forecast from each origin
+    step: int = 4                   # weeks between origins
+    min_train_weeks: int = 26       # first possible origin
+
+
+@dataclass
+class FoldResult:
+    """Accuracy of one candidate from one origin."""
+
+    model: str
+    train_weeks: int
+    mae: float
+    mape: float
+    fit_seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class BacktestResult:
+    """Per-candidate accuracy averaged over folds."""
+
+    folds: List[FoldResult] = field(default_factory=list)
+    cached_folds: int = 0
+
+    def _mean(self, metric: str) -> Dict[str, float]:
+        summary = {}
+        for model in dict.fromkeys(f.model for f in self.folds):
+            values = [getattr(f, metric) for f in self.folds if f.model == model]
+            # A candidate that failed on any fold is not trusted
+            summary[model] = float(np.mean(values)) if all(np.isfinite(values)) else np.inf
+        return summary
+
+    @property
+    def mae(self) -> Dict[str, float]:
+        return self._mean("mae")
+
+    @property
+    def mape(self) -> Dict[str, float]:
+        return self._mean("mape")
+
+
+def rolling_origins(n_weeks: int, config: BacktestConfig) -> List[int]:
+    """
+    Training lengths (origins) for a history of n_weeks.
+
+    Returns:
+        Up to config.n_folds origins, oldest first (empty if the history is
+        too short for a single fold)
+    """
+    last = n_weeks - config.horizon
+    origins = list(range(config.min_train_weeks, last + 1, config.step))
+    return origins[-config.n_folds:]
+
+
+def _evaluate_fold(
+    name: str,
+    model_factory: Callable,
+    history: pd.DataFrame,
+    train_weeks: int,
+    horizon: int,
+    init_params: Optional[Dict] = None,
+) -> FoldResult:
+    """Fit one candidate on history[:train_weeks] and score the next horizon weeks."""
+    train_data = history.iloc[:train_weeks]
+    actual = history["quantity_sold"].values[train_weeks:train_weeks + horizon].astype(float)
+    try:
+        model = model_factory()
+        start = time.perf_counter()
+        if init_params:
+            model.train(train_data, init_params=init_params)
+        else:
+            model.train(train_data)
+        fit_seconds = time.perf_counter() - start
+        predictions = np.array(model.forecast(len(actual))["predictions"], dtype=float)[:len(actual)]
+
+        errors = np.abs(actual - predictions)
+        nonzero = actual > 0
+        mape = float(np.mean(errors[nonzero] / actual[nonzero])) if nonzero.any() else np.inf
+        return FoldResult(name, train_weeks, float(errors.mean()), mape, fit_seconds)
+    except Exception as e:
+        return FoldResult(name, train_weeks, np.inf, np.inf, error=str(e))
+
+
+# Shared fold cache (results are tiny, so it holds far more entries than the model cache)
+_fold_cache: Optional[ModelArtifactCache] = None
+
+
+def get_fold_cache() -> ModelArtifactCache:
+    """Get or create the global backtest fold cache (inside the model cache dir)."""
+    global _fold_cache
+    if _fold_cache is None:
+        model_dir = model_cache_dir()
+        cache_dir = model_dir / BACKTEST_CACHE_SUBDIR if model_dir is not None else None
+        _fold_cache = ModelArtifactCache(cache_dir=cache_dir, max_entries=1024, max_disk_entries=4096)
+    return _fold_cache
+
+
+def run_backtest(
+    history: pd.DataFrame,
+    candidates: Dict[str, Callable],
+    config: BacktestConfig = BacktestConfig(),
+    model_configs: Optional[Dict[str, Dict]] = None,
+    executor: str = "thread",
+    max_workers: Optional[int] = None,
+    cache: Optional[ModelArtifactCache] = None,
+    init_params: Optional[Dict[str, Dict]] = None,
+) -> BacktestResult:
+    """
+    Backtest candidates over rolling origins in parallel.
+
+    Args:
+        history: Weekly sales with 'date' and 'quantity_sold' columns
+        candidates: Candidate name -> zero-argument factory (e.g. a wrapper class)
+                    returning an object with train(df) and forecast(periods)
+        config: Origin layout
+        model_configs: Optional candidate name -> config dict (part of the fold cache key)
+        executor: "thread" or "process"
+        max_workers: Pool size (default: one per fold job, capped at CPU count)
+        cache: Fold result cache (default: get_fold_cache())
+        init_params: Optional candidate name -> warm start passed to its
+                     train(init_params=...) (e.g. a previous Prophet fit). Only
+                     seeds the optimizer, so it is not part of the fold cache key.
+
+    Returns:
+        BacktestResult (no folds if the history is too short)
+    """
+    cache = cache if cache is not None else get_fold_cache()
+    model_configs = model_configs or {}
+    origins = rolling_origins(len(history), config)
+
+    result = BacktestResult()
+    pending = []
+    for train_weeks in origins:
+        window_fp = history_fingerprint(history.iloc[:train_weeks + config.horizon])
+        for name in candidates:
+            key = model_cache_key(
+                name,
+                window_fp,
+                {"model": model_configs.get(name), "train_weeks": train_weeks, "horizon": config.horizon},
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                result.folds.append(FoldResult(**cached))
+                result.cached_folds += 1
+            else:
+                pending.append((key, name, train_weeks))
+
+    if pending:
+        workers = max_workers or min(len(pending), os.cpu_count() or 1)
+        pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        with pool_class(max_workers=workers) as pool:
+            futures = [
+                (key, pool.submit(
+                    _evaluate_fold, name, candidates[name], history, train_weeks, config.horizon,
+                    (init_params or {}).get(name),
+                ))
+                for key, name, train_weeks in pending
+            ]
+            for key, future in futures:
+                fold = future.result()
+                result.folds.append(fold)
+                if fold.error is None:
+                    cache.put(key, asdict(fold))
+                else:
+                    logger.warning(f"  {fold.model} fold @{fold.train_weeks} failed: {fold.error}")
+
+    result.folds.sort(key=lambda f: (f.model, f.train_weeks))
+    logger.info(
+        f"Backtest: {len(origins)} origins × {len(candidates)} candidates "
+        f"({result.cached_folds} cached, {len(pending)} fitted)"
+    )
+    return result
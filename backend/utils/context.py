@@ -25,6 +25,7 @@ from dataclasses import dataclass, field
 from datetime import date
 from typing import List, Optional, Any, Dict
 from .data_loader import TrainingDataLoader
+from .weekly_cube import season_week_end
 
 
 @dataclass
@@ -65,6 +66,7 @@ class ForecastingContext:
     session_id: str
 
     # Season configuration
+    category: Optional[str] = None  # Category being planned (for store-level history lookups)
     season_start_date: Optional[date] = None  # For aligning forecast to calendar seasonality
 
     # Workflow state
@@ -118,16 +120,41 @@ class ForecastingContext:
             return 0.0
         return self.total_sold / self.total_allocated
 
-    def add_actual_sales_to_history(self) -> None:
+    def add_actual_sales_to_history(self) -> int:
         """
         Add current actual sales to historical data for re-forecasting.
 
         This enriches the training data with recent actuals before
-        generating a new forecast.
+        generating a new forecast. Every week of store-level actuals is
+        appended to the data loader's history; weeks that were already
+        ingested unchanged are skipped, so calling this repeatedly is cheap.
+
+        Returns:
+            Number of store-week rows merged into the history (0 if the category
+            or season start date is unknown, or no store sales were recorded).
+            Rows held back behind a missing week are logged by the data loader.
         """
-        # This would update the data_loader's cached data
-        # Implementation depends on how we want to handle in-memory updates
-        pass
+        weeks = max((len(sales) for sales in self.store_actual_sales.values()), default=0)
+        ingested = 0
+        for week in range(1, weeks + 1):
+            week_sales = {
+                store_id: sales[week - 1]
+                for store_id, sales in self.store_actual_sales.items()
+                if len(sales) >= week
+            }
+            ingested += self._ingest_week_actuals(week, week_sales)
+        return ingested
+
+    def _ingest_week_actuals(self, week: int, store_sales: Dict[str, int]) -> int:
+        """Append one season week of store sales to the loader's history."""
+        if not self.category or self.season_start_date is None or not store_sales:
+            return 0
+        return self.data_loader.append_weekly_actuals(
+            self.category,
+            season_week_end(self.season_start_date, week).isoformat(),
+            store_sales,
+            season_start_date=self.season_start_date.isoformat(),
+        )
 
     def update_forecast(self, new_forecast: List[int]) -> None:
         """Update the stored forecast with new values."""
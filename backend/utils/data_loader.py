@@ -6,24 +6,58 @@ Ported from backend-agent-as-tool with minimal changes.
 """
 
 import csv
+import logging
 from pathlib import Path
-from typing import List, Dict, Optional
-from collections import defaultdict
+from typing import Iterator, List, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from .actuals_log import ActualsKey, ActualsLog, continuing_rows, history_gaps
+from .sales_cache import ColumnarSalesCache, file_fingerprint
+from .sales_manifest import SalesManifest, load_or_build_manifest
+from .sales_stream import EPOCH, STREAM_CHUNK_ROWS, SalesVocabulary, stream_sales
+from .sales_tensor import DailySalesTensor
+from .store_features import StoreFeatureMatrix, build_store_features, weights_key
+from .global_forecaster import SeriesPanel, build_cube_panel
+from .weekly_cube import WeeklySalesCube, load_or_build_weekly_cube, season_week_end
+
+logger = logging.getLogger("data_loader")
 
 class TrainingDataLoader:
     """Loads and analyzes training data for agent context."""
 
-    def __init__(self, data_dir: Optional[str] = None):
+    STORAGE_MODES = ("columnar", "mmap")
+
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        storage_mode: Optional[str] = None,
+        actuals_dir: Optional[str] = None,
+    ):
         """
         Initialize the data loader.
 
         Args:
             data_dir: Path to training data directory. If None, uses default
                      location relative to project root: data/training/
+            storage_mode: "columnar" (category-partitioned .npy cache) or "mmap"
+                     (memory-mapped store × category × day tensor for very large
+                     histories). Defaults to settings.sales_storage_mode.
+            actuals_dir: Directory to persist in-season actuals under. Defaults to
+                     settings.sales_actuals_dir; empty keeps them in memory, scoped
+                     to this loader (one Streamlit session).
         """
+        if storage_mode is None or actuals_dir is None:
+            from config.settings import settings
+            storage_mode = storage_mode or settings.sales_storage_mode
+            actuals_dir = settings.sales_actuals_dir if actuals_dir is None else actuals_dir
+        if storage_mode not in self.STORAGE_MODES:
+            raise ValueError(
+                f"Unknown storage_mode '{storage_mode}'. Expected one of {self.STORAGE_MODES}"
+            )
+        self.storage_mode = storage_mode
+        self.actuals_dir = Path(actuals_dir) if actuals_dir else None
+
         if data_dir is None:
             # Default to data/training directory relative to project root
             backend_dir = Path(__file__).parent.parent
@@ -36,65 +70,84 @@ class TrainingDataLoader:
         self.store_attributes_path = self.data_dir / "store_attributes.csv"
 
         # Cache loaded data
-        self._categories: Optional[List[str]] = None
-        self._stores: Optional[List[str]] = None
-        self._date_range: Optional[Dict[str, str]] = None
         self._store_attributes: Optional[Dict] = None
+        self._store_attributes_df: Optional[pd.DataFrame] = None
+        self._store_attributes_version: Optional[str] = None
+        self._store_features: Dict[tuple, StoreFeatureMatrix] = {}
+        self._sales_cache: Optional[ColumnarSalesCache] = None
+        self._sales_tensor: Optional[DailySalesTensor] = None
+        self._actuals_log: Optional[ActualsLog] = None
+        self._history_manifest: Optional[SalesManifest] = None
+        self._manifest: Optional[SalesManifest] = None
+        self._weekly_cube: Optional[WeeklySalesCube] = None
+        self._cube_actuals: Dict[ActualsKey, int] = {}
+        self._cube_version = 0      # bumped whenever the in-memory cube changes
+        self._cube_panel: Optional[SeriesPanel] = None
+        self._cube_panel_version: Optional[tuple] = None
+        self._weekly_cube_fingerprint: Optional[str] = None
 
     def clear_cache(self):
         """Clear all cached data to force reload from files."""
-        self._categories = None
-        self._stores = None
-        self._date_range = None
         self._store_attributes = None
+        self._store_attributes_df = None
+        self._store_attributes_version = None
+        self._store_features = {}
+        self._history_manifest = None
+        self._manifest = None
+        self._weekly_cube = None
+        self._cube_actuals = {}
+        self._cube_panel = None
+        # In-memory actuals belong to the session (actuals_log drops them when
+        # the sales file changes); persisted ones are reloaded from disk
+        if self._actuals_log is not None and self._actuals_log.persistent:
+            self._actuals_log = None
+        if self._sales_cache is not None:
+            self._sales_cache.invalidate()
+        if self._sales_tensor is not None:
+            self._sales_tensor.invalidate()
 
     def update_data_paths(self, sales_path: Optional[str] = None, stores_path: Optional[str] = None):
         """Update data file paths and clear cache."""
         if sales_path:
             self.historical_sales_path = Path(sales_path)
+            self._sales_cache = None
+            self._sales_tensor = None
         if stores_path:
             self.store_attributes_path = Path(stores_path)
         self.clear_cache()
 
+    def get_manifest(self) -> SalesManifest:
+        """
+        Metadata manifest for the historical sales file.
+
+        Built with a single streaming pass and saved next to the data file;
+        rebuilt automatically when the file's fingerprint changes. Categories,
+        stores and dates from in-season actuals merged into the history
+        (see merged_actuals()) are included.
+        """
+        fingerprint = file_fingerprint(self.historical_sales_path)
+        if self._manifest is None or self._manifest.fingerprint != fingerprint:
+            self._manifest = self._get_history_manifest().with_actuals(self.merged_actuals())
+        return self._manifest
+
+    def _get_history_manifest(self) -> SalesManifest:
+        """Manifest of the historical file alone (no actuals)."""
+        fingerprint = file_fingerprint(self.historical_sales_path)
+        if self._history_manifest is None or self._history_manifest.fingerprint != fingerprint:
+            self._history_manifest = load_or_build_manifest(self.historical_sales_path)
+        return self._history_manifest
+
     def get_categories(self) -> List[str]:
         """Get unique product categories from historical sales data."""
-        if self._categories is None:
-            categories = set()
-            with open(self.historical_sales_path, "r") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    categories.add(row["category"])
-            self._categories = sorted(list(categories))
-        return self._categories
+        return self.get_manifest().categories
 
     def get_stores(self) -> List[str]:
         """Get unique store IDs."""
-        if self._stores is None:
-            stores = set()
-            with open(self.historical_sales_path, "r") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    stores.add(row["store_id"])
-            self._stores = sorted(list(stores))
-        return self._stores
+        return self.get_manifest().stores
 
     def get_date_range(self) -> Dict[str, str]:
         """Get the date range of historical data."""
-        if self._date_range is None:
-            dates = []
-            with open(self.historical_sales_path, "r") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    dates.append(row["date"])
-
-            dates.sort()
-            self._date_range = {
-                "start": dates[0],
-                "end": dates[-1],
-                "start_year": dates[0][:4],
-                "end_year": dates[-1][:4],
-            }
-        return self._date_range
+        return self.get_manifest().date_range
 
     def get_store_count(self) -> int:
         """Get total number of stores."""
@@ -113,14 +166,35 @@ class TrainingDataLoader:
             - fashion_tier: Fashion positioning (Premium/Mainstream/Value)
             - store_format: Store format (Mall/Standalone/ShoppingCenter/Outlet)
             - region: Geographic region (Northeast/Southeast/Midwest/West)
+
+        Parsed once per version of the attributes file (store_id read as a
+        string, so IDs like "007" keep their leading zeros). Each call returns
+        a shallow copy of the cached frame: adding, dropping or reassigning
+        columns is safe, but values must not be modified in place, since the
+        underlying data is shared with every other caller (copy() first).
         """
+        version = self._get_store_attributes_version()
+        if self._store_attributes_df is None or self._store_attributes_version != version:
+            self._store_attributes_df = self._read_store_attributes()
+            self._store_attributes_version = version
+            self._store_features = {}
+        return self._store_attributes_df.copy(deep=False)
+
+    def _get_store_attributes_version(self) -> str:
+        """Fingerprint of the store attributes file ("mock" when it doesn't exist)."""
+        if not self.store_attributes_path.exists():
+            return "mock"
+        return file_fingerprint(self.store_attributes_path)
+
+    def _read_store_attributes(self) -> pd.DataFrame:
+        """Parse the store attributes file (or generate mock stores if it's missing)."""
         # Check if store_attributes.csv exists
         if not self.store_attributes_path.exists():
             # Generate mock store data for testing
             return self._generate_mock_store_data()
 
         # Load real store attributes
-        df = pd.read_csv(self.store_attributes_path)
+        df = pd.read_csv(self.store_attributes_path, dtype={"store_id": str})
 
         # Set store_id as index
         if "store_id" in df.columns:
@@ -128,6 +202,27 @@ class TrainingDataLoader:
 
         return df
 
+    def get_store_features(self, feature_weights: Dict[str, float]) -> StoreFeatureMatrix:
+        """
+        Ordinal-encoded, standardized and weighted store feature matrix.
+
+        Cached per store attributes version and feature weights, so the
+        clustering and allocation tools share one encode/scale pass.
+
+        Args:
+            feature_weights: Feature -> weight (e.g. StoreClusterer.DEFAULT_FEATURE_WEIGHTS)
+
+        Returns:
+            StoreFeatureMatrix with rows in get_store_attributes_df() order
+        """
+        stores_df = self.get_store_attributes_df()
+        version = self._store_attributes_version
+        assert version is not None  # set by get_store_attributes_df()
+        key = weights_key(feature_weights)
+        if key not in self._store_features:
+            self._store_features[key] = build_store_features(stores_df, feature_weights, version)
+        return self._store_features[key]
+
     def _generate_mock_store_data(self, n_stores: int = 50) -> pd.DataFrame:
         """
         Generate mock store attributes for testing when real data not available.
@@ -208,10 +303,236 @@ class TrainingDataLoader:
                 }
         return self._store_attributes
 
+    @property
+    def sales_cache(self) -> ColumnarSalesCache:
+        """
+        Columnar, category-partitioned cache of the historical sales file.
+
+        Built on first use and rebuilt automatically when the source file changes.
+        """
+        if self._sales_cache is None:
+            self._sales_cache = ColumnarSalesCache(self.historical_sales_path)
+        return self._sales_cache
+
+    @property
+    def sales_tensor(self) -> DailySalesTensor:
+        """
+        Memory-mapped (store × category × day) sales tensor ("mmap" storage mode).
+
+        Built on first use with a chunked pass and rebuilt when the source file changes.
+        """
+        if self._sales_tensor is None:
+            self._sales_tensor = DailySalesTensor(self.historical_sales_path)
+        return self._sales_tensor
+
+    @property
+    def actuals_log(self) -> ActualsLog:
+        """
+        Append-only log of in-season actuals layered over the historical file.
+
+        Held in memory by this loader unless actuals_dir is set, and scoped to
+        the file's fingerprint: a new historical upload starts a fresh log.
+        """
+        fingerprint = file_fingerprint(self.historical_sales_path)
+        if self._actuals_log is None or self._actuals_log.fingerprint != fingerprint:
+            self._actuals_log = ActualsLog(self.historical_sales_path, fingerprint, self.actuals_dir)
+            self._actuals_log.remove_stale_versions()
+        return self._actuals_log
+
+    def merged_actuals(self, category: Optional[str] = None) -> List[Tuple[str, str, str, int]]:
+        """
+        Logged actuals that continue the history without a gap.
+
+        Only these are merged into the training series. A category's run
+        continues the history's last week or, when its season starts later
+        (season_start_date given to append_weekly_actuals()), starts at the
+        season's first week; the weeks in between are unobserved (see
+        WeeklySalesCube.gap_weeks). A week after a gap inside the run stays
+        in the log and is merged once the weeks in between arrive.
+
+        Returns:
+            (category, date, store_id, quantity) rows, optionally for one category
+        """
+        return continuing_rows(
+            self.actuals_log.rows(category),
+            self._get_history_manifest().max_date,
+            self.actuals_log.season_starts(),
+        )
+
+    def clear_actuals(self) -> None:
+        """Drop all in-season actuals (e.g. when a new planning run starts)."""
+        if self._actuals_log is None and self.actuals_dir is None:
+            return
+        self.actuals_log.clear()
+        self._manifest = None
+        if self._cube_actuals:
+            self._weekly_cube = None    # reloaded from the saved history-only cube
+            self._cube_actuals = {}
+
+    def append_weekly_actuals(
+        self,
+        category: str,
+        week_end_date: str,
+        store_sales: Dict[str, int],
+        season_start_date: Optional[str] = None,
+    ) -> int:
+        """
+        Ingest one week of store-level actuals into the training history.
+
+        The week is written to the actuals log and, once it continues the
+        history without a gap (see merged_actuals()), applied to the in-memory
+        weekly cube, so the cost is O(category rows in the log) and the
+        historical file is never re-read. Re-ingesting a week replaces its
+        earlier values. Rows held back behind a gap are logged, not counted.
+
+        Args:
+            category: Product category name
+            week_end_date: Any day of the sales week ('YYYY-MM-DD'); each store's
+                           weekly units are recorded on the ISO week's Sunday
+            store_sales: Dict mapping store_id -> units sold that week
+            season_start_date: First day of the season ('YYYY-MM-DD'). When the
+                           season starts after the history ends, the category's
+                           actuals are anchored to the season's first week and
+                           the weeks in between are treated as unobserved.
+
+        Returns:
+            Number of the week's store rows that changed and were merged into
+            the training history
+        """
+        day = pd.Timestamp(week_end_date)
+        week_end_date = str((day + pd.Timedelta(days=6 - day.weekday())).date())
+        season_start = None
+        if season_start_date:
+            season_start = season_week_end(pd.Timestamp(season_start_date).date(), 1).isoformat()
+        deltas = self.actuals_log.append(
+            category,
+            [(week_end_date, store_id, units) for store_id, units in store_sales.items()],
+            season_start=season_start,
+        )
+        if not deltas and season_start is None:
+            return 0
+
+        merged_rows = self.merged_actuals(category)
+        merged = {(c, d, s): q for c, d, s, q in merged_rows}
+        if self._weekly_cube is not None:
+            applied = {k: q for k, q in self._cube_actuals.items() if k[0] == category}
+            changes = [
+                (c, d, s, merged.get((c, d, s), 0) - applied.get((c, d, s), 0))
+                for c, d, s in merged.keys() | applied.keys()
+                if merged.get((c, d, s), 0) != applied.get((c, d, s), 0)
+            ]
+            self._weekly_cube.apply_sales(changes)
+            self._set_cube_gap(category, merged_rows)
+            self._cube_version += 1
+            for key in applied.keys() - merged.keys():
+                del self._cube_actuals[key]
+            self._cube_actuals.update(merged)
+        self._manifest = None
+
+        merged_count = sum(1 for key in deltas if key in merged)
+        held_back = len(deltas) - merged_count
+        if held_back:
+            logger.warning(
+                f"Held back {held_back} actuals rows for {category} (week ending {week_end_date}): "
+                f"earlier weeks since the history end ({self._get_history_manifest().max_date}) "
+                f"or the season start are missing"
+            )
+        return merged_count
+
+    def _set_cube_gap(self, category: str, merged_rows: List[Tuple[str, str, str, int]]) -> None:
+        """Record the unobserved weeks between the history and a category's merged actuals."""
+        assert self._weekly_cube is not None
+        gap = history_gaps(merged_rows, self._get_history_manifest().max_date).get(category)
+        if gap is None:
+            self._weekly_cube.gap_weeks.pop(category, None)
+        else:
+            self._weekly_cube.gap_weeks[category] = gap
+
+    def get_daily_sales_view(
+        self,
+        category: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Daily units for one category, all stores, over an inclusive date range.
+
+        Returns:
+            (n_stores, n_days) zero-copy view of the memory-mapped tensor
+            (rows follow get_stores()), or None if the category is unknown
+        """
+        return self.sales_tensor.category_view(category, start_date, end_date)
+
+    def iter_sales_chunks(
+        self,
+        category: Optional[str] = None,
+        store_ids: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        chunk_rows: int = STREAM_CHUNK_ROWS,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream daily rows of the historical file in bounded-memory chunks.
+
+        Filters are applied to NumPy code arrays inside the scan, so rows
+        outside the predicate are never materialized. Works on plain and
+        compressed (.gz, .zst, ...) CSVs; peak memory is one chunk.
+
+        Args:
+            category: Only rows for this category (default: all)
+            store_ids: Only rows for these stores (default: all)
+            start_date: Only rows on or after this date (inclusive)
+            end_date: Only rows on or before this date (inclusive)
+            chunk_rows: Rows parsed per chunk
+
+        Yields:
+            DataFrames with 'date' (datetime64), 'store_id' and 'category'
+            (categoricals over the full store/category lists) and 'quantity_sold'
+        """
+        manifest = self.get_manifest()
+        vocabulary = SalesVocabulary.from_manifest(manifest)
+        for chunk in stream_sales(
+            self.historical_sales_path,
+            vocabulary,
+            categories=[category] if category is not None else None,
+            stores=store_ids,
+            start_date=start_date,
+            end_date=end_date,
+            chunk_rows=chunk_rows,
+        ):
+            yield pd.DataFrame({
+                "date": (EPOCH + chunk.days.astype("timedelta64[D]")).astype("datetime64[ns]"),
+                "store_id": pd.Categorical.from_codes(chunk.store_codes, vocabulary.stores),
+                "category": pd.Categorical.from_codes(chunk.category_codes, vocabulary.categories),
+                "quantity_sold": chunk.quantity,
+            })
+
+    def scan_sales(
+        self,
+        category: Optional[str] = None,
+        store_ids: Optional[List[str]] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Filtered daily rows of the historical file as one DataFrame.
+
+        Only matching rows are kept in memory; see iter_sales_chunks().
+        """
+        chunks = list(self.iter_sales_chunks(category, store_ids, start_date, end_date))
+        if not chunks:
+            return pd.DataFrame(columns=["date", "store_id", "category", "quantity_sold"])
+        return pd.concat(chunks, ignore_index=True)
+
     def get_historical_sales(self, category: str) -> Dict[str, List]:
         """
         Get aggregated historical sales data for a specific category.
 
+        Reads only the category's partition from the columnar cache (or its
+        slice of the memory-mapped tensor in "mmap" mode). Daily history only:
+        in-season actuals are weekly totals and are merged by the weekly cube
+        (get_weekly_cube() / get_weekly_sales()), not here.
+
         Args:
             category: Product category name (e.g., "Women's Dresses")
 
@@ -219,25 +540,77 @@ class TrainingDataLoader:
             Dictionary with 'date' and 'quantity_sold' lists aggregated across all stores
             Format: {'date': ['2022-01-01', ...], 'quantity_sold': [150, ...]}
         """
-        # Aggregate sales by date across all stores
-        date_quantities = defaultdict(int)
-
-        with open(self.historical_sales_path, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                if row["category"] == category:
-                    date = row["date"]
-                    quantity = int(row["quantity_sold"])
-                    date_quantities[date] += quantity
-
-        # Sort by date and convert to lists
-        sorted_dates = sorted(date_quantities.keys())
+        if self.storage_mode == "mmap":
+            dates, quantities = self.sales_tensor.category_daily_totals(category)
+        else:
+            dates, quantities = self.sales_cache.category_daily_totals(category)
 
         return {
-            "date": sorted_dates,
-            "quantity_sold": [date_quantities[date] for date in sorted_dates],
+            "date": np.datetime_as_string(dates, unit="D").tolist(),
+            "quantity_sold": quantities.tolist(),
         }
 
+    def get_weekly_cube(self) -> WeeklySalesCube:
+        """
+        Dense (category × store × week) sales cube.
+
+        Materialized once per data version from the columnar cache (or the
+        memory-mapped tensor in "mmap" mode) and shared by the forecast,
+        variance and reallocation tools. In-season actuals that continue the
+        history (or start its season, see merged_actuals()) are layered on in
+        memory; the saved cube always reflects the historical file only.
+        """
+        if self.storage_mode == "mmap":
+            fingerprint = self.sales_tensor.ensure()
+        else:
+            fingerprint = self.sales_cache.ensure()
+        if self._weekly_cube is None or self._weekly_cube_fingerprint != fingerprint:
+            if self.storage_mode == "mmap":
+                self._weekly_cube = self.sales_tensor.weekly_cube()
+            else:
+                self._weekly_cube = load_or_build_weekly_cube(self.sales_cache)
+            actuals = self.merged_actuals()
+            self._weekly_cube.apply_sales(actuals)
+            self._weekly_cube.gap_weeks = history_gaps(actuals, self._get_history_manifest().max_date)
+            self._cube_actuals = {(c, d, s): q for c, d, s, q in actuals}
+            self._weekly_cube_fingerprint = fingerprint
+            self._cube_version += 1
+        return self._weekly_cube
+
+    def get_cube_panel(self) -> SeriesPanel:
+        """
+        Weekly cube as a panel for the global gradient-boosting model.
+
+        Built once per version of the cube (historical file plus merged
+        actuals) and of the store attributes, and held by this loader, so a
+        session's forecasts only ever train on that session's data.
+        """
+        cube = self.get_weekly_cube()
+        store_attributes = self.get_store_attributes_df()
+        version = (self._weekly_cube_fingerprint, self._cube_version, self._store_attributes_version)
+        if self._cube_panel is None or self._cube_panel_version != version:
+            self._cube_panel = build_cube_panel(cube, store_attributes)
+            self._cube_panel_version = version
+        return self._cube_panel
+
+    def get_weekly_sales(
+        self,
+        category: str,
+        store_ids: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Get weekly sales totals for a category, ready for model training.
+
+        Args:
+            category: Product category name (e.g., "Women's Dresses")
+            store_ids: Optional subset of stores to include (default: all stores)
+
+        Returns:
+            DataFrame with 'date' (week ending Sunday) and 'quantity_sold' columns;
+            empty if the category has no sales
+        """
+        return self.get_weekly_cube().category_frame(category, store_ids)
+
     def get_context_summary(self) -> str:
         """Get a formatted summary of available data for agent context."""
         categories = self.get_categories()
@@ -0,0 +1,178 @@
+"""
+Precomputed Forecast Store
+
+SQLite table of finished demand forecasts (totals, weekly predictions,
+bounds and seasonality), written offline by scripts/precompute_forecasts.py
+and served by run_demand_forecast without training anything.
+
+Rows are keyed by (category, season start date, horizon) and record the
+model cache key the forecast was computed under, which fingerprints the
+category's weekly history, the ensemble configuration and the calendar
+alignment. A row is fresh only while that key still matches: new actuals,
+a new sales upload or a changed ensemble setting make it stale, and the
+request falls back to live training. A maximum age (FORECAST_STORE_MAX_AGE_HOURS)
+expires rows regardless.
+
+The store is opt-in: it is only used when FORECAST_STORE_PATH is set.
+
+Usage:
+    store = get_forecast_store()
+    store.put(category, season_start_date, horizon, model_key, result.model_dump())
+    payload = store.get(category, season_start_date, horizon, model_key)   # None on a miss
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger("forecast_store")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS forecasts (
+    category TEXT NOT NULL,
+    season_start TEXT NOT NULL,
+    horizon INTEGER NOT NULL,
+    model_key TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (category, season_start, horizon)
+)
+"""
+
+
+def _alignment(season_start_date: Optional[date]) -> str:
+    # "" = forecast continues the history (no calendar alignment)
+    return season_start_date.isoformat() if season_start_date else ""
+
+
+class ForecastStore:
+    """Precomputed forecasts in one SQLite file."""
+
+    def __init__(self, path: Path, max_age_hours: float = 0.0):
+        """
+        Args:
+            path: SQLite file (created on first write)
+            max_age_hours: Rows older than this are stale (0 = fingerprint only)
+        """
+        self.path = Path(path)
+        self.max_age_hours = max_age_hours
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute(_SCHEMA)
+        return conn
+
+    def get(
+        self,
+        category: str,
+        season_start_date: Optional[date],
+        horizon: int,
+        model_key: str,
+    ) -> Optional[Dict]:
+        """
+        Fresh precomputed forecast, or None.
+
+        Args:
+            category: Product category
+            season_start_date: Calendar alignment of the forecast
+            horizon: Forecast horizon in weeks
+            model_key: Model cache key of the current history and configuration
+
+        Returns:
+            Stored ForecastToolResult fields, or None if missing or stale
+        """
+        if not self.path.exists():
+            self.misses += 1
+            return None
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT model_key, created_at, payload FROM forecasts "
+                    "WHERE category = ? AND season_start = ? AND horizon = ?",
+                    (category, _alignment(season_start_date), horizon),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Forecast store unreadable ({self.path}): {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        stored_key, created_at, payload = row
+        if stored_key != model_key:
+            logger.info(f"Precomputed forecast for {category} is stale (history or config changed)")
+            self.misses += 1
+            return None
+        if self.max_age_hours and time.time() - created_at > self.max_age_hours * 3600:
+            logger.info(f"Precomputed forecast for {category} expired")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(payload)
+
+    def put(
+        self,
+        category: str,
+        season_start_date: Optional[date],
+        horizon: int,
+        model_key: str,
+        payload: Dict,
+    ) -> None:
+        """Store (or replace) a precomputed forecast."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO forecasts VALUES (?, ?, ?, ?, ?, ?)",
+                (category, _alignment(season_start_date), horizon, model_key, time.time(), json.dumps(payload)),
+            )
+
+    def entries(self) -> List[Dict]:
+        """Summary of every stored row (no payloads)."""
+        if not self.path.exists():
+            return []
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT category, season_start, horizon, model_key, created_at FROM forecasts "
+                "ORDER BY category, season_start, horizon"
+            ).fetchall()
+        return [
+            {"category": c, "season_start": s or None, "horizon": h, "model_key": k, "created_at": t}
+            for c, s, h, k, t in rows
+        ]
+
+    def clear(self) -> None:
+        """Delete every stored forecast."""
+        if self.path.exists():
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM forecasts")
+
+
+# Global store instance
+_forecast_store: Optional[ForecastStore] = None
+
+
+def get_forecast_store() -> Optional[ForecastStore]:
+    """
+    Get the global forecast store (None when FORECAST_STORE_PATH is empty).
+
+    A relative path resolves against the project root, not the working directory.
+    """
+    global _forecast_store
+    if _forecast_store is None:
+        from config.settings import project_path, settings
+        if not settings.forecast_store_path:
+            return None
+        _forecast_store = ForecastStore(
+            project_path(settings.forecast_store_path),
+            max_age_hours=settings.forecast_store_max_age_hours,
+        )
+    return _forecast_store
@@ -0,0 +1,369 @@
+"""
+Global Gradient-Boosting Forecaster
+
+One HistGradientBoostingRegressor trained on every series of the weekly
+cube at once (each store × category series plus the category totals)
+instead of one model per series. Each series is scaled by its own mean,
+so stores of any size and the category totals share one model that learns
+seasonal shape, momentum and store-attribute effects across all of them.
+
+Features (built vectorized over series × weeks):
+    - lags of the scaled series (1, 2, 3, 4, 8, 13, 26, 52 weeks)
+    - rolling means of the scaled series (4, 13, 52 weeks)
+    - calendar: ISO week and month of the target week
+    - static: category (categorical), log series scale and the encoded store
+      attributes (missing for category totals; the model handles NaN)
+
+Forecasts are recursive one-step-ahead: each step predicts every series in
+one batched call and feeds the predictions back as lags.
+
+Fitted models are cached per (panel data, as-of week, config), so the
+validation folds of every category share one fit per origin.
+
+Usage:
+    panel = build_cube_panel(cube, store_attributes)
+    model = get_global_forecaster(panel)
+    result = model.forecast(panel, horizon=12)
+    result["predictions"]          # (n_series, 12)
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import asdict, dataclass, field, replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .model_cache import ModelArtifactCache, get_model_cache, model_cache_key
+from .store_features import STORE_FEATURES, encode_store_features
+from .weekly_cube import WeeklySalesCube
+
+# scikit-learn is imported on first fit (it is slow to import)
+if TYPE_CHECKING:
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
+logger = logging.getLogger("global_forecaster")
+
+
+@dataclass(frozen=True)
+class GlobalForecastConfig:
+    """Feature layout and booster settings."""
+
+    lags: Tuple[int, ...] = (1, 2, 3, 4, 8, 13, 26, 52)
+    windows: Tuple[int, ...] = (4, 13, 52)
+    min_history: int = 8            # first target week of each series
+    max_iter: int = 300
+    learning_rate: float = 0.05
+    max_leaf_nodes: int = 31
+    max_rows: int = 2_000_000       # training rows sampled beyond this
+    random_state: int = 0
+
+
+@dataclass
+class SeriesPanel:
+    """Aligned weekly series with their static attributes."""
+
+    values: np.ndarray              # (n_series, n_weeks) float, NaN outside a series' active weeks
+    week_ends: np.ndarray           # (n_weeks,) datetime64[D] Sunday week-ending dates
+    keys: List[Tuple[str, Optional[str]]]   # (category, store_id); store_id None = category total
+    categories: List[str]
+    category_codes: np.ndarray      # (n_series,) index into categories, -1 = unknown
+    static: np.ndarray              # (n_series, len(STORE_FEATURES)) encoded store attributes
+    _fingerprint: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def n_weeks(self) -> int:
+        return self.values.shape[1]
+
+    def truncate(self, n_weeks: int) -> "SeriesPanel":
+        """Panel of the first n_weeks weeks (the data available at that origin)."""
+        return replace(self, values=self.values[:, :n_weeks], week_ends=self.week_ends[:n_weeks])
+
+    def weeks_through(self, last_week_end) -> int:
+        """Number of panel weeks ending on or before a date."""
+        return int(np.searchsorted(self.week_ends, np.datetime64(pd.Timestamp(last_week_end).date(), "D"), "right"))
+
+    def fingerprint(self) -> str:
+        """Content hash (computed once per panel; truncate() gives a new panel)."""
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for array in (self.values, self.week_ends.astype(np.int64), self.category_codes, self.static):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            digest.update(repr((self.keys, self.categories)).encode())
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+    def find_total(self, history: pd.DataFrame) -> Optional[int]:
+        """Row of the category total matching a weekly sales history, if any."""
+        n = self.weeks_through(history["date"].iloc[-1])
+        quantities = history["quantity_sold"].to_numpy(dtype=float)
+        if n < len(quantities):
+            return None
+        for row, (_, store_id) in enumerate(self.keys):
+            if store_id is None and np.array_equal(self.values[row, n - len(quantities):n], quantities):
+                return row
+        return None
+
+
+def build_cube_panel(cube: WeeklySalesCube, store_attributes: Optional[pd.DataFrame] = None) -> SeriesPanel:
+    """
+    Panel of every store × category series and every category total of a cube.
+
+    Args:
+        cube: Weekly sales cube
+        store_attributes: Store attributes indexed by store_id (optional; store
+                          features are missing without it or when it lacks any
+                          of the STORE_FEATURES columns)
+
+    Returns:
+        SeriesPanel (store series first, category totals last)
+    """
+    n_categories, n_stores, n_weeks = cube.values.shape
+    store_values = cube.values.reshape(n_categories * n_stores, n_weeks).astype(float)
+    values = np.vstack([store_values, cube.values.sum(axis=1).astype(float)])
+
+    # Weeks outside a category's active span are unknown, not zero sales
+    for c, category in enumerate(cube.categories):
+        first, last = cube.active_weeks.get(category, (0, n_weeks - 1))
+        rows = np.r_[c * n_stores:(c + 1) * n_stores, n_categories * n_stores + c]
+        values[rows, :first] = np.nan
+        values[rows, last + 1:] = np.nan
+        if category in cube.gap_weeks:
+            gap_first, gap_last = cube.gap_weeks[category]
+            values[rows, max(gap_first - cube.first_week, 0):max(gap_last - cube.first_week + 1, 0)] = np.nan
+
+    store_static = np.full((n_stores, len(STORE_FEATURES)), np.nan)
+    if store_attributes is not None:
+        missing = [f for f in STORE_FEATURES if f not in store_attributes.columns]
+        if missing:
+            logger.warning(f"Store attributes lack {missing}; global panel built without store features")
+        else:
+            encoded = encode_store_features(store_attributes).reindex([str(s) for s in cube.stores])
+            store_static = encoded.to_numpy(dtype=float)
+
+    keys: List[Tuple[str, Optional[str]]] = [(category, store) for category in cube.categories for store in cube.stores]
+    keys += [(category, None) for category in cube.categories]
+    return SeriesPanel(
+        values=values,
+        week_ends=cube.week_ends.astype("datetime64[D]"),
+        keys=keys,
+        categories=list(cube.categories),
+        category_codes=np.r_[np.repeat(np.arange(n_categories), n_stores), np.arange(n_categories)],
+        static=np.vstack([np.tile(store_static, (n_categories, 1)), np.full((n_categories, len(STORE_FEATURES)), np.nan)]),
+    )
+
+
+def series_panel(history: pd.DataFrame, category: Optional[str] = None) -> SeriesPanel:
+    """Single-series panel from a weekly sales DataFrame (unknown category and store)."""
+    return SeriesPanel(
+        values=history["quantity_sold"].to_numpy(dtype=float)[None, :],
+        week_ends=pd.to_datetime(history["date"]).to_numpy(dtype="datetime64[D]"),
+        keys=[(category or "", None)],
+        categories=[category] if category else [],
+        category_codes=np.array([0 if category else -1]),
+        static=np.full((1, len(STORE_FEATURES)), np.nan),
+    )
+
+
+def _series_scale(values: np.ndarray) -> np.ndarray:
+    """Mean of each series over its known weeks (0 for series without sales)."""
+    known = np.isfinite(values)
+    totals = np.where(known, values, 0.0).sum(axis=1)
+    return np.divide(totals, known.sum(axis=1), out=np.zeros(len(values)), where=known.any(axis=1))
+
+
+class GlobalBoostingForecaster:
+    """One gradient-boosted one-step model shared by every series of a panel."""
+
+    def __init__(self, config: GlobalForecastConfig = GlobalForecastConfig()):
+        self.config = config
+        self.model: Optional["HistGradientBoostingRegressor"] = None
+        self.residual_std = 0.0         # one-step residual std in scaled units
+        self.n_categories = 0
+        self.fit_seconds = 0.0
+        self.n_rows = 0
+
+    @property
+    def _pad(self) -> int:
+        return max(max(self.config.lags), max(self.config.windows))
+
+    def _features(
+        self,
+        padded: np.ndarray,
+        cumsum: np.ndarray,
+        counts: np.ndarray,
+        targets: np.ndarray,
+        target_dates: np.ndarray,
+        static: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Feature tensor for the given target weeks of every series.
+
+        Args:
+            padded: (n_series, pad + n_weeks) scaled values, NaN-padded on the left
+            cumsum / counts: Running sums / counts of the known padded values
+                             (length pad + n_weeks + 1, leading zero)
+            targets: Target week indices (unpadded)
+            target_dates: datetime64[D] week ends of the targets
+            static: (n_series, n_static) per-series features
+
+        Returns:
+            (n_series, len(targets), n_features)
+        """
+        n_series = padded.shape[0]
+        cols = targets + self._pad                  # padded column of each target
+        blocks = [padded[:, cols - lag] for lag in self.config.lags]
+        for window in self.config.windows:
+            total = cumsum[:, cols] - cumsum[:, cols - window]
+            count = counts[:, cols] - counts[:, cols - window]
+            blocks.append(np.divide(total, count, out=np.full(total.shape, np.nan), where=count > 0))
+
+        dates = pd.DatetimeIndex(target_dates)
+        calendar = np.stack([dates.isocalendar().week.to_numpy(dtype=float), dates.month.to_numpy(dtype=float)])
+        blocks.extend(np.broadcast_to(row, (n_series, len(targets))) for row in calendar)
+        blocks.extend(np.broadcast_to(column[:, None], (n_series, len(targets))) for column in static.T)
+        return np.stack(blocks, axis=-1)
+
+    def _prepare(self, panel: SeriesPanel, extra_weeks: int = 0):
+        """Scaled, padded values with running sums (and room for extra_weeks forecasts)."""
+        scale = _series_scale(panel.values)
+        scaled = np.divide(panel.values, scale[:, None], out=np.full(panel.values.shape, np.nan), where=scale[:, None] > 0)
+        padded = np.full((panel.values.shape[0], self._pad + panel.n_weeks + extra_weeks), np.nan)
+        padded[:, self._pad:self._pad + panel.n_weeks] = scaled
+        codes = np.where(panel.category_codes < 0, np.nan, panel.category_codes).astype(float)
+        static = np.column_stack([codes, np.log1p(scale), panel.static])
+        return scale, padded, static
+
+    @staticmethod
+    def _running_sums(padded: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        known = np.isfinite(padded)
+        zero = np.zeros((padded.shape[0], 1))
+        cumsum = np.hstack([zero, np.cumsum(np.where(known, padded, 0.0), axis=1)])
+        counts = np.hstack([zero, np.cumsum(known, axis=1)])
+        return cumsum, counts
+
+    def fit(self, panel: SeriesPanel) -> "GlobalBoostingForecaster":
+        """Train one model on every (series, week) of the panel."""
+        from sklearn.ensemble import HistGradientBoostingRegressor
+
+        start = time.perf_counter()
+        _, padded, static = self._prepare(panel)
+        cumsum, counts = self._running_sums(padded)
+        targets = np.arange(self.config.min_history, panel.n_weeks)
+        if len(targets) == 0:
+            raise ValueError(f"Global model needs more than {self.config.min_history} weeks of history")
+
+        X = self._features(padded, cumsum, counts, targets, panel.week_ends[targets], static)
+        X = X.reshape(-1, X.shape[-1])
+        y = padded[:, targets + self._pad].reshape(-1)
+        known = np.isfinite(y)
+        X, y = X[known], y[known]
+        # The booster cannot bin a feature that is missing everywhere (e.g. store
+        # attributes of a lone category series); a constant carries the same information
+        X[:, np.isnan(X).all(axis=0)] = 0.0
+        if len(y) > self.config.max_rows:
+            keep = np.random.default_rng(self.config.random_state).choice(len(y), self.config.max_rows, replace=False)
+            X, y = X[keep], y[keep]
+
+        self.n_categories = len(panel.categories)
+        self.model = HistGradientBoostingRegressor(
+            max_iter=self.config.max_iter,
+            learning_rate=self.config.learning_rate,
+            max_leaf_nodes=self.config.max_leaf_nodes,
+            categorical_features=[len(self.config.lags) + len(self.config.windows) + 2],
+            random_state=self.config.random_state,
+        )
+        self.model.fit(X, y)
+        self.residual_std = float(np.std(y - self.model.predict(X)))
+        self.n_rows = len(y)
+        self.fit_seconds = time.perf_counter() - start
+        logger.info(
+            f"Global model trained on {len(y):,} rows from {len(panel.keys)} series "
+            f"in {self.fit_seconds:.2f}s"
+        )
+        return self
+
+    def forecast(
+        self,
+        panel: SeriesPanel,
+        horizon: int,
+        start_offset: int = 0,
+        rows: Optional[Sequence[int]] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Recursive forecasts for every series, one batched prediction per week.
+
+        Args:
+            panel: History to forecast from (need not be the training panel)
+            horizon: Weeks to forecast
+            start_offset: Weeks skipped between the last history week and the
+                          first forecast week (calendar alignment)
+            rows: Optional subset of panel rows to forecast
+
+        Returns:
+            Dict with 'predictions', 'lower_bound' and 'upper_bound', each an
+            int64 array of shape (n_series, horizon), non-negative
+        """
+        if self.model is None:
+            raise RuntimeError("Model not trained. Call fit() first.")
+        if rows is not None:
+            index = np.asarray(rows)
+            panel = replace(
+                panel,
+                values=panel.values[index],
+                keys=[panel.keys[r] for r in index],
+                category_codes=panel.category_codes[index],
+                static=panel.static[index],
+            )
+
+        steps = start_offset + horizon
+        scale, padded, static = self._prepare(panel, extra_weeks=steps)
+        # Categories this model never saw are treated as unknown
+        static[:, 0] = np.where(static[:, 0] < self.n_categories, static[:, 0], np.nan)
+        last_week_end = panel.week_ends[-1]
+
+        for step in range(steps):
+            t = panel.n_weeks + step
+            cumsum, counts = self._running_sums(padded[:, :self._pad + t])
+            target_date = last_week_end + np.timedelta64(7 * (step + 1), "D")
+            X = self._features(
+                padded[:, :self._pad + t + 1], cumsum, counts, np.array([t]), np.array([target_date]), static
+            )[:, 0, :]
+            padded[:, self._pad + t] = np.maximum(self.model.predict(X), 0.0)
+
+        scaled = padded[:, self._pad + panel.n_weeks + start_offset:]
+        raw = np.nan_to_num(scaled * scale[:, None])
+        predictions = np.round(raw).astype(np.int64)
+        margin = 1.96 * self.residual_std * scale[:, None] * np.sqrt(np.arange(1, horizon + 1))
+        return {
+            "predictions": predictions,
+            "lower_bound": np.maximum(predictions - margin, 0).astype(np.int64),
+            "upper_bound": (predictions + margin).astype(np.int64),
+        }
+
+
+def get_global_forecaster(
+    panel: SeriesPanel,
+    config: GlobalForecastConfig = GlobalForecastConfig(),
+    cache: Optional[ModelArtifactCache] = None,
+) -> GlobalBoostingForecaster:
+    """
+    Global model trained on a panel, from the model cache when possible.
+
+    Args:
+        panel: Training panel (truncate() it to an origin for backtesting)
+        config: Feature layout and booster settings (part of the cache key)
+        cache: Model cache (default: get_model_cache())
+
+    Returns:
+        Fitted GlobalBoostingForecaster
+    """
+    cache = cache if cache is not None else get_model_cache()
+    key = model_cache_key("global_gbm", panel.fingerprint(), asdict(config))
+    model = cache.get(key)
+    if model is None:
+        model = GlobalBoostingForecaster(config).fit(panel)
+        cache.put(key, model)
+    return model
@@ -0,0 +1,467 @@
+"""
+Hierarchical Store Forecasting
+
+Forecasts every store × category series plus the cluster and category
+levels of the hierarchy, then reconciles the levels so store forecasts add
+up exactly to cluster and category forecasts.
+
+Base forecasts come from a vectorized seasonal-level model that runs on the
+whole (stores × weeks) matrix from the weekly cube at once — no per-store
+model fits — so 5,000 stores forecast in well under a second.
+
+Reconciliation methods:
+    bottom_up   store forecasts are kept; clusters/category are their sums
+    ols         optimal combination with identity weights
+    wls         optimal combination weighted by each series' inverse
+                seasonal-naive error variance (noisy stores move the most)
+
+The optimal-combination solve uses the tree structure (category → clusters
+→ stores): S'WS is diagonal plus rank (k+1), so it is inverted with the
+Woodbury identity in O(n_stores × k²) instead of an n_stores² dense solve.
+
+Usage:
+    hierarchy = forecast_hierarchy(
+        data_loader.get_weekly_cube(), "Women's Dresses",
+        store_clusters={"S001": "Fashion_Forward", ...},
+        horizon=12, season_start_date=date(2025, 2, 3), method="wls",
+    )
+    hierarchy.store_totals()          # store_id -> units over the horizon
+    hierarchy.integer_store_forecasts()
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .weekly_cube import WeeklySalesCube
+
+logger = logging.getLogger("hierarchical_forecast")
+
+SEASON_LENGTH = 52
+RECONCILIATION_METHODS = ("bottom_up", "ols", "wls")
+
+
+# ============================================================================
+# Vectorized base forecasts
+# ============================================================================
+
+def seasonal_indices(
+    matrix: np.ndarray,
+    season_length: int = SEASON_LENGTH,
+    pooling: float = 0.5,
+) -> np.ndarray:
+    """
+    Multiplicative seasonal index per series and week-of-season.
+
+    Each full season is normalized by its own mean and the seasons are
+    averaged. Store series are noisy, so indices are shrunk toward the
+    pooled index of all series by `pooling`.
+
+    Args:
+        matrix: (n_series, n_weeks) weekly sales
+        season_length: Weeks per season
+        pooling: Weight of the pooled index (0 = own index only)
+
+    Returns:
+        (n_series, season_length) indices aligned so the last column of
+        `matrix` is position season_length - 1. All ones when the history
+        is shorter than one season.
+    """
+    n_series, n_weeks = matrix.shape
+    n_seasons = n_weeks // season_length
+    if n_seasons == 0:
+        return np.ones((n_series, season_length))
+
+    seasons = matrix[:, -n_seasons * season_length:].astype(float)
+    seasons = seasons.reshape(n_series, n_seasons, season_length)
+
+    def normalize(years: np.ndarray) -> np.ndarray:
+        means = years.mean(axis=-1, keepdims=True)
+        return np.divide(years, means, out=np.ones_like(years), where=means > 0).mean(axis=-2)
+
+    own = normalize(seasons)
+    pooled = normalize(seasons.sum(axis=0, keepdims=True))
+    return (1 - pooling) * own + pooling * pooled
+
+
+def seasonal_level_forecast(
+    matrix: np.ndarray,
+    horizon: int,
+    start_offset: int = 0,
+    season_length: int = SEASON_LENGTH,
+    level_weeks: int = 8,
+    pooling: float = 0.5,
+) -> np.ndarray:
+    """
+    Forecast many series at once as deseasonalized level × seasonal index × growth.
+
+    Args:
+        matrix: (n_series, n_weeks) weekly sales, last column = latest week
+        horizon: Weeks to forecast
+        start_offset: Weeks skipped between the last history week and the
+                      first forecast week (calendar alignment)
+        season_length: Weeks per season
+        level_weeks: Recent weeks used to estimate the level
+        pooling: Seasonal index shrinkage toward the pooled index
+
+    Returns:
+        (n_series, horizon) non-negative forecasts
+    """
+    matrix = np.asarray(matrix, dtype=float)
+    n_series, n_weeks = matrix.shape
+    index = seasonal_indices(matrix, season_length, pooling)
+
+    # Position of history column t is (t - n_weeks) mod season_length
+    recent = np.arange(n_weeks - min(level_weeks, n_weeks), n_weeks)
+    recent_index = index[:, (recent - n_weeks) % season_length].mean(axis=1)
+    recent_sales = matrix[:, recent].mean(axis=1)
+    level = np.divide(recent_sales, recent_index, out=recent_sales.copy(), where=recent_index > 0)
+
+    # Year-over-year growth of the deseasonalized level, damped and clipped
+    growth = np.ones(n_series)
+    if n_weeks >= season_length + len(recent):
+        prior = matrix[:, recent - season_length].mean(axis=1)
+        prior_level = np.divide(prior, recent_index, out=prior.copy(), where=recent_index > 0)
+        growth = np.clip(
+            np.divide(level, prior_level, out=np.ones(n_series), where=prior_level > 0),
+            0.5, 2.0,
+        )
+
+    steps = start_offset + 1 + np.arange(horizon)
+    forecast = (
+        level[:, None]
+        * index[:, (steps - 1) % season_length]
+        * growth[:, None] ** (steps / season_length)
+    )
+    return np.maximum(forecast, 0.0)
+
+
+def seasonal_naive_variance(matrix: np.ndarray, season_length: int = SEASON_LENGTH) -> np.ndarray:
+    """Per-series variance of seasonal-naive errors (first differences if too short)."""
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.shape[1] > season_length:
+        errors = matrix[:, season_length:] - matrix[:, :-season_length]
+    elif matrix.shape[1] > 1:
+        errors = np.diff(matrix, axis=1)
+    else:
+        return np.ones(matrix.shape[0])
+    return errors.var(axis=1)
+
+
+# ============================================================================
+# Reconciliation
+# ============================================================================
+
+def reconcile(
+    store_forecast: np.ndarray,
+    cluster_forecast: np.ndarray,
+    total_forecast: np.ndarray,
+    store_cluster_codes: np.ndarray,
+    method: str = "wls",
+    store_variance: Optional[np.ndarray] = None,
+    cluster_variance: Optional[np.ndarray] = None,
+    total_variance: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Reconcile base forecasts of a category → cluster → store tree.
+
+    Args:
+        store_forecast: (n_stores, h) base store forecasts
+        cluster_forecast: (n_clusters, h) base cluster forecasts
+        total_forecast: (h,) base category forecast
+        store_cluster_codes: (n_stores,) cluster index of each store
+        method: "bottom_up", "ols" or "wls"
+        store_variance / cluster_variance / total_variance: Base forecast
+            error variances (required for "wls")
+
+    Returns:
+        (n_stores, h) reconciled, non-negative store forecasts; clusters and
+        the category total are their sums
+    """
+    if method not in RECONCILIATION_METHODS:
+        raise ValueError(f"Unknown reconciliation method '{method}'. Use one of {RECONCILIATION_METHODS}")
+
+    store_forecast = np.asarray(store_forecast, dtype=float)
+    if method == "bottom_up":
+        return np.maximum(store_forecast, 0.0)
+
+    n_stores = store_forecast.shape[0]
+    n_clusters = cluster_forecast.shape[0]
+    codes = np.asarray(store_cluster_codes, dtype=np.int64)
+
+    if method == "ols":
+        store_precision = np.ones(n_stores)
+        cluster_precision = np.ones(n_clusters)
+        total_precision = 1.0
+    else:
+        if store_variance is None or cluster_variance is None or total_variance is None:
+            raise ValueError("WLS reconciliation needs store, cluster and total forecast variances")
+        # Floor variances so all-zero series don't get infinite weight
+        floor = max(float(np.median(store_variance)) * 1e-3, 1e-9)
+        store_precision = 1.0 / np.maximum(store_variance, floor)
+        cluster_precision = 1.0 / np.maximum(cluster_variance, floor)
+        total_precision = 1.0 / max(float(total_variance), floor)
+
+    # rhs = S' Λ ŷ  (each store collects its own, its cluster's and the total's weighted forecast)
+    rhs = (
+        store_precision[:, None] * store_forecast
+        + (cluster_precision[:, None] * cluster_forecast)[codes]
+        + total_precision * np.asarray(total_forecast, dtype=float)[None, :]
+    )
+
+    # S'ΛS = D + U C U' with D = diag(store_precision), U = [cluster one-hot | 1]
+    # Woodbury: (D + UCU')^-1 = D^-1 - D^-1 U (C^-1 + U'D^-1U)^-1 U'D^-1
+    d_inv = 1.0 / store_precision
+    d_inv_rhs = d_inv[:, None] * rhs
+
+    cluster_d_inv = np.bincount(codes, weights=d_inv, minlength=n_clusters)
+    small = np.zeros((n_clusters + 1, n_clusters + 1))
+    small[np.arange(n_clusters), np.arange(n_clusters)] = 1.0 / cluster_precision + cluster_d_inv
+    small[:n_clusters, n_clusters] = cluster_d_inv
+    small[n_clusters, :n_clusters] = cluster_d_inv
+    small[n_clusters, n_clusters] = 1.0 / total_precision + d_inv.sum()
+
+    u_t_d_inv_rhs = np.vstack([
+        np.stack([np.bincount(codes, weights=col, minlength=n_clusters) for col in d_inv_rhs.T], axis=1),
+        d_inv_rhs.sum(axis=0, keepdims=True),
+    ])
+    solved = np.linalg.solve(small, u_t_d_inv_rhs)           # (k+1, h)
+    correction = solved[codes] + solved[n_clusters][None, :]  # U @ solved
+    reconciled = d_inv_rhs - d_inv[:, None] * correction
+
+    # Clipping keeps coherence: upper levels are recomputed bottom-up
+    return np.maximum(reconciled, 0.0)
+
+
+def _largest_remainder(values: np.ndarray, target: int) -> np.ndarray:
+    """Round non-negative values to integers that sum exactly to target."""
+    floors = np.floor(values).astype(np.int64)
+    shortfall = int(target - floors.sum())
+    if shortfall > 0:
+        order = np.argsort(-(values - floors), kind="stable")
+        floors[order[:shortfall]] += 1
+    elif shortfall < 0:
+        order = np.argsort(values - floors, kind="stable")
+        order = order[floors[order] > 0][:-shortfall]
+        floors[order] -= 1
+    return floors
+
+
+# ============================================================================
+# Hierarchy
+# ============================================================================
+
+@dataclass
+class HierarchicalForecast:
+    """Coherent store, cluster and category forecasts for one category."""
+
+    category: str
+    method: str
+    store_ids: List[str]
+    cluster_labels: List[str]
+    store_cluster_codes: np.ndarray     # (n_stores,) index into cluster_labels
+    store: np.ndarray                   # (n_stores, horizon) reconciled store forecasts
+    has_history: Optional[np.ndarray] = None  # (n_stores,) store has sales in the cube (None = all)
+
+    @property
+    def horizon(self) -> int:
+        return self.store.shape[1]
+
+    def stores_without_history(self) -> List[str]:
+        """Stores with no sales of the category in the cube (forecast from the hierarchy alone)."""
+        if self.has_history is None:
+            return []
+        return [s for s, observed in zip(self.store_ids, self.has_history) if not observed]
+
+    @property
+    def cluster(self) -> np.ndarray:
+        """(n_clusters, horizon) cluster forecasts (sums of their stores)."""
+        totals = np.zeros((len(self.cluster_labels), self.horizon))
+        np.add.at(totals, self.store_cluster_codes, self.store)
+        return totals
+
+    @property
+    def total(self) -> np.ndarray:
+        """(horizon,) category forecast (sum of all stores)."""
+        return self.store.sum(axis=0)
+
+    def store_totals(self) -> Dict[str, float]:
+        """Store id -> forecast units summed over the horizon."""
+        return dict(zip(self.store_ids, self.store.sum(axis=1).tolist()))
+
+    def cluster_totals(self) -> Dict[str, float]:
+        """Cluster label -> forecast units summed over the horizon."""
+        return dict(zip(self.cluster_labels, self.cluster.sum(axis=1).tolist()))
+
+    def integer_store_forecasts(self) -> np.ndarray:
+        """
+        Whole-unit store forecasts that stay coherent after rounding.
+
+        Each week's category total is rounded, split across clusters and
+        then across each cluster's stores by largest remainder, so integer
+        stores still sum exactly to the integer cluster and category figures.
+        """
+        result = np.zeros(self.store.shape, dtype=np.int64)
+        cluster = self.cluster
+        for week in range(self.horizon):
+            cluster_units = _largest_remainder(cluster[:, week], int(round(self.total[week])))
+            for c in range(len(self.cluster_labels)):
+                rows = np.flatnonzero(self.store_cluster_codes == c)
+                result[rows, week] = _largest_remainder(self.store[rows, week], int(cluster_units[c]))
+        return result
+
+    def minimum_units(self, weeks: int = 2) -> Dict[str, int]:
+        """
+        Store id -> whole units covering the store's first `weeks` forecast weeks.
+
+        Horizons shorter than `weeks` repeat the last forecast week. A
+        cluster's minimum is the sum of its stores' minimums.
+        """
+        covered = self.store[:, :weeks].sum(axis=1)
+        if self.horizon < weeks:
+            covered = covered + self.store[:, -1] * (weeks - self.horizon)
+        return dict(zip(self.store_ids, covered.astype(np.int64).tolist()))
+
+    def anchored_to(
+        self,
+        total_forecast: Sequence[float],
+        fallback_shares: Optional[Sequence[float]] = None,
+    ) -> "HierarchicalForecast":
+        """
+        Rescale store forecasts so each week sums to a given category forecast
+        (e.g. the demand agent's ensemble forecast), keeping the reconciled
+        store/cluster proportions.
+
+        Stores without history get their fallback share of every week's
+        target; the rest of the target follows the reconciled forecasts of
+        the stores with history (and the fallback shares in weeks where those
+        forecast nothing).
+
+        Args:
+            total_forecast: Weekly category forecast to match
+            fallback_shares: (n_stores,) non-negative weights, e.g. from store
+                             attributes (default: equal weights)
+        """
+        target = np.asarray(total_forecast, dtype=float)[:self.horizon]
+        n_stores = len(self.store_ids)
+        weights = np.ones(n_stores) if fallback_shares is None else np.asarray(fallback_shares, dtype=float)
+        if weights.sum() <= 0:
+            weights = np.ones(n_stores)
+        weights = weights / weights.sum()
+        observed = np.ones(n_stores, dtype=bool) if self.has_history is None else np.asarray(self.has_history, dtype=bool)
+
+        store = np.zeros((n_stores, len(target)))
+        store[~observed] = weights[~observed, None] * target[None, :]
+        remaining = target * weights[observed].sum()
+
+        current = self.store[observed].sum(axis=0)
+        scale = np.divide(remaining, current, out=np.zeros_like(remaining), where=current > 0)
+        store[observed] = self.store[observed] * scale[None, :]
+        # Weeks with no reconciled demand follow the fallback shares
+        empty = current <= 0
+        if empty.any() and remaining[empty].sum() > 0:
+            observed_weights = weights[observed] / weights[observed].sum()
+            store[np.ix_(observed, empty)] = observed_weights[:, None] * remaining[None, empty]
+        return HierarchicalForecast(
+            category=self.category,
+            method=self.method,
+            store_ids=self.store_ids,
+            cluster_labels=self.cluster_labels,
+            store_cluster_codes=self.store_cluster_codes,
+            store=store,
+            has_history=self.has_history,
+        )
+
+
+def season_start_offset(last_week_end: date, season_start_date: Optional[date]) -> int:
+    """
+    Weeks between the last history week and the first forecast week.
+
+    The first forecast week is the one ending on the first Sunday on or after
+    season_start_date (the same calendar alignment Prophet uses).
+    """
+    if season_start_date is None:
+        return 0
+    first_week_end = season_start_date + timedelta(days=(6 - season_start_date.weekday()) % 7)
+    return max(0, (first_week_end - last_week_end).days // 7 - 1)
+
+
+def forecast_hierarchy(
+    cube: WeeklySalesCube,
+    category: str,
+    store_clusters: Dict[str, str],
+    horizon: int,
+    season_start_date: Optional[date] = None,
+    method: str = "wls",
+) -> HierarchicalForecast:
+    """
+    Forecast and reconcile store, cluster and category levels for a category.
+
+    Args:
+        cube: Weekly sales cube
+        category: Category to forecast
+        store_clusters: store_id -> cluster label (stores missing from the
+                        cube get zero history; stores not listed are ignored)
+        horizon: Weeks to forecast
+        season_start_date: Optional calendar alignment of the first forecast week
+        method: Reconciliation method ("bottom_up", "ols", "wls")
+
+    Returns:
+        HierarchicalForecast
+    """
+    if category not in cube.active_weeks:
+        raise ValueError(f"No historical sales data found for category: {category}")
+
+    store_ids = sorted(store_clusters)
+    cluster_labels = sorted(set(store_clusters.values()))
+    label_index = {label: i for i, label in enumerate(cluster_labels)}
+    codes = np.array([label_index[store_clusters[s]] for s in store_ids], dtype=np.int64)
+
+    columns = cube.observed_columns(category)
+    last = int(columns[-1])
+    matrix = np.zeros((len(store_ids), len(columns)))
+    in_cube = [i for i, s in enumerate(store_ids) if s in cube.store_index]
+    matrix[in_cube] = cube.store_matrix(category, [store_ids[i] for i in in_cube])[:, columns]
+
+    cluster_matrix = np.zeros((len(cluster_labels), matrix.shape[1]))
+    np.add.at(cluster_matrix, codes, matrix)
+    total_matrix = matrix.sum(axis=0, keepdims=True)
+
+    last_week_end = pd.Timestamp(cube.week_ends[last]).date()
+    offset = season_start_offset(last_week_end, season_start_date)
+
+    # One vectorized pass over every level of the hierarchy
+    levels = np.vstack([matrix, cluster_matrix, total_matrix])
+    base = seasonal_level_forecast(levels, horizon, start_offset=offset)
+    variance = seasonal_naive_variance(levels)
+    n_stores, n_clusters = len(store_ids), len(cluster_labels)
+
+    store = reconcile(
+        base[:n_stores],
+        base[n_stores:n_stores + n_clusters],
+        base[-1],
+        codes,
+        method=method,
+        store_variance=variance[:n_stores],
+        cluster_variance=variance[n_stores:n_stores + n_clusters],
+        total_variance=float(variance[-1]),
+    )
+
+    logger.info(
+        f"Hierarchical forecast ({method}) for {category}: {n_stores} stores, "
+        f"{n_clusters} clusters, total={store.sum():,.0f} units over {horizon} weeks"
+    )
+
+    return HierarchicalForecast(
+        category=category,
+        method=method,
+        store_ids=store_ids,
+        cluster_labels=cluster_labels,
+        store_cluster_codes=codes,
+        store=store,
+        has_history=matrix.sum(axis=1) > 0,
+    )
@@ -0,0 +1,338 @@
+"""
+Vectorized Holt-Winters Engine
+
+Native NumPy Holt-Winters (additive trend; additive or multiplicative
+seasonality) that fits and forecasts a whole (series × weeks) matrix in one
+call. Smoothing parameters are chosen by batched grid search: every
+(alpha, beta, gamma) combination runs for every series at once, so the
+time recursion is a loop over weeks with array updates of shape
+(n_grid, n_series), never a loop over series or parameter sets.
+
+Parameters are selected per series (lowest one-step-ahead SSE each) or
+jointly (one parameter set minimizing the scale-free total error across
+all series, which is steadier for short or sparse store series).
+
+When new weeks of actuals arrive, fit.update() runs the recursions forward
+from the stored states with the fitted parameters (O(new weeks), no
+re-estimation) and tracks one-step-ahead errors. refresh_holt_winters()
+does that for every series and fully refits only the series whose errors
+have drifted above their fit-time level (or that are due a periodic refit).
+
+Usage:
+    fit = fit_holt_winters(matrix, season_length=52, seasonal="mul")
+    result = fit.forecast(12)
+    result["predictions"]      # (n_series, 12)
+
+    # Next week: one new column of actuals
+    fit, refit = refresh_holt_winters(fit, np.column_stack([matrix, new_week]), new_week)
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+# With only 2-4 seasons of weekly history the seasonal state needs fast
+# updates (high gamma) while the level is best kept smooth (low alpha)
+DEFAULT_ALPHAS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5)
+DEFAULT_BETAS = (0.0, 0.01, 0.05, 0.1)
+DEFAULT_GAMMAS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9)
+
+# Floor for multiplicative seasonality (levels/indices must stay positive)
+_EPS = 1e-6
+
+# A series is refit once its mean squared one-step error since the last fit
+# exceeds this multiple of its fit-time MSE (9x MSE = 3x RMSE: a single
+# ordinary week rarely gets there, a level shift does at once)
+DEFAULT_DRIFT_THRESHOLD = 9.0
+
+# ...or after this many incremental updates regardless (one quarter)
+DEFAULT_REFIT_EVERY = 13
+
+
+@dataclass
+class HoltWintersFit:
+    """Fitted Holt-Winters states and parameters for a batch of series."""
+
+    seasonal: str                   # "add" or "mul"
+    season_length: int
+    n_obs: int                      # history length (weeks)
+    alpha: np.ndarray               # (n_series,)
+    beta: np.ndarray
+    gamma: np.ndarray
+    level: np.ndarray               # (n_series,) final level
+    trend: np.ndarray               # (n_series,) final trend
+    season: np.ndarray              # (n_series, season_length) seasonal ring, indexed by t % m
+    sse: np.ndarray                 # (n_series,) one-step-ahead squared error sum
+    fit_mse: np.ndarray = field(init=False)     # (n_series,) mean squared one-step error at fit time
+    update_sse: np.ndarray = field(init=False)  # (n_series,) squared one-step errors since the last fit
+    n_updates: np.ndarray = field(init=False)   # (n_series,) weeks added since the last fit
+
+    def __post_init__(self):
+        n_series = len(self.level)
+        self.fit_mse = self.sse / max(self.n_obs - self.season_length, 1)
+        self.update_sse = np.zeros(n_series)
+        self.n_updates = np.zeros(n_series, dtype=np.int64)
+
+    @property
+    def residual_std(self) -> np.ndarray:
+        """Standard deviation of the one-step-ahead errors per series (one per week from week m on)."""
+        return np.sqrt(self.sse / max(self.n_obs - self.season_length, 1))
+
+    @property
+    def drift_ratio(self) -> np.ndarray:
+        """Mean squared one-step error since the last fit relative to the fit-time MSE."""
+        recent = self.update_sse / np.maximum(self.n_updates, 1)
+        ratio = recent / np.maximum(self.fit_mse, _EPS)
+        return np.where(self.n_updates > 0, ratio, 0.0)
+
+    def needs_refit(
+        self,
+        drift_threshold: float = DEFAULT_DRIFT_THRESHOLD,
+        refit_every: Optional[int] = DEFAULT_REFIT_EVERY,
+    ) -> np.ndarray:
+        """Boolean mask of series whose errors drifted or that are due a periodic refit."""
+        due = self.drift_ratio > drift_threshold
+        if refit_every:
+            due |= self.n_updates >= refit_every
+        return due
+
+    def update(self, new_obs: np.ndarray) -> np.ndarray:
+        """
+        Advance the states over new weeks of actuals with the fitted parameters.
+
+        Args:
+            new_obs: (n_series, k) new weeks for every series (a 1-D array is
+                     k weeks of a single series)
+
+        Returns:
+            (n_series, k) one-step-ahead errors (actual - forecast) of the new weeks
+        """
+        y = np.asarray(new_obs, dtype=float)
+        y = y.reshape(len(self.level), -1) if y.ndim < 2 else y
+        if y.shape[0] != len(self.level):
+            raise ValueError(f"Expected {len(self.level)} series, got {y.shape[0]}")
+        if self.seasonal == "mul":
+            y = np.maximum(y, _EPS)
+
+        m = self.season_length
+        errors = np.empty_like(y)
+        for j in range(y.shape[1]):
+            slot = self.n_obs % m
+            error, self.level, self.trend, self.season[:, slot] = _recursion_step(
+                y[:, j], self.level, self.trend, self.season[:, slot],
+                self.alpha, self.beta, self.gamma, self.seasonal,
+            )
+            errors[:, j] = error
+            self.n_obs += 1
+
+        squared = (errors ** 2).sum(axis=1)
+        self.sse = self.sse + squared
+        self.update_sse = self.update_sse + squared
+        self.n_updates = self.n_updates + y.shape[1]
+        return errors
+
+    def replace_series(self, rows: np.ndarray, other: "HoltWintersFit") -> None:
+        """Overwrite the given series (index or mask) with those of another fit of the same history."""
+        for name in ("alpha", "beta", "gamma", "level", "trend", "season",
+                     "sse", "fit_mse", "update_sse", "n_updates"):
+            getattr(self, name)[rows] = getattr(other, name)
+
+    def forecast(self, periods: int) -> Dict[str, np.ndarray]:
+        """
+        Point forecasts with 95% intervals for every series.
+
+        Returns:
+            Dict with 'predictions', 'lower_bound' and 'upper_bound', each an
+            int64 array of shape (n_series, periods), non-negative
+        """
+        steps = np.arange(1, periods + 1)
+        ring = (self.n_obs - 1 + steps) % self.season_length
+        trend_path = self.level[:, None] + steps[None, :] * self.trend[:, None]
+        if self.seasonal == "mul":
+            raw = trend_path * self.season[:, ring]
+        else:
+            raw = trend_path + self.season[:, ring]
+
+        predictions = np.maximum(np.round(raw), 0).astype(np.int64)
+        margin = 1.96 * self.residual_std[:, None]
+        return {
+            "predictions": predictions,
+            "lower_bound": np.maximum(predictions - margin, 0).astype(np.int64),
+            "upper_bound": (predictions + margin).astype(np.int64),
+        }
+
+
+def _initial_states(y: np.ndarray, m: int, seasonal: str):
+    """Classical initialization from the first one or two seasons."""
+    first = y[:, :m]
+    level = first.mean(axis=1)
+    if y.shape[1] >= 2 * m:
+        trend = (y[:, m:2 * m].mean(axis=1) - level) / m
+    else:
+        trend = np.zeros(y.shape[0])
+    if seasonal == "mul":
+        season = first / np.maximum(level, _EPS)[:, None]
+    else:
+        season = first - level[:, None]
+    return level, trend, season
+
+
+def _recursion_step(obs, level, trend, season_slot, alpha, beta, gamma, seasonal: str):
+    """
+    One week of the Holt-Winters recursion (all arrays broadcast together).
+
+    Returns:
+        (one-step error, new level, new trend, new seasonal state for this slot)
+    """
+    base = level + trend
+    if seasonal == "mul":
+        error = obs - base * season_slot
+        new_level = alpha * obs / np.maximum(season_slot, _EPS) + (1 - alpha) * base
+        new_season = gamma * obs / np.maximum(new_level, _EPS) + (1 - gamma) * season_slot
+    else:
+        error = obs - base - season_slot
+        new_level = alpha * (obs - season_slot) + (1 - alpha) * base
+        new_season = gamma * (obs - new_level) + (1 - gamma) * season_slot
+    new_trend = beta * (new_level - level) + (1 - beta) * trend
+    return error, new_level, new_trend, new_season
+
+
+def _grid_search_block(y: np.ndarray, m: int, seasonal: str, grid: np.ndarray):
+    """
+    Run the recursion for every grid point × series of one block.
+
+    Returns:
+        (sse, level, trend, season) with a leading grid axis
+    """
+    n_series, n_weeks = y.shape
+    alpha, beta, gamma = (grid[:, i][:, None] for i in range(3))        # (G, 1)
+    n_grid = len(grid)
+
+    level0, trend0, season0 = _initial_states(y, m, seasonal)
+    level = np.broadcast_to(level0, (n_grid, n_series)).copy()
+    trend = np.broadcast_to(trend0, (n_grid, n_series)).copy()
+    season = np.broadcast_to(season0, (n_grid, n_series, m)).copy()
+    sse = np.zeros((n_grid, n_series))
+
+    # One-step-ahead recursion from week m onward; all grid points × series per step
+    for t in range(m, n_weeks):
+        error, level, trend, season[:, :, t % m] = _recursion_step(
+            y[:, t][None, :], level, trend, season[:, :, t % m], alpha, beta, gamma, seasonal
+        )
+        sse += error ** 2
+
+    return sse, level, trend, season
+
+
+def fit_holt_winters(
+    matrix: np.ndarray,
+    season_length: int = 52,
+    seasonal: str = "mul",
+    per_series: bool = True,
+    alphas: Sequence[float] = DEFAULT_ALPHAS,
+    betas: Sequence[float] = DEFAULT_BETAS,
+    gammas: Sequence[float] = DEFAULT_GAMMAS,
+    block_size: int = 250,
+) -> HoltWintersFit:
+    """
+    Fit Holt-Winters to every row of a matrix by batched grid search.
+
+    Args:
+        matrix: (n_series, n_weeks) history, or a 1-D series
+        season_length: Seasonal period in weeks (needs n_weeks >= season_length + 1)
+        seasonal: "mul" (multiplicative) or "add" (additive) seasonality
+        per_series: Pick parameters per series (True) or one set for all (False)
+        alphas / betas / gammas: Level / trend / seasonal smoothing grids
+        block_size: Series searched together (bounds the grid state memory
+                    to about block_size × grid size × season_length floats)
+
+    Returns:
+        HoltWintersFit for all series
+    """
+    if seasonal not in ("add", "mul"):
+        raise ValueError(f"seasonal must be 'add' or 'mul', got '{seasonal}'")
+
+    y = np.atleast_2d(np.asarray(matrix, dtype=float))
+    n_series, n_weeks = y.shape
+    m = season_length
+    if n_weeks < m + 1:
+        raise ValueError(f"Holt-Winters needs more than {m} weeks of history. Provided: {n_weeks}")
+    if seasonal == "mul":
+        y = np.maximum(y, _EPS)
+
+    grid = np.array(list(itertools.product(alphas, betas, gammas)))     # (G, 3)
+    blocks = [slice(lo, min(lo + block_size, n_series)) for lo in range(0, n_series, block_size)]
+
+    if not per_series:
+        # Scale-free joint objective: each series' SSE relative to its best achievable SSE
+        relative = np.zeros(len(grid))
+        for block in blocks:
+            sse = _grid_search_block(y[block], m, seasonal, grid)[0]
+            relative += (sse / np.maximum(sse.min(axis=0, keepdims=True), _EPS)).sum(axis=1)
+        grid = grid[[int(np.argmin(relative))]]
+
+    best_params, sse_out, level_out, trend_out, season_out = [], [], [], [], []
+    for block in blocks:
+        sse, level, trend, season = _grid_search_block(y[block], m, seasonal, grid)
+        best = np.argmin(sse, axis=0)
+        series = np.arange(sse.shape[1])
+        best_params.append(grid[best])
+        sse_out.append(sse[best, series])
+        level_out.append(level[best, series])
+        trend_out.append(trend[best, series])
+        season_out.append(season[best, series])
+
+    params = np.concatenate(best_params)
+    return HoltWintersFit(
+        seasonal=seasonal,
+        season_length=m,
+        n_obs=n_weeks,
+        alpha=params[:, 0],
+        beta=params[:, 1],
+        gamma=params[:, 2],
+        level=np.concatenate(level_out),
+        trend=np.concatenate(trend_out),
+        season=np.concatenate(season_out),
+        sse=np.concatenate(sse_out),
+    )
+
+
+def refresh_holt_winters(
+    fit: HoltWintersFit,
+    history: np.ndarray,
+    new_obs: np.ndarray,
+    drift_threshold: float = DEFAULT_DRIFT_THRESHOLD,
+    refit_every: Optional[int] = DEFAULT_REFIT_EVERY,
+    **fit_kwargs,
+) -> Tuple[HoltWintersFit, np.ndarray]:
+    """
+    Bring a fit up to date with new weeks of actuals.
+
+    Every series is updated incrementally; series that drifted (or are due a
+    periodic refit) are then refit in full on their history and spliced back.
+
+    Args:
+        fit: Fit to update (modified in place)
+        history: (n_series, n_weeks) full history INCLUDING the new weeks
+                 (only the rows being refit are read)
+        new_obs: (n_series, k) new weeks of actuals
+        drift_threshold / refit_every: Refit triggers, see HoltWintersFit.needs_refit()
+        **fit_kwargs: Passed to fit_holt_winters() for the refit
+
+    Returns:
+        (fit, refit mask)
+    """
+    fit.update(new_obs)
+    refit = fit.needs_refit(drift_threshold, refit_every)
+    if refit.any():
+        rows = np.flatnonzero(refit)
+        refreshed = fit_holt_winters(
+            np.atleast_2d(history)[rows],
+            season_length=fit.season_length,
+            seasonal=fit.seasonal,
+            **fit_kwargs,
+        )
+        fit.replace_series(rows, refreshed)
+    return fit, refit
@@ -0,0 +1,228 @@
+"""
+Trained Model Artifact Cache
+
+Two-level cache (in-memory LRU + on-disk pickles) for trained forecasting
+models, so repeated forecasts on unchanged history skip training entirely.
+Artifacts are keyed by (category, history fingerprint, model config,
+horizon alignment): any new actuals, a changed model configuration or a
+different season start produce a new key, and stale entries simply age out.
+
+The on-disk store is a private directory written only by this process
+family (pickles must never be loaded from untrusted locations). One cache
+serves every Streamlit session and background/backtest thread of a
+process, so the in-memory LRU is guarded by a lock.
+
+Usage:
+    cache = get_model_cache()
+    key = model_cache_key(category, history_fingerprint(df), config, season_start_date)
+    ensemble = cache.get(key)
+    if ensemble is None:
+        ensemble = train(...)
+        cache.put(key, ensemble)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("model_cache")
+
+MODEL_CACHE_FORMAT_VERSION = 4
+
+
+def history_fingerprint(history: pd.DataFrame) -> str:
+    """
+    Fingerprint a training series (dates + quantities).
+
+    Args:
+        history: DataFrame with 'date' and 'quantity_sold' columns
+
+    Returns:
+        16-character hex digest; changes whenever any week or value changes
+    """
+    digest = hashlib.sha1()
+    digest.update(pd.to_datetime(history["date"]).to_numpy(dtype="datetime64[D]").astype(np.int64).tobytes())
+    digest.update(history["quantity_sold"].to_numpy(dtype=np.float64).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def model_cache_key(
+    category: str,
+    history_fp: str,
+    model_config: Dict[str, Any],
+    horizon_alignment: Optional[date] = None,
+) -> str:
+    """
+    Cache key for a trained model artifact.
+
+    Args:
+        category: Product category
+        history_fp: history_fingerprint() of the training series
+        model_config: JSON-serializable model configuration
+        horizon_alignment: Season start date the forecast is aligned to (None = continue history)
+
+    Returns:
+        Hex key (also used as the on-disk file name)
+    """
+    payload = json.dumps(
+        {
+            "version": MODEL_CACHE_FORMAT_VERSION,
+            "category": category,
+            "history": history_fp,
+            "config": model_config,
+            "alignment": horizon_alignment.isoformat() if horizon_alignment else None,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class ModelArtifactCache:
+    """In-memory LRU in front of a directory of pickled model artifacts."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_entries: int = 16,
+        max_disk_entries: int = 256,
+    ):
+        """
+        Args:
+            cache_dir: Directory for pickled artifacts (None = memory only)
+            max_entries: Artifacts kept in memory
+            max_disk_entries: Artifacts kept on disk (oldest removed first)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached artifact for a key, or None on a miss."""
+        with self._lock:
+            artifact = self._memory.get(key)
+            if artifact is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return artifact
+
+        if self.cache_dir is not None and self._path(key).exists():
+            try:
+                with open(self._path(key), "rb") as f:
+                    artifact = pickle.load(f)
+                self._remember(key, artifact)
+                with self._lock:
+                    self.hits += 1
+                return artifact
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable model artifact {key[:12]}: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, artifact: Any) -> None:
+        """Store an artifact in memory and (if configured) on disk."""
+        self._remember(key, artifact)
+        if self.cache_dir is None:
+            return
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+            with open(tmp_path, "wb") as f:
+                pickle.dump(artifact, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._prune_disk()
+        except Exception as e:
+            # The in-memory entry still serves this process
+            logger.warning(f"Could not persist model artifact {key[:12]}: {e}")
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one artifact, or everything when key is None."""
+        with self._lock:
+            if key is None:
+                self._memory.clear()
+            else:
+                self._memory.pop(key, None)
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return
+        paths = [self._path(key)] if key is not None else list(self.cache_dir.glob("*.pkl"))
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def _remember(self, key: str, artifact: Any) -> None:
+        with self._lock:
+            self._memory[key] = artifact
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _prune_disk(self) -> None:
+        assert self.cache_dir is not None
+        files = sorted(self.cache_dir.glob("*.pkl"), key=lambda p: p.stat().st_mtime)
+        for path in files[:max(0, len(files) - self.max_disk_entries)]:
+            path.unlink(missing_ok=True)
+
+
+LINEAGE_CACHE_SUBDIR = "lineage"
+
+# Global instances for easy access
+_model_cache: Optional[ModelArtifactCache] = None
+_lineage_cache: Optional[ModelArtifactCache] = None
+
+
+def model_cache_dir() -> Optional[Path]:
+    """Configured on-disk cache directory, resolved against the project root (None = memory only)."""
+    from config.settings import project_path, settings
+    return project_path(settings.model_cache_dir) if settings.model_cache_dir else None
+
+
+def get_model_cache() -> ModelArtifactCache:
+    """Get or create the global model artifact cache (configured from settings)."""
+    global _model_cache
+    if _model_cache is None:
+        from config.settings import settings
+        _model_cache = ModelArtifactCache(
+            cache_dir=model_cache_dir(),
+            max_entries=settings.model_cache_size,
+        )
+    return _model_cache
+
+
+def get_lineage_cache() -> ModelArtifactCache:
+    """
+    Get or create the global cache of fit lineage (warm-start parameters and
+    validation errors of each category's last fit).
+
+    Lineage records are small and kept apart from the model cache, so they
+    never evict fitted models from its LRU.
+    """
+    global _lineage_cache
+    if _lineage_cache is None:
+        cache_dir = model_cache_dir()
+        _lineage_cache = ModelArtifactCache(
+            cache_dir=cache_dir / LINEAGE_CACHE_SUBDIR if cache_dir is not None else None,
+            max_entries=256,
+            max_disk_entries=1024,
+        )
+    return _lineage_cache
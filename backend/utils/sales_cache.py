@@ -0,0 +1,256 @@
+"""
+Columnar Sales Cache
+
+One-time conversion of the historical sales CSV into a category-partitioned
+columnar layout on disk, so a category lookup reads only its own partition
+instead of re-parsing the whole CSV.
+
+Layout (next to the source file):
+    .sales_cache/<csv stem>/<fingerprint>/
+        meta.json               # fingerprint, store ids, category -> partition
+        part_000/date.npy       # int32 days since 1970-01-01
+        part_000/store.npy      # int32 codes into meta["stores"]
+        part_000/quantity.npy   # int64 units sold
+        part_001/...
+
+The fingerprint is derived from the source file's size and mtime, so any
+rewrite of the CSV (e.g. a new upload) lands in a fresh directory and the
+stale one is removed. Partitions are plain .npy files, which makes them
+readable from any process (and memory-mappable) without extra dependencies.
+
+Usage:
+    cache = ColumnarSalesCache(Path("data/training/historical_sales_2022_2024.csv"))
+    partition = cache.read_partition("Women's Dresses")
+    dates, totals = cache.category_daily_totals("Women's Dresses")
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .sales_stream import EPOCH, SalesVocabulary, stream_sales
+
+logger = logging.getLogger("sales_cache")
+
+CACHE_DIR_NAME = ".sales_cache"
+CACHE_FORMAT_VERSION = 1
+
+
+def file_fingerprint(path: Path, content_hash: bool = False) -> str:
+    """
+    Fingerprint a data file for cache invalidation.
+
+    Args:
+        path: File to fingerprint
+        content_hash: If True, hash the file contents instead of size/mtime
+                     (slower, but stable across copies and touch)
+
+    Returns:
+        16-character hex digest
+    """
+    digest = hashlib.sha1()
+    if content_hash:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    else:
+        stat = os.stat(path)
+        digest.update(f"{Path(path).resolve()}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    digest.update(f"v{CACHE_FORMAT_VERSION}".encode())
+    return digest.hexdigest()[:16]
+
+
+class ColumnarSalesCache:
+    """Category-partitioned .npy cache of a historical sales CSV."""
+
+    def __init__(self, source_path: Path, cache_root: Optional[Path] = None):
+        """
+        Args:
+            source_path: Historical sales CSV (date, store_id, category, quantity_sold)
+            cache_root: Directory holding cache versions. Defaults to
+                        <source dir>/.sales_cache/<source stem>
+        """
+        self.source_path = Path(source_path)
+        self.cache_root = (
+            Path(cache_root)
+            if cache_root is not None
+            else self.source_path.parent / CACHE_DIR_NAME / self.source_path.stem
+        )
+        self._fingerprint: Optional[str] = None
+        self._meta: Optional[Dict] = None
+
+    # ------------------------------------------------------------------
+    # Cache lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def fingerprint(self) -> str:
+        """Current fingerprint of the source file (re-checked on every call)."""
+        return file_fingerprint(self.source_path)
+
+    @property
+    def cache_dir(self) -> Path:
+        """Directory of the cache version matching the current source file."""
+        return self.cache_root / self.ensure()
+
+    def ensure(self) -> str:
+        """
+        Make sure a cache version exists for the current source file.
+
+        Returns:
+            The fingerprint of the (possibly freshly built) cache version.
+        """
+        fingerprint = self.fingerprint
+        if fingerprint == self._fingerprint and self._meta is not None:
+            return fingerprint
+
+        version_dir = self.cache_root / fingerprint
+        meta_path = version_dir / "meta.json"
+        if not meta_path.exists():
+            self._build(version_dir, fingerprint)
+            self._remove_stale_versions(keep=fingerprint)
+
+        with open(meta_path, "r") as f:
+            self._meta = json.load(f)
+        self._fingerprint = fingerprint
+        return fingerprint
+
+    def invalidate(self) -> None:
+        """Forget in-memory metadata (on-disk versions are kept)."""
+        self._fingerprint = None
+        self._meta = None
+
+    @property
+    def meta(self) -> Dict:
+        """Cache metadata (stores, categories, partition names)."""
+        self.ensure()
+        assert self._meta is not None
+        return self._meta
+
+    def _build(self, version_dir: Path, fingerprint: str) -> None:
+        """Convert the source CSV into category partitions with one streaming pass."""
+        # Imported here: the manifest module depends on file_fingerprint above
+        from .sales_manifest import load_or_build_manifest
+
+        logger.info(f"Building columnar sales cache for {self.source_path.name} ({fingerprint})")
+
+        # The manifest's per-category row counts size each partition up front,
+        # so chunks are written straight into memory-mapped .npy files
+        manifest = load_or_build_manifest(self.source_path)
+        vocabulary = SalesVocabulary.from_manifest(manifest)
+
+        # Build into a private temp dir and rename, so concurrent builders
+        # (other Streamlit sessions / worker processes) never see a partial cache
+        tmp_dir = version_dir.parent / f"{version_dir.name}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        partitions: Dict[str, str] = {}
+        columns: List[Dict[str, np.memmap]] = []
+        for code, category in enumerate(vocabulary.categories):
+            part_name = f"part_{code:03d}"
+            part_dir = tmp_dir / part_name
+            part_dir.mkdir()
+            n_rows = manifest.rows_per_category[category]
+            columns.append({
+                column: np.lib.format.open_memmap(
+                    part_dir / f"{column}.npy", mode="w+", dtype=dtype, shape=(n_rows,)
+                )
+                for column, dtype in (("date", np.int32), ("store", np.int32), ("quantity", np.int64))
+            })
+            partitions[category] = part_name
+
+        filled = np.zeros(len(vocabulary.categories), dtype=np.int64)
+        for chunk in stream_sales(self.source_path, vocabulary):
+            order = np.argsort(chunk.category_codes, kind="stable")
+            counts = np.bincount(chunk.category_codes, minlength=len(filled))
+            bounds = np.r_[0, np.cumsum(counts)]
+            for code in np.flatnonzero(counts).tolist():
+                rows = order[bounds[code]:bounds[code + 1]]
+                lo, hi = filled[code], filled[code] + len(rows)
+                columns[code]["date"][lo:hi] = chunk.days[rows]
+                columns[code]["store"][lo:hi] = chunk.store_codes[rows]
+                columns[code]["quantity"][lo:hi] = chunk.quantity[rows]
+                filled[code] = hi
+
+        for part in columns:
+            for array in part.values():
+                array.flush()
+        del columns
+
+        meta = {
+            "format_version": CACHE_FORMAT_VERSION,
+            "fingerprint": fingerprint,
+            "source": str(self.source_path),
+            "stores": vocabulary.stores,
+            "partitions": partitions,
+            "row_count": int(filled.sum()),
+        }
+        with open(tmp_dir / "meta.json", "w") as f:
+            json.dump(meta, f)
+
+        try:
+            os.rename(tmp_dir, version_dir)
+        except OSError:
+            # Another process finished the same version first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        logger.info(f"Columnar cache ready: {len(partitions)} categories, {int(filled.sum()):,} rows")
+
+    def _remove_stale_versions(self, keep: str) -> None:
+        """Delete cache versions built from older copies of the source file."""
+        for child in self.cache_root.iterdir():
+            if child.name != keep and not child.name.startswith(f"{keep}.tmp-"):
+                shutil.rmtree(child, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_categories(self) -> List[str]:
+        """Categories present in the cache (sorted)."""
+        return sorted(self.meta["partitions"].keys())
+
+    def get_stores(self) -> List[str]:
+        """Store ids present in the cache (sorted)."""
+        return list(self.meta["stores"])
+
+    def read_partition(self, category: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Read one category partition.
+
+        Returns:
+            Dict with 'date' (int32 days since epoch), 'store' (int32 store codes)
+            and 'quantity' (int64) arrays, or None if the category is unknown.
+        """
+        part_name = self.meta["partitions"].get(category)
+        if part_name is None:
+            return None
+
+        part_dir = self.cache_dir / part_name
+        return {
+            column: np.load(part_dir / f"{column}.npy", mmap_mode="r")
+            for column in ("date", "store", "quantity")
+        }
+
+    def category_daily_totals(self, category: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Daily unit totals for a category, summed across stores.
+
+        Returns:
+            (dates as datetime64[D], quantities as int64), sorted by date.
+            Only dates with at least one row are included.
+        """
+        partition = self.read_partition(category)
+        if partition is None or len(partition["date"]) == 0:
+            return np.array([], dtype="datetime64[D]"), np.array([], dtype=np.int64)
+
+        unique_days, inverse = np.unique(partition["date"], return_inverse=True)
+        totals = np.bincount(inverse, weights=partition["quantity"], minlength=len(unique_days))
+        return EPOCH + unique_days.astype("timedelta64[D]"), totals.astype(np.int64)
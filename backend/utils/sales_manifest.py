@@ -0,0 +1,175 @@
+"""
+Sales Metadata Manifest
+
+Single streaming pass (see sales_stream) over the historical sales CSV that records everything
+the metadata accessors need: distinct categories and store ids, min/max
+date, and row counts per category and per store. The manifest is saved as
+JSON next to the data file and rebuilt whenever the file fingerprint changes.
+
+Usage:
+    manifest = load_or_build_manifest(Path("data/training/historical_sales_2022_2024.csv"))
+    manifest.categories      # ['Accessories', "Men's Shirts", "Women's Dresses"]
+    manifest.date_range      # {'start': '2022-01-01', 'end': '2024-12-31', ...}
+"""
+
+import json
+import logging
+import os
+from collections import Counter
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .sales_cache import file_fingerprint
+from .sales_stream import EPOCH, categorical_days, read_sales_csv
+
+logger = logging.getLogger("sales_manifest")
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+@dataclass
+class SalesManifest:
+    """Metadata summary of a historical sales file."""
+
+    fingerprint: str
+    categories: List[str] = field(default_factory=list)
+    stores: List[str] = field(default_factory=list)
+    min_date: str = ""
+    max_date: str = ""
+    row_count: int = 0
+    rows_per_category: Dict[str, int] = field(default_factory=dict)
+    rows_per_store: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def date_range(self) -> Dict[str, str]:
+        """Date range in the shape returned by TrainingDataLoader.get_date_range()."""
+        return {
+            "start": self.min_date,
+            "end": self.max_date,
+            "start_year": self.min_date[:4],
+            "end_year": self.max_date[:4],
+        }
+
+    def with_actuals(self, rows: List[Tuple[str, str, str, int]]) -> "SalesManifest":
+        """
+        Copy of the manifest extended with in-season actuals.
+
+        Args:
+            rows: (category, date 'YYYY-MM-DD', store_id, quantity) rows from the actuals log
+
+        Returns:
+            New SalesManifest; the fingerprint still identifies the base file
+        """
+        if not rows:
+            return self
+
+        category_counts = Counter(self.rows_per_category)
+        store_counts = Counter(self.rows_per_store)
+        category_counts.update(r[0] for r in rows)
+        store_counts.update(r[2] for r in rows)
+        dates = [r[1] for r in rows]
+
+        return replace(
+            self,
+            categories=sorted(category_counts),
+            stores=sorted(store_counts),
+            min_date=min([self.min_date] + dates) if self.min_date else min(dates),
+            max_date=max([self.max_date] + dates),
+            row_count=self.row_count + len(rows),
+            rows_per_category=dict(sorted(category_counts.items())),
+            rows_per_store=dict(sorted(store_counts.items())),
+        )
+
+
+def manifest_path_for(sales_path: Path) -> Path:
+    """Manifest location for a sales file (saved alongside it)."""
+    sales_path = Path(sales_path)
+    return sales_path.with_name(sales_path.stem + MANIFEST_SUFFIX)
+
+
+def build_manifest(sales_path: Path, fingerprint: Optional[str] = None) -> SalesManifest:
+    """
+    Build a manifest with one chunked pass over the sales CSV.
+
+    Args:
+        sales_path: Historical sales CSV
+        fingerprint: Precomputed file fingerprint (computed if omitted)
+
+    Returns:
+        SalesManifest for the file
+    """
+    sales_path = Path(sales_path)
+    fingerprint = fingerprint or file_fingerprint(sales_path)
+    logger.info(f"Building sales manifest for {sales_path.name} ({fingerprint})")
+
+    category_counts: Counter = Counter()
+    store_counts: Counter = Counter()
+    min_day: Optional[int] = None
+    max_day: Optional[int] = None
+    row_count = 0
+
+    for chunk in read_sales_csv(sales_path, usecols=["date", "store_id", "category"]):
+        row_count += len(chunk)
+        category_counts.update(chunk["category"].value_counts(sort=False).to_dict())
+        store_counts.update(chunk["store_id"].value_counts(sort=False).to_dict())
+
+        days = categorical_days(chunk["date"])
+        min_day = int(days.min()) if min_day is None else min(min_day, int(days.min()))
+        max_day = int(days.max()) if max_day is None else max(max_day, int(days.max()))
+
+    rows_per_category = {str(k): int(v) for k, v in sorted(category_counts.items()) if v > 0}
+    rows_per_store = {str(k): int(v) for k, v in sorted(store_counts.items()) if v > 0}
+
+    return SalesManifest(
+        fingerprint=fingerprint,
+        categories=list(rows_per_category.keys()),
+        stores=list(rows_per_store.keys()),
+        min_date=str(EPOCH + np.timedelta64(min_day, "D")) if min_day is not None else "",
+        max_date=str(EPOCH + np.timedelta64(max_day, "D")) if max_day is not None else "",
+        row_count=row_count,
+        rows_per_category=rows_per_category,
+        rows_per_store=rows_per_store,
+    )
+
+
+def save_manifest(manifest: SalesManifest, path: Path) -> None:
+    """Write a manifest atomically (readers never see a partial file)."""
+    tmp_path = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    with open(tmp_path, "w") as f:
+        json.dump(asdict(manifest), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_or_build_manifest(sales_path: Path) -> SalesManifest:
+    """
+    Load the manifest saved next to a sales file, rebuilding it if stale.
+
+    Args:
+        sales_path: Historical sales CSV
+
+    Returns:
+        SalesManifest matching the file's current fingerprint
+    """
+    sales_path = Path(sales_path)
+    fingerprint = file_fingerprint(sales_path)
+    path = manifest_path_for(sales_path)
+
+    if path.exists():
+        try:
+            with open(path, "r") as f:
+                manifest = SalesManifest(**json.load(f))
+            if manifest.fingerprint == fingerprint:
+                return manifest
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable manifest {path.name}: {e}")
+
+    manifest = build_manifest(sales_path, fingerprint)
+    try:
+        save_manifest(manifest, path)
+    except OSError as e:
+        # Read-only data dirs still work, the manifest just isn't persisted
+        logger.warning(f"Could not save manifest {path.name}: {e}")
+    return manifest
@@ -0,0 +1,190 @@
+"""
+Streaming Sales Reader
+
+Bounded-memory scan of the historical sales file. The file is parsed in
+fixed-size chunks with explicit dtypes: store_id, category and date are
+read as pandas categoricals, so the parser materializes one Python object
+per distinct value instead of one per row. Each chunk is reduced to NumPy
+code arrays and filtered (category, stores, date range) on those codes,
+so rows outside the predicate never become Python objects.
+
+Peak memory is one chunk regardless of file size. Plain and compressed
+CSVs are both supported; compression is inferred from the extension
+(.gz, .bz2, .xz, .zip, .zst — zstd needs the optional `zstandard` package).
+
+The manifest, columnar cache and daily tensor builds all scan through here.
+
+Usage:
+    vocabulary = SalesVocabulary.from_manifest(load_or_build_manifest(path))
+    for chunk in stream_sales(path, vocabulary, categories=["Women's Dresses"],
+                              start_date="2024-01-01"):
+        chunk.days, chunk.store_codes, chunk.quantity   # NumPy arrays
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+STREAM_CHUNK_ROWS = 250_000
+SALES_COLUMNS = ["date", "store_id", "category", "quantity_sold"]
+EPOCH = np.datetime64("1970-01-01", "D")
+
+CSV_DTYPES = {
+    "date": "category",
+    "store_id": "category",
+    "category": "category",
+    "quantity_sold": "int64",
+}
+
+
+def read_sales_csv(
+    path: Path,
+    usecols: Sequence[str] = SALES_COLUMNS,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Raw chunked reader: DataFrames with categorical date/store_id/category columns.
+
+    Args:
+        path: Sales CSV, optionally compressed
+        usecols: Columns to parse (others are skipped by the parser)
+        chunk_rows: Rows per chunk
+
+    Yields:
+        One DataFrame per chunk (empty chunks skipped)
+    """
+    reader = pd.read_csv(
+        path,
+        usecols=list(usecols),
+        dtype={c: CSV_DTYPES[c] for c in usecols},
+        chunksize=chunk_rows,
+        compression="infer",
+    )
+    with reader:
+        for chunk in reader:
+            if not chunk.empty:
+                yield chunk
+
+
+def _to_day(value) -> int:
+    # datetime64[D] counts days from EPOCH (1970-01-01)
+    return int(np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64))
+
+
+def categorical_days(column: pd.Series) -> np.ndarray:
+    """
+    Days since epoch (int32) for a categorical date column.
+
+    Only the distinct date strings are parsed; rows are mapped through the
+    category codes.
+    """
+    day_of_category = (
+        pd.to_datetime(column.cat.categories).to_numpy(dtype="datetime64[D]") - EPOCH
+    ).astype(np.int32)
+    return day_of_category[column.cat.codes.to_numpy()]
+
+
+def _global_codes(column: pd.Series, index: Dict[str, int]) -> np.ndarray:
+    """Map a chunk's categorical codes onto a fixed vocabulary (-1 if unknown)."""
+    lookup = np.array([index.get(str(v), -1) for v in column.cat.categories], dtype=np.int32)
+    codes = column.cat.codes.to_numpy()
+    return np.where(codes >= 0, lookup[codes], -1).astype(np.int32)
+
+
+@dataclass
+class SalesVocabulary:
+    """Fixed store/category vocabularies that give codes a stable meaning across chunks."""
+
+    stores: List[str]
+    categories: List[str]
+    store_index: Dict[str, int] = field(init=False)
+    category_index: Dict[str, int] = field(init=False)
+
+    def __post_init__(self):
+        self.store_index = {s: i for i, s in enumerate(self.stores)}
+        self.category_index = {c: i for i, c in enumerate(self.categories)}
+
+    @classmethod
+    def from_manifest(cls, manifest) -> "SalesVocabulary":
+        return cls(stores=list(manifest.stores), categories=list(manifest.categories))
+
+
+@dataclass
+class SalesChunk:
+    """One filtered chunk of daily sales as parallel NumPy arrays."""
+
+    days: np.ndarray            # int32 days since 1970-01-01
+    store_codes: np.ndarray     # int32 index into SalesVocabulary.stores
+    category_codes: np.ndarray  # int32 index into SalesVocabulary.categories
+    quantity: np.ndarray        # int64 units sold
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+
+def stream_sales(
+    path: Path,
+    vocabulary: SalesVocabulary,
+    categories: Optional[Sequence[str]] = None,
+    stores: Optional[Sequence[str]] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    chunk_rows: int = STREAM_CHUNK_ROWS,
+) -> Iterator[SalesChunk]:
+    """
+    Scan the sales file chunk by chunk with predicates pushed into the scan.
+
+    Args:
+        path: Sales CSV, optionally compressed
+        vocabulary: Store/category vocabularies defining the codes
+        categories: Keep only these categories (default: all)
+        stores: Keep only these store ids (default: all)
+        start_date: Keep rows on or after this date (inclusive)
+        end_date: Keep rows on or before this date (inclusive)
+        chunk_rows: Rows parsed per chunk
+
+    Yields:
+        SalesChunk per parsed chunk with at least one matching row. Rows whose
+        store or category is missing from the vocabulary are dropped.
+    """
+    category_filter = None
+    if categories is not None:
+        category_filter = np.array(
+            [vocabulary.category_index[c] for c in categories if c in vocabulary.category_index],
+            dtype=np.int32,
+        )
+    store_filter = None
+    if stores is not None:
+        store_filter = np.array(
+            [vocabulary.store_index[s] for s in stores if s in vocabulary.store_index],
+            dtype=np.int32,
+        )
+    lo = _to_day(start_date) if start_date is not None else None
+    hi = _to_day(end_date) if end_date is not None else None
+
+    for chunk in read_sales_csv(path, chunk_rows=chunk_rows):
+        category_codes = _global_codes(chunk["category"], vocabulary.category_index)
+        store_codes = _global_codes(chunk["store_id"], vocabulary.store_index)
+        days = categorical_days(chunk["date"])
+
+        mask = (category_codes >= 0) & (store_codes >= 0)
+        if category_filter is not None:
+            mask &= np.isin(category_codes, category_filter)
+        if store_filter is not None:
+            mask &= np.isin(store_codes, store_filter)
+        if lo is not None:
+            mask &= days >= lo
+        if hi is not None:
+            mask &= days <= hi
+        if not mask.any():
+            continue
+
+        yield SalesChunk(
+            days=days[mask],
+            store_codes=store_codes[mask],
+            category_codes=category_codes[mask],
+            quantity=chunk["quantity_sold"].to_numpy()[mask],
+        )
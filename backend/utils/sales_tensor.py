@@ -0,0 +1,290 @@
+"""
+Memory-Mapped Daily Sales Tensor
+
+Loader storage mode for multi-GB histories (hundreds of millions of rows)
+that neither pandas nor the DictReader path can hold in memory. Daily
+units are stored as one int32 tensor of shape (store × category × day) in
+a .npy file that is opened with np.memmap, plus a small JSON index.
+
+The tensor is filled by a chunked pass over the CSV, so building it never
+needs more than one chunk in memory. Reads are zero-copy views of the
+memory map; every Streamlit session or worker process that opens the same
+file shares the OS page cache instead of holding a private copy.
+
+Layout (next to the source file):
+    .sales_tensor/<csv stem>/<fingerprint>/
+        quantity.npy    # int32, shape (n_stores, n_categories, n_days)
+        observed.npy    # bool, shape (n_categories, n_days): day has at least one row
+        index.json      # stores, categories, first_day, n_days
+        weekly_cube/    # WeeklySalesCube derived from the tensor
+
+Usage:
+    tensor = DailySalesTensor(Path("data/training/historical_sales_2022_2024.csv"))
+    view = tensor.category_view("Women's Dresses", "2024-01-01", "2024-03-31")
+    # view is (n_stores, n_days) and shares memory with the file
+"""
+
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .sales_cache import EPOCH, file_fingerprint
+from .sales_manifest import load_or_build_manifest
+from .sales_stream import SalesVocabulary, stream_sales
+from .weekly_cube import WeeklySalesCube, days_to_week_index
+
+logger = logging.getLogger("sales_tensor")
+
+TENSOR_DIR_NAME = ".sales_tensor"
+
+DateLike = Union[str, np.datetime64, pd.Timestamp, None]
+
+
+def _day_number(value: DateLike) -> int:
+    """Days since the Unix epoch of a date."""
+    return int(np.datetime64(pd.Timestamp(value).date(), "D").astype(np.int64))
+
+
+class DailySalesTensor:
+    """Memory-mapped (store × category × day) int32 sales tensor."""
+
+    def __init__(self, source_path: Path, cache_root: Optional[Path] = None):
+        """
+        Args:
+            source_path: Historical sales CSV (date, store_id, category, quantity_sold)
+            cache_root: Directory holding tensor versions. Defaults to
+                        <source dir>/.sales_tensor/<source stem>
+        """
+        self.source_path = Path(source_path)
+        self.cache_root = (
+            Path(cache_root)
+            if cache_root is not None
+            else self.source_path.parent / TENSOR_DIR_NAME / self.source_path.stem
+        )
+        self._fingerprint: Optional[str] = None
+        self._index: Optional[Dict] = None
+        self._data: Optional[np.memmap] = None
+        self._observed: Optional[np.ndarray] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def ensure(self) -> str:
+        """
+        Open (building if needed) the tensor matching the current source file.
+
+        Returns:
+            The fingerprint of the tensor version in use.
+        """
+        fingerprint = file_fingerprint(self.source_path)
+        if fingerprint == self._fingerprint and self._data is not None:
+            return fingerprint
+
+        version_dir = self.cache_root / fingerprint
+        if not (version_dir / "index.json").exists():
+            self._build(version_dir, fingerprint)
+            self._remove_stale_versions(keep=fingerprint)
+
+        with open(version_dir / "index.json", "r") as f:
+            self._index = json.load(f)
+        self._data = np.load(version_dir / "quantity.npy", mmap_mode="r")
+        observed_path = version_dir / "observed.npy"
+        self._observed = np.load(observed_path, mmap_mode="r") if observed_path.exists() else None
+        self._fingerprint = fingerprint
+        return fingerprint
+
+    def invalidate(self) -> None:
+        """Drop the current memory map (reopened on next access)."""
+        self._fingerprint = None
+        self._index = None
+        self._data = None
+        self._observed = None
+
+    @property
+    def version_dir(self) -> Path:
+        return self.cache_root / self.ensure()
+
+    def _build(self, version_dir: Path, fingerprint: str) -> None:
+        """Fill the tensor with a chunked pass over the CSV."""
+        # The manifest supplies the tensor's dimensions from its own streaming pass
+        manifest = load_or_build_manifest(self.source_path)
+        stores, categories = manifest.stores, manifest.categories
+        first_day = np.datetime64(manifest.min_date, "D")
+        n_days = int((np.datetime64(manifest.max_date, "D") - first_day).astype(int)) + 1
+        shape = (len(stores), len(categories), n_days)
+
+        logger.info(
+            f"Building daily sales tensor for {self.source_path.name}: "
+            f"{shape[0]} stores × {shape[1]} categories × {shape[2]} days"
+        )
+
+        tmp_dir = version_dir.parent / f"{version_dir.name}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        tensor = np.lib.format.open_memmap(
+            tmp_dir / "quantity.npy", mode="w+", dtype=np.int32, shape=shape
+        )
+        flat = tensor.reshape(-1)
+        observed = np.zeros((len(categories), n_days), dtype=bool)
+
+        vocabulary = SalesVocabulary.from_manifest(manifest)
+        first = int((first_day - EPOCH).astype(np.int64))
+        for chunk in stream_sales(self.source_path, vocabulary):
+            observed[chunk.category_codes.astype(np.int64), chunk.days.astype(np.int64) - first] = True
+            positions = np.ravel_multi_index(
+                (
+                    chunk.store_codes.astype(np.int64),
+                    chunk.category_codes.astype(np.int64),
+                    chunk.days.astype(np.int64) - first,
+                ),
+                shape,
+            )
+            np.add.at(flat, positions, chunk.quantity.astype(np.int32))
+
+        tensor.flush()
+        del tensor, flat
+        np.save(tmp_dir / "observed.npy", observed)
+
+        with open(tmp_dir / "index.json", "w") as f:
+            json.dump({
+                "fingerprint": fingerprint,
+                "stores": stores,
+                "categories": categories,
+                "first_day": str(first_day),
+                "n_days": n_days,
+            }, f)
+
+        try:
+            os.rename(tmp_dir, version_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _remove_stale_versions(self, keep: str) -> None:
+        """Delete tensor versions built from older copies of the source file."""
+        for child in self.cache_root.iterdir():
+            if child.name != keep and not child.name.startswith(f"{keep}.tmp-"):
+                shutil.rmtree(child, ignore_errors=True)
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _opened(self) -> Tuple[Dict, np.memmap]:
+        """Index and memory map of the current version (opened if needed)."""
+        self.ensure()
+        assert self._index is not None and self._data is not None
+        return self._index, self._data
+
+    @property
+    def data(self) -> np.ndarray:
+        """The read-only memory-mapped tensor."""
+        return self._opened()[1]
+
+    @property
+    def stores(self) -> List[str]:
+        return self._opened()[0]["stores"]
+
+    @property
+    def categories(self) -> List[str]:
+        return self._opened()[0]["categories"]
+
+    @property
+    def first_day(self) -> np.datetime64:
+        return np.datetime64(str(self._opened()[0]["first_day"]), "D")
+
+    @property
+    def dates(self) -> np.ndarray:
+        """datetime64[D] date of every day column."""
+        return self.first_day + np.arange(self.data.shape[2]).astype("timedelta64[D]")
+
+    def _day_bounds(self, start: DateLike, end: DateLike) -> Tuple[int, int]:
+        n_days = self.data.shape[2]
+        first = int(self.first_day.astype(np.int64))
+        lo = 0 if start is None else _day_number(start) - first
+        hi = n_days if end is None else _day_number(end) - first + 1
+        return max(0, lo), min(n_days, max(hi, 0))
+
+    # ------------------------------------------------------------------
+    # Zero-copy queries
+    # ------------------------------------------------------------------
+
+    def category_view(
+        self,
+        category: str,
+        start: DateLike = None,
+        end: DateLike = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Daily units for one category, all stores, over a date range.
+
+        Returns:
+            (n_stores, n_days) view into the memory map (no copy), or None
+            if the category is unknown. Dates are inclusive.
+        """
+        if category not in self.categories:
+            return None
+        c = self.categories.index(category)
+        lo, hi = self._day_bounds(start, end)
+        return self.data[:, c, lo:hi]
+
+    def category_daily_totals(self, category: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Daily category totals across stores.
+
+        Returns:
+            (dates as datetime64[D], quantities as int64), sorted by date.
+            Only dates with at least one row are included, as in the
+            columnar cache (tensors built without the observed-day mask
+            fall back to dates with non-zero sales).
+        """
+        view = self.category_view(category)
+        if view is None:
+            return np.array([], dtype="datetime64[D]"), np.array([], dtype=np.int64)
+
+        totals = view.sum(axis=0, dtype=np.int64)
+        if self._observed is not None:
+            days = np.flatnonzero(self._observed[self.categories.index(category)])
+        else:
+            days = np.flatnonzero(totals)
+        return self.dates[days], totals[days]
+
+    # ------------------------------------------------------------------
+    # Weekly cube
+    # ------------------------------------------------------------------
+
+    def weekly_cube(self) -> WeeklySalesCube:
+        """Weekly cube derived from the tensor (built once, saved with it)."""
+        directory = self.version_dir / "weekly_cube"
+        if (directory / "index.json").exists():
+            return WeeklySalesCube.load(directory)
+
+        days = (self.dates - EPOCH).astype(np.int64)
+        weeks = days_to_week_index(days)
+        week_starts = np.flatnonzero(np.r_[True, weeks[1:] != weeks[:-1]])
+
+        values = np.moveaxis(
+            np.add.reduceat(self.data, week_starts, axis=2, dtype=np.int64), 1, 0
+        )
+        active_weeks = {}
+        for c, category in enumerate(self.categories):
+            active = np.flatnonzero(values[c].sum(axis=0))
+            if len(active):
+                active_weeks[category] = (int(active[0]), int(active[-1]))
+
+        cube = WeeklySalesCube(
+            values=np.ascontiguousarray(values),
+            categories=list(self.categories),
+            stores=list(self.stores),
+            first_week=int(weeks[0]),
+            active_weeks=active_weeks,
+        )
+        cube.save(directory)
+        return cube
@@ -0,0 +1,168 @@
+"""
+Seasonality Profiles
+
+Compact description of a fitted Prophet model's seasonal structure,
+computed once when the model is trained and cached with it (one per
+category, inside the category's cached ensemble):
+
+    yearly      yearly component for each week of the year (7-day buckets
+                from January 1; the last one or two days of the year read
+                week 52)
+    weekly      weekly component on the week-ending weekday (weekly sales
+                only ever show Prophet one weekday, so it is a constant)
+    trend       trend level at the first week after the history and its
+                slope per week (Prophet's trend is linear past the last
+                changepoint)
+
+The explainability payload of any forecast window (yearly effect per week,
+peak/trough week, seasonal range, months covered, trend) is then a slice of
+the profile rather than a read of Prophet's forecast frame, and summary()
+condenses it to a few numbers for the agent.
+
+Usage:
+    profile = profile_from_prophet(model)               # after model.fit(...)
+    profile.window(forecast_dates)    # dict in the SeasonalityInsight layout
+    profile.summary(forecast_dates)   # dict in the SeasonalitySummary layout
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from prophet import Prophet
+
+logger = logging.getLogger("seasonality_profile")
+
+WEEKS_PER_YEAR = 52
+
+
+def week_of_year(dates: pd.DatetimeIndex) -> np.ndarray:
+    """0-based week of the year: 7-day buckets from January 1, capped at 51."""
+    return np.minimum((dates.dayofyear.to_numpy() - 1) // 7, WEEKS_PER_YEAR - 1)
+
+
+@dataclass(frozen=True)
+class SeasonalityProfile:
+    """Yearly/weekly effects and trend of one fitted model."""
+
+    yearly: Tuple[float, ...]   # (52,) yearly component by week of year (week_of_year())
+    weekly: float               # weekly component on the week-ending weekday
+    trend_start: date           # first week after the history
+    trend_level: float          # trend at trend_start (units)
+    trend_slope: float          # trend change per week (units)
+    multiplicative: bool        # components are fractions of the trend (else units)
+
+    def _components(self, dates: Sequence) -> Tuple[pd.DatetimeIndex, np.ndarray, np.ndarray, np.ndarray]:
+        """(dates, yearly, trend, yearly as a fraction of the trend) for a window."""
+        dates = pd.DatetimeIndex(pd.to_datetime(dates))
+        yearly = np.asarray(self.yearly)[week_of_year(dates)]
+        weeks_ahead = (dates - pd.Timestamp(self.trend_start)).days.to_numpy() / 7
+        trend = self.trend_level + self.trend_slope * weeks_ahead
+        if self.multiplicative:
+            relative = yearly
+        else:
+            mean_trend = float(np.mean(trend)) if len(trend) else 0.0
+            relative = yearly / mean_trend if mean_trend > 0 else np.zeros_like(yearly)
+        return dates, yearly, trend, relative
+
+    def window(self, dates: Sequence) -> Dict:
+        """
+        Explainability payload of a forecast window.
+
+        Returns dict with:
+        - yearly_effect: Yearly seasonality component per week
+        - weekly_effect: Weekly seasonality component per week
+        - trend: Trend component per week
+        - peak_week / trough_week: 1-indexed weeks of the highest/lowest yearly effect
+        - seasonal_range_pct: Yearly swing over the window as a percentage of the trend
+        - months_covered: Month names in the window
+        """
+        index, yearly, trend, relative = self._components(dates)
+        if len(index) == 0:
+            return {
+                "yearly_effect": [], "weekly_effect": [], "trend": [], "peak_week": 0,
+                "trough_week": 0, "seasonal_range_pct": 0.0, "months_covered": [],
+            }
+        return {
+            "yearly_effect": [round(float(v), 2) for v in yearly],
+            "weekly_effect": [round(self.weekly, 2)] * len(index),
+            "trend": [round(float(v), 2) for v in trend],
+            "peak_week": int(np.argmax(yearly)) + 1,
+            "trough_week": int(np.argmin(yearly)) + 1,
+            "seasonal_range_pct": round(float(relative.max() - relative.min()) * 100, 1),
+            "months_covered": list(dict.fromkeys(index.strftime("%B"))),
+        }
+
+    def summary(self, dates: Sequence) -> Dict:
+        """
+        A few numbers describing a forecast window's seasonality.
+
+        Returns dict with months_covered, peak_week, trough_week,
+        seasonal_range_pct, peak_effect_pct / trough_effect_pct (yearly
+        effect at the peak/trough week, % of trend), trend_pct_per_week and a
+        one-line description
+        """
+        index, yearly, trend, relative = self._components(dates)
+        if len(index) == 0:
+            return {
+                "months_covered": [], "peak_week": 0, "trough_week": 0, "seasonal_range_pct": 0.0,
+                "peak_effect_pct": 0.0, "trough_effect_pct": 0.0, "trend_pct_per_week": 0.0,
+                "description": "",
+            }
+        peak, trough = int(np.argmax(yearly)), int(np.argmin(yearly))
+        months = list(dict.fromkeys(index.strftime("%B")))
+        range_pct = round(float(relative.max() - relative.min()) * 100, 1)
+        peak_pct = round(float(relative[peak]) * 100, 1)
+        trough_pct = round(float(relative[trough]) * 100, 1)
+        trend_pct = round(self.trend_slope / self.trend_level * 100, 2) if self.trend_level > 0 else 0.0
+        span = months[0] if len(months) == 1 else f"{months[0]}-{months[-1]}"
+        return {
+            "months_covered": months,
+            "peak_week": peak + 1,
+            "trough_week": trough + 1,
+            "seasonal_range_pct": range_pct,
+            "peak_effect_pct": peak_pct,
+            "trough_effect_pct": trough_pct,
+            "trend_pct_per_week": trend_pct,
+            "description": (
+                f"{span}: peak week {peak + 1} ({peak_pct:+.0f}%), trough week {trough + 1} "
+                f"({trough_pct:+.0f}%), seasonal swing {range_pct:.0f}%, trend {trend_pct:+.2f}%/week"
+            ),
+        }
+
+
+def profile_from_prophet(model: "Prophet") -> SeasonalityProfile:
+    """
+    Seasonality profile of a fitted Prophet model.
+
+    The yearly component is evaluated at the middle of each week-of-year
+    bucket of the year after the history, the weekly component on the
+    history's week-ending weekday, and the trend on the year after the
+    history. Only Prophet's component functions run (no uncertainty
+    sampling, no full predict).
+    """
+    future = model.make_future_dataframe(periods=WEEKS_PER_YEAR, freq="W", include_history=False)
+    trend = np.asarray(model.predict_trend(model.setup_dataframe(future.copy())))
+
+    # Mid-bucket dates for the yearly effect; the weekly effect on the week-ending weekday
+    year_start = pd.Timestamp(future["ds"].iloc[0].year, 1, 1)
+    buckets = pd.DataFrame({"ds": year_start + pd.to_timedelta(np.arange(WEEKS_PER_YEAR) * 7 + 3, unit="D")})
+    yearly_components = model.predict_seasonal_components(model.setup_dataframe(buckets))
+    weekly_components = model.predict_seasonal_components(model.setup_dataframe(future.iloc[:1].copy()))
+
+    yearly = yearly_components["yearly"].to_numpy() if "yearly" in yearly_components else np.zeros(WEEKS_PER_YEAR)
+    weekly = float(weekly_components["weekly"].iloc[0]) if "weekly" in weekly_components else 0.0
+
+    return SeasonalityProfile(
+        yearly=tuple(float(v) for v in yearly),
+        weekly=weekly,
+        trend_start=future["ds"].iloc[0].date(),
+        trend_level=float(trend[0]),
+        trend_slope=float((trend[-1] - trend[0]) / (len(trend) - 1)),
+        multiplicative=model.seasonality_mode == "multiplicative",
+    )
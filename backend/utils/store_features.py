@@ -0,0 +1,128 @@
+"""
+Store Feature Layer
+
+Encoded, standardized and weighted store feature matrix shared by the
+clustering and allocation tools. The matrix is computed once per store
+attributes file version and feature-weight setting and cached on the data
+loader, so one planning run parses and encodes store attributes once
+instead of once per tool call.
+
+Usage:
+    features = data_loader.get_store_features(StoreClusterer.DEFAULT_FEATURE_WEIGHTS)
+    features.weighted      # (n_stores, 7) matrix ready for K-means
+    features.scaler        # fitted StandardScaler (for predicting new stores)
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# scikit-learn is imported when the matrix is first built (it is slow to import)
+if TYPE_CHECKING:
+    from sklearn.preprocessing import StandardScaler
+
+STORE_FEATURES = [
+    "avg_weekly_sales_12mo",
+    "store_size_sqft",
+    "median_income",
+    "location_tier",
+    "fashion_tier",
+    "store_format",
+    "region",
+]
+
+LOCATION_TIER_MAP = {"A": 3, "B": 2, "C": 1}
+FASHION_TIER_MAP = {"Premium": 3, "Mainstream": 2, "Value": 1}
+STORE_FORMAT_MAP = {"Mall": 4, "Standalone": 3, "ShoppingCenter": 2, "Outlet": 1}
+REGION_MAP = {"Northeast": 1, "Southeast": 2, "Midwest": 3, "West": 4}
+
+ORDINAL_MAPS = {
+    "location_tier": LOCATION_TIER_MAP,
+    "fashion_tier": FASHION_TIER_MAP,
+    "store_format": STORE_FORMAT_MAP,
+    "region": REGION_MAP,
+}
+
+
+def encode_store_features(store_attributes: pd.DataFrame) -> pd.DataFrame:
+    """
+    Select the clustering features and ordinal-encode the categorical ones.
+
+    Args:
+        store_attributes: Store attributes indexed by store_id
+
+    Returns:
+        DataFrame with the 7 STORE_FEATURES columns, all numeric
+    """
+    encoded = store_attributes[STORE_FEATURES].copy()
+    for column, mapping in ORDINAL_MAPS.items():
+        encoded[column] = encoded[column].map(mapping)
+    return encoded
+
+
+def weights_key(feature_weights: Dict[str, float]) -> Tuple[Tuple[str, float], ...]:
+    """Hashable cache key for a feature-weight dict."""
+    return tuple(sorted((k, float(v)) for k, v in feature_weights.items()))
+
+
+def apply_feature_weights(
+    features_scaled: np.ndarray,
+    feature_names: List[str],
+    feature_weights: Dict[str, float],
+) -> np.ndarray:
+    """Multiply each scaled feature column by its weight (unweighted columns unchanged)."""
+    column_weights = np.array([feature_weights.get(name, 1.0) for name in feature_names])
+    return features_scaled * column_weights
+
+
+@dataclass
+class StoreFeatureMatrix:
+    """Store features at every stage of the clustering pipeline."""
+
+    fingerprint: str                # store attributes file version
+    feature_weights: Dict[str, float]
+    store_ids: List[str]
+    encoded: pd.DataFrame           # ordinal-encoded features (rows = stores)
+    scaler: "StandardScaler"        # fitted on `encoded`
+    scaled: np.ndarray              # standardized (mean=0, std=1)
+    weighted: np.ndarray            # scaled × feature weights
+
+    @property
+    def feature_names(self) -> List[str]:
+        return list(self.encoded.columns)
+
+
+def build_store_features(
+    store_attributes: pd.DataFrame,
+    feature_weights: Dict[str, float],
+    fingerprint: str,
+) -> StoreFeatureMatrix:
+    """
+    Encode, standardize and weight store attributes.
+
+    Args:
+        store_attributes: Store attributes indexed by store_id
+        feature_weights: Feature -> weight
+        fingerprint: Version of the attributes the matrix was built from
+
+    Returns:
+        StoreFeatureMatrix
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    encoded = encode_store_features(store_attributes)
+    scaler = StandardScaler()
+    scaled = scaler.fit_transform(encoded)
+    weighted = apply_feature_weights(scaled, list(encoded.columns), feature_weights)
+
+    return StoreFeatureMatrix(
+        fingerprint=fingerprint,
+        feature_weights=dict(feature_weights),
+        store_ids=[str(s) for s in store_attributes.index],
+        encoded=encoded,
+        scaler=scaler,
+        scaled=scaled,
+        weighted=weighted,
+    )
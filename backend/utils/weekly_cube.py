@@ -0,0 +1,362 @@
+"""
+Weekly Sales Cube
+
+Dense, pre-aggregated weekly sales array indexed by category, store and
+ISO week (Monday-Sunday, labelled by the Sunday week-ending date, the same
+bins as pandas' resample("W")). The cube is materialized once from the
+columnar sales cache and saved alongside it, so category totals, store
+series and cluster/region rollups become slices or sums over one array
+instead of repeated DataFrame re-aggregation.
+
+Usage:
+    cube = data_loader.get_weekly_cube()
+    totals = cube.category_series("Women's Dresses")          # (n_weeks,)
+    by_store = cube.store_matrix("Women's Dresses")            # (n_stores, n_weeks)
+    regions = cube.rollup("Women's Dresses", store_to_region)  # {region: (n_weeks,)}
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import date, timedelta
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .sales_cache import ColumnarSalesCache, EPOCH
+
+logger = logging.getLogger("weekly_cube")
+
+CUBE_DIR_NAME = "weekly_cube"
+
+# 1970-01-01 was a Thursday; shifting by 3 days puts ISO week starts (Monday) at 0 mod 7
+_ISO_WEEK_SHIFT = 3
+
+
+def days_to_week_index(days: Union[np.ndarray, np.integer, int]) -> np.ndarray:
+    """Map days since epoch to a Monday-aligned absolute week number."""
+    return (np.asarray(days, dtype=np.int64) + _ISO_WEEK_SHIFT) // 7
+
+
+def week_index_to_week_end(weeks: np.ndarray) -> np.ndarray:
+    """Sunday week-ending date (datetime64[D]) of absolute week numbers."""
+    return EPOCH + (np.asarray(weeks, dtype=np.int64) * 7 - _ISO_WEEK_SHIFT + 6).astype(
+        "timedelta64[D]"
+    )
+
+
+def season_week_end(season_start: date, week: int) -> date:
+    """
+    Sunday week-ending date of a 1-indexed season week.
+
+    Season weeks run 7 days from season_start; each maps to the ISO week
+    holding most of its days (the one containing its 4th day), so a season
+    that starts mid-week still lands on the cube's Monday-Sunday bins.
+    """
+    middle = season_start + timedelta(weeks=week - 1, days=3)
+    return middle + timedelta(days=6 - middle.weekday())
+
+
+@dataclass
+class WeeklySalesCube:
+    """Weekly units sold as a (category × store × week) array."""
+
+    values: np.ndarray                      # int64, shape (n_categories, n_stores, n_weeks)
+    categories: List[str]
+    stores: List[str]
+    first_week: int                         # absolute week number of values[..., 0]
+    active_weeks: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # category -> [first, last] column
+    # category -> [first, last] absolute week inside the active span with no data
+    # (between the history and in-season actuals anchored to a later season start)
+    gap_weeks: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    category_index: Dict[str, int] = field(init=False)
+    store_index: Dict[str, int] = field(init=False)
+
+    def __post_init__(self):
+        self.category_index = {c: i for i, c in enumerate(self.categories)}
+        self.store_index = {s: i for i, s in enumerate(self.stores)}
+
+    @property
+    def n_weeks(self) -> int:
+        return self.values.shape[2]
+
+    @property
+    def week_ends(self) -> np.ndarray:
+        """Sunday week-ending dates for every column of the cube."""
+        return week_index_to_week_end(self.first_week + np.arange(self.n_weeks))
+
+    # ------------------------------------------------------------------
+    # Slices
+    # ------------------------------------------------------------------
+
+    def _store_rows(self, stores: Optional[Sequence[str]]) -> np.ndarray:
+        if stores is None:
+            return np.arange(len(self.stores))
+        return np.array([self.store_index[s] for s in stores if s in self.store_index], dtype=np.int64)
+
+    def store_matrix(self, category: str, stores: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Weekly series for each store of a category, shape (n_stores, n_weeks)."""
+        c = self.category_index[category]
+        if stores is None:
+            return self.values[c]
+        return self.values[c, self._store_rows(stores)]
+
+    def store_series(self, category: str, store_id: str) -> np.ndarray:
+        """Weekly series for one store of a category."""
+        return self.values[self.category_index[category], self.store_index[store_id]]
+
+    def category_series(self, category: str, stores: Optional[Sequence[str]] = None) -> np.ndarray:
+        """Weekly category totals, optionally restricted to a subset of stores."""
+        return self.store_matrix(category, stores).sum(axis=0)
+
+    def rollup(self, category: str, groups: Dict[str, str]) -> Dict[str, np.ndarray]:
+        """
+        Sum store series into groups (clusters, regions, ...).
+
+        Args:
+            category: Category to roll up
+            groups: Mapping store_id -> group label (stores not in the cube are ignored)
+
+        Returns:
+            Dict of group label -> weekly totals
+        """
+        labels = sorted(set(groups.values()))
+        label_index = {label: i for i, label in enumerate(labels)}
+        member_rows, member_groups = [], []
+        for store_id, label in groups.items():
+            row = self.store_index.get(store_id)
+            if row is not None:
+                member_rows.append(row)
+                member_groups.append(label_index[label])
+
+        totals = np.zeros((len(labels), self.n_weeks), dtype=self.values.dtype)
+        if member_rows:
+            np.add.at(totals, np.array(member_groups), self.store_matrix(category)[np.array(member_rows)])
+        return {label: totals[i] for label, i in label_index.items()}
+
+    def store_shares(
+        self,
+        category: str,
+        recent_weeks: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """
+        Each store's share of the category's historical units.
+
+        Args:
+            category: Category to measure
+            recent_weeks: Only use the last N active weeks (default: full history)
+
+        Returns:
+            Dict store_id -> share (sums to 1.0 when the category has any sales)
+        """
+        matrix = self.store_matrix(category)
+        if category in self.active_weeks:
+            columns = self.observed_columns(category)
+        else:
+            columns = np.arange(self.n_weeks)
+        if recent_weeks is not None:
+            columns = columns[-recent_weeks:] if recent_weeks > 0 else columns[:0]
+        store_totals = matrix[:, columns].sum(axis=1).astype(float)
+        grand_total = store_totals.sum()
+        if grand_total <= 0:
+            return {}
+        return {s: float(store_totals[i] / grand_total) for i, s in enumerate(self.stores)}
+
+    def observed_columns(self, category: str) -> np.ndarray:
+        """Columns of a category's active span, without its unobserved gap weeks."""
+        if category not in self.active_weeks:
+            return np.array([], dtype=np.int64)
+        first, last = self.active_weeks[category]
+        columns = np.arange(first, last + 1)
+        if category in self.gap_weeks:
+            gap_first, gap_last = self.gap_weeks[category]
+            weeks = self.first_week + columns
+            columns = columns[(weeks < gap_first) | (weeks > gap_last)]
+        return columns
+
+    def category_frame(self, category: str, stores: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Weekly category totals as a DataFrame ready for model training.
+
+        Matches the output of clean_historical_sales + aggregate_to_weekly:
+        columns 'date' (week-ending Sunday) and 'quantity_sold', spanning the
+        category's first to last week with sales. Unobserved gap weeks (see
+        gap_weeks) are left out rather than reported as zero sales.
+        """
+        if category not in self.active_weeks:
+            return pd.DataFrame(columns=["date", "quantity_sold"])
+
+        columns = self.observed_columns(category)
+        series = self.category_series(category, stores)[columns]
+        return pd.DataFrame({
+            "date": self.week_ends[columns].astype("datetime64[ns]"),
+            "quantity_sold": series.astype(np.int64),
+        })
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    # ------------------------------------------------------------------
+
+    def apply_sales(self, rows: Sequence[Tuple[str, str, str, int]]) -> None:
+        """
+        Add daily unit deltas in place, growing the cube when needed.
+
+        Used to layer in-season actuals over the base history without
+        rebuilding: cost is O(rows) plus a copy only when a new category,
+        store or week has to be added. A category's active weeks are
+        stretched to cover the rows, so callers must only pass weeks that
+        continue its series (see actuals_log.continuing_rows) and record any
+        unobserved weeks in gap_weeks; they would otherwise read as zero sales.
+
+        Args:
+            rows: (category, date 'YYYY-MM-DD', store_id, quantity delta) tuples
+        """
+        if not rows:
+            return
+
+        new_categories = sorted({r[0] for r in rows} - set(self.category_index))
+        new_stores = sorted({r[2] for r in rows} - set(self.store_index))
+        days = (np.array([r[1] for r in rows], dtype="datetime64[D]") - EPOCH).astype(np.int64)
+        weeks = days_to_week_index(days)
+
+        if self.n_weeks == 0:
+            self.first_week = int(weeks.min())
+        prepend = max(0, self.first_week - int(weeks.min()))
+        append = max(0, int(weeks.max()) - (self.first_week + self.n_weeks - 1))
+
+        if new_categories or new_stores or prepend or append:
+            self.values = np.pad(
+                self.values,
+                ((0, len(new_categories)), (0, len(new_stores)), (prepend, append)),
+            )
+            self.categories = self.categories + new_categories
+            self.stores = self.stores + new_stores
+            self.first_week -= prepend
+            self.active_weeks = {
+                c: (first + prepend, last + prepend) for c, (first, last) in self.active_weeks.items()
+            }
+            self.__post_init__()
+
+        cat_rows = np.array([self.category_index[r[0]] for r in rows], dtype=np.int64)
+        store_rows = np.array([self.store_index[r[2]] for r in rows], dtype=np.int64)
+        columns = weeks - self.first_week
+        np.add.at(self.values, (cat_rows, store_rows, columns), np.array([r[3] for r in rows], dtype=np.int64))
+
+        for c in np.unique(cat_rows):
+            category = self.categories[c]
+            touched = columns[cat_rows == c]
+            first, last = int(touched.min()), int(touched.max())
+            if category in self.active_weeks:
+                first = min(first, self.active_weeks[category][0])
+                last = max(last, self.active_weeks[category][1])
+            self.active_weeks[category] = (first, last)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, directory: Path) -> None:
+        """Save the cube (values + lookup tables) into a directory."""
+        directory = Path(directory)
+        tmp_dir = directory.parent / f"{directory.name}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        np.save(tmp_dir / "values.npy", self.values)
+        with open(tmp_dir / "index.json", "w") as f:
+            json.dump({
+                "categories": self.categories,
+                "stores": self.stores,
+                "first_week": self.first_week,
+                "active_weeks": {k: list(v) for k, v in self.active_weeks.items()},
+            }, f)
+
+        try:
+            os.rename(tmp_dir, directory)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: Path) -> "WeeklySalesCube":
+        """Load a cube saved with save()."""
+        directory = Path(directory)
+        with open(directory / "index.json", "r") as f:
+            index = json.load(f)
+        return cls(
+            values=np.load(directory / "values.npy"),
+            categories=index["categories"],
+            stores=index["stores"],
+            first_week=int(index["first_week"]),
+            active_weeks={k: (int(v[0]), int(v[1])) for k, v in index["active_weeks"].items()},
+        )
+
+
+def build_weekly_cube(cache: ColumnarSalesCache) -> WeeklySalesCube:
+    """
+    Aggregate every category partition of the columnar cache into a weekly cube.
+
+    Each partition is binned with a single np.bincount over (store, week)
+    codes, so the cost is one pass over the daily rows.
+    """
+    categories = cache.get_categories()
+    stores = cache.get_stores()
+    partitions: Dict[str, Dict[str, np.ndarray]] = {}
+    for category in categories:
+        partition = cache.read_partition(category)
+        if partition is not None:
+            partitions[category] = partition
+
+    day_bounds = [
+        (int(p["date"].min()), int(p["date"].max()))
+        for p in partitions.values() if len(p["date"]) > 0
+    ]
+    if not day_bounds:
+        return WeeklySalesCube(
+            values=np.zeros((len(categories), len(stores), 0), dtype=np.int64),
+            categories=categories, stores=stores, first_week=0,
+        )
+
+    first_week = int(days_to_week_index(min(b[0] for b in day_bounds)))
+    last_week = int(days_to_week_index(max(b[1] for b in day_bounds)))
+    n_weeks = last_week - first_week + 1
+    n_stores = len(stores)
+
+    values = np.zeros((len(categories), n_stores, n_weeks), dtype=np.int64)
+    active_weeks: Dict[str, Tuple[int, int]] = {}
+
+    for c, category in enumerate(categories):
+        partition = partitions.get(category)
+        if partition is None or len(partition["date"]) == 0:
+            continue
+        weeks = days_to_week_index(partition["date"]) - first_week
+        flat = partition["store"].astype(np.int64) * n_weeks + weeks
+        values[c] = np.bincount(
+            flat, weights=partition["quantity"], minlength=n_stores * n_weeks
+        ).reshape(n_stores, n_weeks).astype(np.int64)
+        active_weeks[category] = (int(weeks.min()), int(weeks.max()))
+
+    logger.info(
+        f"Weekly cube built: {len(categories)} categories × {n_stores} stores × {n_weeks} weeks"
+    )
+    return WeeklySalesCube(
+        values=values,
+        categories=categories,
+        stores=stores,
+        first_week=first_week,
+        active_weeks=active_weeks,
+    )
+
+
+def load_or_build_weekly_cube(cache: ColumnarSalesCache) -> WeeklySalesCube:
+    """Load the cube saved in the current cache version, building it if missing."""
+    directory = cache.cache_dir / CUBE_DIR_NAME
+    if (directory / "index.json").exists():
+        return WeeklySalesCube.load(directory)
+
+    cube = build_weekly_cube(cache)
+    cube.save(directory)
+    return cube
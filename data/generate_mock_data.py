@@ -9,6 +9,10 @@ Requirements:
 Usage:
     python generate_mock_data.py --validate
     python generate_mock_data.py --regenerate --validate
+
+    # Load-testing datasets (vectorized, written in chunks; Parquet needs pyarrow).
+    # Written to load_test/ (or next to --output); training/ is never touched
+    python generate_mock_data.py --sales-only --stores 5000 --categories 200 --format parquet
 """
 
 import numpy as np
@@ -43,6 +47,57 @@ HISTORICAL_END = datetime(2024, 12, 31)
 TESTING_START = datetime(2025, 2, 17)  # Monday
 TESTING_END = datetime(2025, 5, 11)    # Sunday (12 weeks later)
 
+# Rows generated and written per chunk by generate_historical_sales
+CHUNK_ROWS = 2_000_000
+
+# Monthly seasonality factors (Jan..Dec)
+SEASONALITY = {
+    "Women's Dresses": [0.6, 0.7, 1.2, 1.4, 1.5, 1.3, 1.2, 1.1, 0.9, 0.8, 0.7, 0.8],
+    "Men's Shirts": [0.9, 0.9, 1.0, 1.0, 1.0, 1.1, 1.0, 1.2, 1.1, 1.0, 1.0, 1.0],
+    "Accessories": [0.6, 0.8, 0.9, 1.0, 1.0, 0.9, 0.8, 0.9, 1.0, 1.1, 1.6, 1.8],
+}
+
+# Day-of-week multipliers (Mon..Sun)
+WEEKLY_PATTERN = {
+    "Women's Dresses": [0.8, 0.9, 1.0, 1.1, 1.3, 1.5, 1.2],     # Strong weekend effect
+    "Men's Shirts": [0.95, 0.95, 1.0, 1.0, 1.1, 1.15, 1.05],    # More stable pattern
+    "Accessories": [0.7, 0.8, 0.9, 1.0, 1.4, 1.6, 1.3],         # Very strong weekend effect
+}
+
+# Holiday windows: (month, first_day, last_day, multiplier)
+HOLIDAY_WINDOWS = {
+    "Women's Dresses": [
+        (2, 12, 15, 1.30),   # Valentine's Day
+        (5, 10, 14, 1.40),   # Mother's Day (second Sunday in May, approximate)
+        (8, 15, 31, 1.20),   # End of Season Sale
+    ],
+    "Men's Shirts": [
+        (6, 15, 18, 1.25),   # Father's Day (third Sunday in June, approximate)
+        (8, 20, 31, 1.15),   # Back to School (Aug 20 - Sep 10)
+        (9, 1, 10, 1.15),
+        (11, 27, 30, 1.35),  # Black Friday (approx)
+    ],
+    "Accessories": [
+        (2, 12, 15, 1.50),   # Valentine's Day (gifts)
+        (11, 27, 30, 1.80),  # Black Friday
+        (12, 18, 24, 2.00),  # Week before Christmas
+    ],
+}
+
+# Year-over-year growth rate (CAGR)
+CAGR = {
+    "Women's Dresses": 0.08,  # 8% growth
+    "Men's Shirts": 0.03,      # 3% growth
+    "Accessories": 0.05        # 5% growth
+}
+
+# Base daily sales per store and category (before any adjustments)
+BASE_DAILY_SALES = {
+    "Women's Dresses": 50,
+    "Men's Shirts": 35,
+    "Accessories": 45
+}
+
 
 def set_seed(regenerate=False):
     """Set random seed for reproducibility"""
@@ -67,45 +122,12 @@ def calculate_seasonality(date, category):
     Returns:
         float: seasonality multiplier (0.6 to 1.8)
     """
-    month = date.month
-
-    if category == "Women's Dresses":
-        monthly_factors = {
-            1: 0.6, 2: 0.7, 3: 1.2, 4: 1.4, 5: 1.5,
-            6: 1.3, 7: 1.2, 8: 1.1, 9: 0.9, 10: 0.8,
-            11: 0.7, 12: 0.8
-        }
-    elif category == "Men's Shirts":
-        monthly_factors = {
-            1: 0.9, 2: 0.9, 3: 1.0, 4: 1.0, 5: 1.0,
-            6: 1.1, 7: 1.0, 8: 1.2, 9: 1.1, 10: 1.0,
-            11: 1.0, 12: 1.0
-        }
-    else:  # Accessories
-        monthly_factors = {
-            1: 0.6, 2: 0.8, 3: 0.9, 4: 1.0, 5: 1.0,
-            6: 0.9, 7: 0.8, 8: 0.9, 9: 1.0, 10: 1.1,
-            11: 1.6, 12: 1.8
-        }
-
-    return monthly_factors[month]
+    return SEASONALITY[category][date.month - 1]
 
 
 def get_weekly_pattern(date, category):
     """Returns weekly pattern multiplier based on day of week"""
-    day = date.weekday()  # Monday=0, Sunday=6
-
-    if category == "Women's Dresses":
-        # Strong weekend effect
-        weekly = [0.8, 0.9, 1.0, 1.1, 1.3, 1.5, 1.2]
-    elif category == "Men's Shirts":
-        # More stable pattern
-        weekly = [0.95, 0.95, 1.0, 1.0, 1.1, 1.15, 1.05]
-    else:  # Accessories
-        # Very strong weekend effect
-        weekly = [0.7, 0.8, 0.9, 1.0, 1.4, 1.6, 1.3]
-
-    return weekly[day]
+    return WEEKLY_PATTERN[category][date.weekday()]  # Monday=0, Sunday=6
 
 
 def apply_holiday_spike(date, category, base_sales):
@@ -120,121 +142,75 @@ def apply_holiday_spike(date, category, base_sales):
     Returns:
         float: adjusted sales quantity
     """
-    # Define holidays with (month, day, duration_days, multiplier)
-    holidays = []
-
-    if category == "Women's Dresses":
-        # Valentine's Day
-        if date.month == 2 and 12 <= date.day <= 15:
-            return base_sales * 1.30
-        # Mother's Day (second Sunday in May, approximate May 10-14)
-        if date.month == 5 and 10 <= date.day <= 14:
-            return base_sales * 1.40
-        # End of Season Sale (Aug 15-31)
-        if date.month == 8 and date.day >= 15:
-            return base_sales * 1.20
-
-    elif category == "Men's Shirts":
-        # Father's Day (third Sunday in June, approximate June 15-18)
-        if date.month == 6 and 15 <= date.day <= 18:
-            return base_sales * 1.25
-        # Back to School (Aug 20 - Sep 10)
-        if (date.month == 8 and date.day >= 20) or (date.month == 9 and date.day <= 10):
-            return base_sales * 1.15
-        # Black Friday (Nov 29, approx)
-        if date.month == 11 and 27 <= date.day <= 30:
-            return base_sales * 1.35
-
-    else:  # Accessories
-        # Valentine's Day (gifts)
-        if date.month == 2 and 12 <= date.day <= 15:
-            return base_sales * 1.50
-        # Black Friday
-        if date.month == 11 and 27 <= date.day <= 30:
-            return base_sales * 1.80
-        # Week before Christmas (Dec 18-24)
-        if date.month == 12 and 18 <= date.day <= 24:
-            return base_sales * 2.00
+    for month, first_day, last_day, multiplier in HOLIDAY_WINDOWS[category]:
+        if date.month == month and first_day <= date.day <= last_day:
+            return base_sales * multiplier
 
     return base_sales
 
 
 def calculate_growth_rate(date, category):
     """Calculate year-over-year growth rate (CAGR)"""
-    cagr = {
-        "Women's Dresses": 0.08,  # 8% growth
-        "Men's Shirts": 0.03,      # 3% growth
-        "Accessories": 0.05        # 5% growth
-    }
-
     # Calculate years since start of historical period
     years_elapsed = (date - HISTORICAL_START).days / 365.25
-    growth_multiplier = (1 + cagr[category]) ** years_elapsed
+    growth_multiplier = (1 + CAGR[category]) ** years_elapsed
 
     return growth_multiplier
 
 
-def generate_store_attributes():
+def generate_store_attributes(n_stores=NUM_STORES, output_path='training/store_attributes.csv'):
     """
     Generate store_attributes.csv with correlated features for K-means clustering
 
+    Stores are split 30% / 40% / 30% into three intended clusters
+    (Fashion_Forward, Mainstream, Value_Conscious); all features are drawn
+    in one vectorized pass per cluster.
+
+    Args:
+        n_stores: number of stores (default: 50)
+        output_path: CSV to write (None to skip saving)
+
     Returns:
-        DataFrame: Store attributes with 50 stores × 8 columns
+        DataFrame: Store attributes with n_stores × 8 columns
     """
-    print("Generating store attributes...")
-
-    stores = []
-
-    # Generate 50 stores with 3 intended clusters
-    for i in range(1, NUM_STORES + 1):
-        store_id = f"S{i:03d}"
-
-        # Determine cluster intent (Fashion_Forward: 15, Mainstream: 20, Value_Conscious: 15)
-        if i <= 15:
-            # Fashion_Forward cluster
-            size_sqft = np.random.randint(10000, 15000)
-            income_level = np.random.randint(100000, 150000)
-            foot_traffic = np.random.randint(2000, 3000)
-            competitor_density = np.random.uniform(3.0, 8.0)
-            online_penetration = np.random.uniform(0.40, 0.60)
-            population_density = np.random.randint(8000, 15000)
-            mall_location = np.random.choice([True, False], p=[0.7, 0.3])
-        elif i <= 35:
-            # Mainstream cluster
-            size_sqft = np.random.randint(6000, 10000)
-            income_level = np.random.randint(60000, 100000)
-            foot_traffic = np.random.randint(800, 2000)
-            competitor_density = np.random.uniform(2.0, 5.0)
-            online_penetration = np.random.uniform(0.25, 0.45)
-            population_density = np.random.randint(3000, 8000)
-            mall_location = np.random.choice([True, False], p=[0.5, 0.5])
-        else:
-            # Value_Conscious cluster
-            size_sqft = np.random.randint(3000, 6000)
-            income_level = np.random.randint(35000, 60000)
-            foot_traffic = np.random.randint(300, 800)
-            competitor_density = np.random.uniform(0.5, 3.0)
-            online_penetration = np.random.uniform(0.15, 0.35)
-            population_density = np.random.randint(500, 3000)
-            mall_location = np.random.choice([True, False], p=[0.2, 0.8])
-
-        stores.append({
-            'store_id': store_id,
-            'size_sqft': size_sqft,
-            'income_level': income_level,
-            'foot_traffic': foot_traffic,
-            'competitor_density': round(competitor_density, 2),
-            'online_penetration': round(online_penetration, 2),
-            'population_density': population_density,
-            'mall_location': mall_location
-        })
-
-    df = pd.DataFrame(stores)
+    print(f"Generating store attributes ({n_stores} stores)...")
+
+    # Cluster sizes: 15 / 20 / 15 for the default 50 stores
+    n_fashion = int(round(0.3 * n_stores))
+    n_mainstream = int(round(0.7 * n_stores)) - n_fashion
+    n_value = n_stores - n_fashion - n_mainstream
+
+    # (size_sqft, income_level, foot_traffic, population_density) integer ranges,
+    # (competitor_density, online_penetration) float ranges, P(mall_location)
+    clusters = [
+        (n_fashion, (10000, 15000), (100000, 150000), (2000, 3000), (8000, 15000),
+         (3.0, 8.0), (0.40, 0.60), 0.7),
+        (n_mainstream, (6000, 10000), (60000, 100000), (800, 2000), (3000, 8000),
+         (2.0, 5.0), (0.25, 0.45), 0.5),
+        (n_value, (3000, 6000), (35000, 60000), (300, 800), (500, 3000),
+         (0.5, 3.0), (0.15, 0.35), 0.2),
+    ]
+
+    frames = []
+    for n, size, income, traffic, density, competitors, online, p_mall in clusters:
+        frames.append(pd.DataFrame({
+            'size_sqft': np.random.randint(*size, size=n),
+            'income_level': np.random.randint(*income, size=n),
+            'foot_traffic': np.random.randint(*traffic, size=n),
+            'competitor_density': np.random.uniform(*competitors, size=n).round(2),
+            'online_penetration': np.random.uniform(*online, size=n).round(2),
+            'population_density': np.random.randint(*density, size=n),
+            'mall_location': np.random.random(n) < p_mall,
+        }))
+
+    df = pd.concat(frames, ignore_index=True)
+    width = max(3, len(str(n_stores)))
+    df.insert(0, 'store_id', [f"S{i:0{width}d}" for i in range(1, n_stores + 1)])
 
     # Save to CSV
-    output_path = 'training/store_attributes.csv'
-    df.to_csv(output_path, index=False)
-    print(f"[OK] Generated {output_path} ({len(df)} stores)")
+    if output_path is not None:
+        df.to_csv(output_path, index=False)
+        print(f"[OK] Generated {output_path} ({len(df)} stores)")
 
     return df
 
@@ -265,93 +241,204 @@ def calculate_store_sales_multiplier(store_row):
     return np.clip(multiplier, 0.5, 2.0)
 
 
-def generate_historical_sales(store_attributes):
+def calculate_store_sales_multipliers(store_attributes):
     """
-    Generate historical_sales_2022_2024.csv with realistic patterns
+    Vectorized calculate_store_sales_multiplier for every store
 
     Args:
         store_attributes: DataFrame with store attributes
 
     Returns:
-        DataFrame: Historical sales data
+        np.ndarray: sales multiplier per store (0.5x to 2.0x)
     """
-    print("Generating historical sales (2022-2024)...")
+    multiplier = (
+        0.30 * (store_attributes['size_sqft'].to_numpy() / 10000) +
+        0.25 * (store_attributes['income_level'].to_numpy() / 100000) +
+        0.20 * (store_attributes['foot_traffic'].to_numpy() / 2000) +
+        0.10 * (1 - store_attributes['online_penetration'].to_numpy()) +
+        0.10 * (store_attributes['population_density'].to_numpy() / 10000) +
+        0.05 * store_attributes['mall_location'].to_numpy().astype(int)
+    )
 
-    sales_data = []
+    # Add ±20% noise
+    multiplier = multiplier * np.random.uniform(0.8, 1.2, size=len(multiplier))
 
-    # Calculate store multipliers once
-    store_multipliers = {}
-    for _, store in store_attributes.iterrows():
-        store_multipliers[store['store_id']] = calculate_store_sales_multiplier(store)
+    # Constrain to 0.5x - 2.0x range
+    return np.clip(multiplier, 0.5, 2.0)
 
-    # Base daily sales per category (before any adjustments)
-    base_daily_sales = {
-        "Women's Dresses": 50,
-        "Men's Shirts": 35,
-        "Accessories": 45
-    }
 
-    # Generate daily sales for each store, category, and date
-    current_date = HISTORICAL_START
-    total_days = (HISTORICAL_END - HISTORICAL_START).days + 1
+def build_category_profiles(n_categories=NUM_CATEGORIES):
+    """
+    Demand profiles for n categories
 
-    for day_num in range(total_days):
-        if day_num % 100 == 0:
-            print(f"  Progress: {day_num}/{total_days} days...")
+    The first three are the real categories. Additional synthetic categories
+    ("Category 004", ...) cycle through the three archetypes with jittered
+    base volume, price and growth, so large datasets keep today's shape.
 
-        for store_id in store_multipliers.keys():
-            for category in CATEGORIES:
-                # Calculate base quantity
-                base_qty = base_daily_sales[category]
+    Returns:
+        list of dicts: name, archetype, base_daily, base_price, cagr
+    """
+    profiles = []
+    for i in range(n_categories):
+        archetype = CATEGORIES[i % len(CATEGORIES)]
+        if i < len(CATEGORIES):
+            profiles.append({
+                'name': archetype,
+                'archetype': archetype,
+                'base_daily': BASE_DAILY_SALES[archetype],
+                'base_price': BASE_PRICES[archetype],
+                'cagr': CAGR[archetype],
+            })
+        else:
+            profiles.append({
+                'name': f"Category {i + 1:03d}",
+                'archetype': archetype,
+                'base_daily': BASE_DAILY_SALES[archetype] * np.random.uniform(0.5, 1.5),
+                'base_price': BASE_PRICES[archetype] * np.random.uniform(0.7, 1.3),
+                'cagr': CAGR[archetype] + np.random.uniform(-0.02, 0.02),
+            })
+    return profiles
 
-                # Apply adjustments
-                qty = base_qty
-                qty *= calculate_seasonality(current_date, category)
-                qty *= get_weekly_pattern(current_date, category)
-                qty = apply_holiday_spike(current_date, category, qty)
-                qty *= calculate_growth_rate(current_date, category)
-                qty *= store_multipliers[store_id]
 
-                # Add ±10-15% noise (cleaner historical data)
-                qty *= np.random.uniform(0.85, 1.15)
+def calculate_daily_category_factors(dates, profiles):
+    """
+    Base × seasonality × weekly pattern × holiday × growth for every category and day
 
-                # Round to integer and ensure non-negative
-                qty = max(0, int(round(qty)))
+    Args:
+        dates: pd.DatetimeIndex of days
+        profiles: category profiles from build_category_profiles
 
-                # Calculate revenue with ±10% price variability
-                base_price = BASE_PRICES[category]
-                actual_price = base_price * np.random.uniform(0.90, 1.10)
-                revenue = qty * actual_price
+    Returns:
+        np.ndarray: shape (n_categories, n_days), expected units per store before
+        store multiplier and noise
+    """
+    month_index = dates.month.to_numpy() - 1
+    weekday = dates.weekday.to_numpy()
+    day = dates.day.to_numpy()
+    years_elapsed = (dates - pd.Timestamp(HISTORICAL_START)).days.to_numpy() / 365.25
+
+    factors = np.empty((len(profiles), len(dates)))
+    for c, profile in enumerate(profiles):
+        archetype = profile['archetype']
+        holiday = np.ones(len(dates))
+        for month, first_day, last_day, multiplier in HOLIDAY_WINDOWS[archetype]:
+            holiday[(month_index == month - 1) & (day >= first_day) & (day <= last_day)] = multiplier
+
+        factors[c] = (
+            profile['base_daily']
+            * np.asarray(SEASONALITY[archetype])[month_index]
+            * np.asarray(WEEKLY_PATTERN[archetype])[weekday]
+            * holiday
+            * (1 + profile['cagr']) ** years_elapsed
+        )
+    return factors
+
+
+def generate_historical_sales(
+    store_attributes,
+    n_categories=NUM_CATEGORIES,
+    start=HISTORICAL_START,
+    end=HISTORICAL_END,
+    output_path='training/historical_sales_2022_2024.csv',
+    output_format='csv',
+    chunk_rows=CHUNK_ROWS,
+):
+    """
+    Generate historical sales with realistic patterns (vectorized, chunked)
 
-                sales_data.append({
-                    'date': current_date.strftime('%Y-%m-%d'),
-                    'store_id': store_id,
-                    'category': category,
-                    'quantity_sold': qty,
-                    'revenue': round(revenue, 2)
-                })
+    The (day × store × category) quantity tensor is built with NumPy
+    broadcasting and written a block of days at a time, so memory stays
+    bounded by chunk_rows and multi-GB datasets can be generated quickly.
 
-        current_date += timedelta(days=1)
+    Args:
+        store_attributes: DataFrame with store attributes
+        n_categories: number of categories (3 real + synthetic extras)
+        start: first date (datetime)
+        end: last date (datetime, inclusive)
+        output_path: CSV or Parquet file to write
+        output_format: 'csv' or 'parquet' (Parquet requires pyarrow)
+        chunk_rows: approximate rows generated and written per chunk
 
-    df = pd.DataFrame(sales_data)
+    Returns:
+        int: number of rows written
+    """
+    print(f"Generating historical sales ({start:%Y-%m-%d} to {end:%Y-%m-%d})...")
+
+    dates = pd.date_range(start, end, freq='D')
+    profiles = build_category_profiles(n_categories)
+    store_ids = store_attributes['store_id'].astype(str).tolist()
+    category_names = [p['name'] for p in profiles]
+    n_stores, n_cats = len(store_ids), len(profiles)
+
+    # Calculate multipliers and daily factors once
+    store_multipliers = calculate_store_sales_multipliers(store_attributes)
+    daily_factors = calculate_daily_category_factors(dates, profiles).T  # (days, categories)
+    base_prices = np.array([p['base_price'] for p in profiles])
+    date_strings = dates.strftime('%Y-%m-%d')
+
+    days_per_chunk = max(1, chunk_rows // (n_stores * n_cats))
+    rows_per_day = n_stores * n_cats
+    store_codes = np.repeat(np.arange(n_stores, dtype=np.int32), n_cats)
+    category_codes = np.tile(np.arange(n_cats, dtype=np.int32), n_stores)
+
+    if os.path.exists(output_path):
+        os.remove(output_path)
+    parquet_writer = None
+    total_rows = 0
+
+    for lo in range(0, len(dates), days_per_chunk):
+        hi = min(lo + days_per_chunk, len(dates))
+        n_days = hi - lo
+        shape = (n_days, n_stores, n_cats)
+
+        # Expected units, then ±10-15% noise (cleaner historical data)
+        qty = daily_factors[lo:hi, None, :] * store_multipliers[None, :, None]
+        qty *= np.random.uniform(0.85, 1.15, size=shape)
+        qty = np.maximum(0, np.rint(qty)).astype(np.int64)
+
+        # Revenue with ±10% price variability
+        revenue = np.round(qty * base_prices * np.random.uniform(0.90, 1.10, size=shape), 2)
+
+        chunk = pd.DataFrame({
+            'date': pd.Categorical.from_codes(
+                np.repeat(np.arange(n_days, dtype=np.int32), rows_per_day), date_strings[lo:hi]
+            ),
+            'store_id': pd.Categorical.from_codes(np.tile(store_codes, n_days), store_ids),
+            'category': pd.Categorical.from_codes(np.tile(category_codes, n_days), category_names),
+            'quantity_sold': qty.reshape(-1),
+            'revenue': revenue.reshape(-1),
+        })
+
+        if output_format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if parquet_writer is None:
+                parquet_writer = pq.ParquetWriter(output_path, table.schema)
+            parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(output_path, mode='a', header=(lo == 0), index=False)
+
+        total_rows += len(chunk)
+        print(f"  Progress: {hi}/{len(dates)} days ({total_rows:,} rows)...")
+
+    if parquet_writer is not None:
+        parquet_writer.close()
 
-    # Save to CSV
-    output_path = 'training/historical_sales_2022_2024.csv'
-    df.to_csv(output_path, index=False)
     file_size_mb = os.path.getsize(output_path) / 1024 / 1024
-    print(f"[OK] Generated {output_path} ({len(df)} rows, {file_size_mb:.1f} MB)")
+    print(f"[OK] Generated {output_path} ({total_rows:,} rows, {file_size_mb:.1f} MB)")
 
-    return df
+    return total_rows
 
 
-def generate_scenario(scenario_name, store_attributes, historical_sales):
+def generate_scenario(scenario_name, store_attributes, historical_sales=None):
     """
     Generate 12 weekly actuals CSVs for a scenario
 
     Args:
         scenario_name: 'normal_season', 'high_demand', or 'low_demand'
         store_attributes: DataFrame with store attributes
-        historical_sales: DataFrame with historical sales (for baseline patterns)
+        historical_sales: unused (kept for backward compatibility)
     """
     print(f"Generating {scenario_name} scenario...")
 
@@ -707,8 +794,40 @@ def main():
                        help='Generate fresh data (ignore fixed seed)')
     parser.add_argument('--validate', action='store_true',
                        help='Run validation checks after generation')
+    parser.add_argument('--stores', type=int, default=NUM_STORES,
+                       help=f'Number of stores (default: {NUM_STORES})')
+    parser.add_argument('--categories', type=int, default=NUM_CATEGORIES,
+                       help=f'Number of categories (default: {NUM_CATEGORIES})')
+    parser.add_argument('--days', type=int, default=None,
+                       help='Number of historical days from 2022-01-01 (default: through 2024-12-31)')
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv',
+                       help='Historical sales output format (parquet requires pyarrow)')
+    parser.add_argument('--output', default=None,
+                       help='Historical sales output path (default: training/, or load_test/ with --sales-only)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS,
+                       help=f'Rows generated per write chunk (default: {CHUNK_ROWS:,})')
+    parser.add_argument('--sales-only', action='store_true',
+                       help='Only generate store attributes and historical sales, written next to '
+                            'the sales output and never into training/ (load testing)')
     args = parser.parse_args()
 
+    historical_end = (
+        HISTORICAL_START + timedelta(days=args.days - 1) if args.days else HISTORICAL_END
+    )
+    # Load-testing data goes next to the sales output, so the app's training/
+    # store attributes are never replaced by synthetic stores
+    training_attributes = 'training/store_attributes.csv'
+    output_path = args.output or os.path.join(
+        'load_test' if args.sales_only else 'training',
+        f'historical_sales_2022_2024.{args.format}',
+    )
+    attributes_path = training_attributes
+    if args.sales_only:
+        attributes_path = os.path.join(os.path.dirname(output_path) or '.', 'store_attributes.csv')
+        if os.path.abspath(attributes_path) == os.path.abspath(training_attributes):
+            attributes_path = None
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
     print("="*60)
     print("Mock Data Generation for Fashion Retail PoC")
     print("="*60)
@@ -718,19 +837,34 @@ def main():
 
     # Generate data
     print("\n[1/5] Generating store attributes...")
-    store_attributes = generate_store_attributes()
+    store_attributes = generate_store_attributes(args.stores, output_path=attributes_path)
+    if attributes_path is None:
+        print(f"  Kept {training_attributes} (not overwritten in sales-only mode)")
 
     print("\n[2/5] Generating historical sales...")
-    historical_sales = generate_historical_sales(store_attributes)
+    start_time = time.time()
+    generate_historical_sales(
+        store_attributes,
+        n_categories=args.categories,
+        end=historical_end,
+        output_path=output_path,
+        output_format=args.format,
+        chunk_rows=args.chunk_rows,
+    )
+    print(f"  Generated in {time.time() - start_time:.1f}s")
+
+    if args.sales_only:
+        print("\n[PASS] Sales-only generation complete (scenarios skipped)")
+        return
 
     print("\n[3/5] Generating normal season scenario...")
-    generate_scenario('normal_season', store_attributes, historical_sales)
+    generate_scenario('normal_season', store_attributes)
 
     print("\n[4/5] Generating high demand scenario...")
-    generate_scenario('high_demand', store_attributes, historical_sales)
+    generate_scenario('high_demand', store_attributes)
 
     print("\n[5/5] Generating low demand scenario...")
-    generate_scenario('low_demand', store_attributes, historical_sales)
+    generate_scenario('low_demand', store_attributes)
 
     print("\n" + "="*60)
     print("[PASS] Data generation complete!")
@@ -0,0 +1,241 @@
+"""
+Parametric Scenario Engine
+Generates in-season weekly actuals for declarative scenario specs at any scale
+
+Each scenario is described by a spec (demand multiplier, shock weeks,
+fraction of stores hit by the shocks, noise level). Daily sales for every
+store × category × day of a week are computed in one vectorized NumPy pass
+using the same seasonality / weekly-pattern tables as generate_mock_data.py,
+and (scenario, week) jobs run in parallel worker processes.
+
+Output layout (same format as the existing scenario folders):
+    <output-dir>/<scenario>/actuals_week_01.csv                # 1 category
+    <output-dir>/<scenario>/<category>/actuals_week_01.csv     # several categories
+
+Spec file (JSON list):
+    [
+      {"name": "viral_spike", "multiplier": 1.0, "shock_weeks": {"5": 1.30},
+       "affected_store_fraction": 1.0, "noise": 0.25},
+      {"name": "regional_outage", "multiplier": 0.9, "shock_weeks": {"3": 0.3, "4": 0.5},
+       "affected_store_fraction": 0.1, "noise": 0.15}
+    ]
+
+Usage:
+    python scenario_engine.py                                  # built-in scenarios, 50 stores
+    python scenario_engine.py --stores 5000 --categories 20 --workers 8
+    python scenario_engine.py --spec my_scenarios.json --output-dir scenarios/bench
+"""
+
+import argparse
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from generate_mock_data import (
+    CATEGORIES,
+    NUM_STORES,
+    SEASONALITY,
+    SEED,
+    TESTING_START,
+    WEEKLY_PATTERN,
+    build_category_profiles,
+    calculate_store_sales_multipliers,
+    generate_store_attributes,
+)
+
+# 2025 in-season baseline daily sales per store (slower growth than history)
+SEASON_BASE_DAILY_SALES = {
+    "Women's Dresses": 54,
+    "Men's Shirts": 36,
+    "Accessories": 47
+}
+
+
+@dataclass
+class ScenarioSpec:
+    """Declarative description of one in-season scenario"""
+    name: str
+    multiplier: float = 1.0                                  # Demand level vs. baseline
+    shock_weeks: dict = field(default_factory=dict)          # week number -> multiplier
+    affected_store_fraction: float = 1.0                     # Share of stores hit by shocks
+    noise: float = 0.25                                      # Uniform daily noise (±)
+    weeks: int = 12
+    seed: int = SEED
+
+    def __post_init__(self):
+        # JSON object keys are strings
+        self.shock_weeks = {int(k): float(v) for k, v in self.shock_weeks.items()}
+
+
+# Built-in scenarios matching the hand-written ones in generate_mock_data.py
+# and generate_underperform.py
+DEFAULT_SCENARIOS = [
+    ScenarioSpec('normal_season', multiplier=1.0, shock_weeks={5: 1.30}),    # Viral trend
+    ScenarioSpec('high_demand', multiplier=1.25, shock_weeks={5: 1.40}),     # Competitor bankruptcy
+    ScenarioSpec('low_demand', multiplier=0.80, shock_weeks={5: 0.75}),      # Supply disruption
+    ScenarioSpec('underperform', multiplier=0.82, shock_weeks={3: 0.6},      # Store supply issues
+                 affected_store_fraction=0.06, noise=0.15),
+]
+
+
+def load_specs(path):
+    """Load scenario specs from a JSON list"""
+    with open(path) as f:
+        return [ScenarioSpec(**entry) for entry in json.load(f)]
+
+
+def select_affected_stores(spec, n_stores):
+    """
+    Boolean mask of stores hit by the spec's shocks
+
+    Derived from the spec's seed and name only, so every week job of the
+    same scenario picks the same stores.
+    """
+    n_affected = int(round(spec.affected_store_fraction * n_stores))
+    rng = np.random.default_rng([spec.seed, zlib.crc32(spec.name.encode())])
+    mask = np.zeros(n_stores, dtype=bool)
+    mask[rng.choice(n_stores, size=n_affected, replace=False)] = True
+    return mask
+
+
+def generate_week_sales(spec, week_num, store_multipliers, profiles, season_start=TESTING_START):
+    """
+    Vectorized daily sales for one scenario week
+
+    Args:
+        spec: ScenarioSpec
+        week_num: week number (1-indexed)
+        store_multipliers: np.ndarray of per-store sales multipliers
+        profiles: category profiles (build_category_profiles)
+        season_start: Monday of week 1
+
+    Returns:
+        np.ndarray: int64 quantities, shape (7 days, n_stores, n_categories)
+    """
+    rng = np.random.default_rng([spec.seed, zlib.crc32(spec.name.encode()), week_num])
+    dates = pd.date_range(season_start + timedelta(weeks=week_num - 1), periods=7, freq='D')
+    month_index = dates.month.to_numpy() - 1
+    weekday = dates.weekday.to_numpy()
+
+    # (days, categories) expected units per store before store effects
+    category_daily = np.stack([
+        SEASON_BASE_DAILY_SALES.get(p['name'], p['base_daily'])
+        * np.asarray(SEASONALITY[p['archetype']])[month_index]
+        * np.asarray(WEEKLY_PATTERN[p['archetype']])[weekday]
+        for p in profiles
+    ], axis=1)
+
+    # Store-level shock for this week
+    store_effect = store_multipliers * spec.multiplier
+    if week_num in spec.shock_weeks:
+        affected = select_affected_stores(spec, len(store_multipliers))
+        store_effect = np.where(affected, store_effect * spec.shock_weeks[week_num], store_effect)
+
+    qty = category_daily[:, None, :] * store_effect[None, :, None]
+    qty *= rng.uniform(1 - spec.noise, 1 + spec.noise, size=qty.shape)
+    return np.maximum(0, np.rint(qty)).astype(np.int64)
+
+
+def _write_week(job):
+    """Worker: generate and save one (scenario, week). Returns (scenario, week, total units)."""
+    spec, week_num, store_ids, store_multipliers, profiles, output_dir = job
+    qty = generate_week_sales(spec, week_num, store_multipliers, profiles)
+    week_start = TESTING_START + timedelta(weeks=week_num - 1)
+    dates = pd.date_range(week_start, periods=7, freq='D').strftime('%Y-%m-%d')
+    n_stores = len(store_ids)
+
+    for c, profile in enumerate(profiles):
+        if len(profiles) == 1:
+            folder = os.path.join(output_dir, spec.name)
+        else:
+            folder = os.path.join(output_dir, spec.name, profile['name'].replace("'", "").replace(' ', '_'))
+        os.makedirs(folder, exist_ok=True)
+
+        df = pd.DataFrame({
+            'date': np.repeat(dates, n_stores),
+            'store_id': np.tile(store_ids, 7),
+            'quantity_sold': qty[:, :, c].reshape(-1),
+        })
+        df.to_csv(os.path.join(folder, f'actuals_week_{week_num:02d}.csv'), index=False)
+
+    return spec.name, week_num, int(qty.sum())
+
+
+def generate_scenarios(specs, n_stores=NUM_STORES, n_categories=1, output_dir='scenarios/generated',
+                       workers=None):
+    """
+    Generate every week of every scenario in parallel
+
+    Args:
+        specs: list of ScenarioSpec
+        n_stores: number of stores
+        n_categories: number of categories (1 = Women's Dresses only, as today)
+        output_dir: root folder for scenario output
+        workers: worker processes (default: CPU count)
+
+    Returns:
+        dict: scenario name -> list of weekly unit totals
+    """
+    np.random.seed(SEED)
+    store_attributes = generate_store_attributes(n_stores, output_path=None)
+    store_ids = store_attributes['store_id'].to_numpy()
+    store_multipliers = calculate_store_sales_multipliers(store_attributes)
+    profiles = build_category_profiles(max(n_categories, 1))
+    if n_categories == 1:
+        profiles = [p for p in profiles if p['name'] == CATEGORIES[0]]
+
+    jobs = [
+        (spec, week, store_ids, store_multipliers, profiles, output_dir)
+        for spec in specs
+        for week in range(1, spec.weeks + 1)
+    ]
+
+    totals = {spec.name: [0] * spec.weeks for spec in specs}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for name, week, units in executor.map(_write_week, jobs):
+            totals[name][week - 1] = units
+    return totals
+
+
+def main():
+    """Main entry point for scenario generation"""
+    parser = argparse.ArgumentParser(description='Generate in-season scenario actuals')
+    parser.add_argument('--spec', default=None,
+                       help='JSON file with scenario specs (default: built-in scenarios)')
+    parser.add_argument('--stores', type=int, default=NUM_STORES,
+                       help=f'Number of stores (default: {NUM_STORES})')
+    parser.add_argument('--categories', type=int, default=1,
+                       help='Number of categories (default: 1)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default='scenarios/generated',
+                       help='Output folder (default: scenarios/generated)')
+    args = parser.parse_args()
+
+    specs = load_specs(args.spec) if args.spec else DEFAULT_SCENARIOS
+
+    print("=" * 60)
+    print(f"Scenario Engine: {len(specs)} scenarios, {args.stores} stores, "
+          f"{args.categories} categories")
+    print("=" * 60)
+    for spec in specs:
+        print(f"  {spec.name}: {asdict(spec)}")
+
+    start_time = time.time()
+    totals = generate_scenarios(specs, args.stores, args.categories, args.output_dir, args.workers)
+
+    print()
+    for name, weekly in totals.items():
+        print(f"[OK] {name}: {len(weekly)} weeks, {sum(weekly):,} units")
+    print(f"\n[PASS] Generated in {time.time() - start_time:.1f}s -> {args.output_dir}/")
+
+
+if __name__ == '__main__':
+    main()